@@ -0,0 +1,5 @@
+import sys
+
+from homecad.cli import main
+
+sys.exit(main())
@@ -0,0 +1,211 @@
+"""Build and export benchmarks with a history of past runs.
+
+Every model is timed end to end through its ``build()``, and a few builders
+are timed over a range of sizes to show how they scale. Each case runs in a
+new worker process with the disk cache disabled, so in-process caches and
+earlier cases cannot flatter it, and is split into its geometry phase and
+its export phase. Workers get the case by model and function name and load
+the model themselves, which works under every multiprocessing start method.
+The pre-export check is timed on its own and left out of the total, which
+stays comparable with runs from before it existed.
+
+Runs are appended to a JSON lines history file, and every run is compared
+with the latest recorded one so that regressions stand out::
+
+    homecad bench                       # everything
+    homecad bench 'window_mount*' -r 3  # best of three
+"""
+
+import json
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import NamedTuple
+
+from homecad import cache, models
+from homecad.export import export_shapes
+from homecad.manifest import library_versions
+from homecad.quality import get_quality
+
+HISTORY_PATH = models.ROOT_DIR / "benchmarks" / "history.jsonl"
+
+# Relative slowdown reported as a regression, ignored below NOISE_FLOOR seconds.
+THRESHOLD = 0.1
+NOISE_FLOOR = 0.05
+
+
+class Case(NamedTuple):
+    """``model.function(**params)`` timed as one benchmark."""
+
+    name: str
+    model: str
+    function: str = "build"
+    params: dict = {}
+
+
+def _resolve(module, value):
+    """Look up ``"NAME.MEMBER"`` strings in ``module``, e.g. enum members."""
+    if isinstance(value, str) and "." in value:
+        owner, _, member = value.partition(".")
+        if hasattr(getattr(module, owner, None), member):
+            return getattr(getattr(module, owner), member)
+    return value
+
+
+def cases():
+    """Every benchmark case, models first and scaled builders after them."""
+    result = [Case(name, name) for name in models.model_names()]
+    result += [
+        Case(
+            f"gridfinity_seed_starter.make_gf_box/{size}x{size}",
+            "gridfinity_seed_starter",
+            "make_gf_box",
+            dict(size_x=size, size_y=size),
+        )
+        for size in range(1, 9)
+    ]
+    result += [
+        Case(
+            f"plant_light_hook_v2.ShelfMountGantryHalfPart/hook_number={number}",
+            "plant_light_hook_v2",
+            "ShelfMountGantryHalfPart",
+            dict(thickness=6, width=10, hook_number=number),
+        )
+        for number in range(1, 11)
+    ]
+    result += [
+        Case(
+            f"window_mount.make_rail/gf_unit={unit}",
+            "window_mount",
+            "make_rail",
+            dict(rail_type="RAIL_TYPE.GRIDFINITY_FRAME", gf_unit=unit),
+        )
+        for unit in range(1, 21)
+    ]
+    return result
+
+
+def _run_case(case, use_cache):
+    cache.CACHE_ENABLED = use_cache
+    module = models.load(case.model)
+    builder = getattr(module, case.function)
+    params = {name: _resolve(module, value) for name, value in case.params.items()}
+    start = time.perf_counter()
+    shapes = builder(**params)
+    built = time.perf_counter()
+    with tempfile.TemporaryDirectory() as out_dir:
+        exported = export_shapes(shapes, Path(out_dir) / case.model)
+    check = exported["check_time"]
+    end = time.perf_counter() - check
+    return {
+        "geometry": built - start,
+        "check": check,
+        "export": end - built,
+        "total": end - start,
+        "triangles": exported["triangles"],
+    }
+
+
+def run_case(case, repeat=1, use_cache=False):
+    """Time ``case`` ``repeat`` times, each in a new process, keep the best."""
+    # Fail early on a bad model; forked workers also inherit the import.
+    models.load(case.model)
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            runs.append(pool.submit(_run_case, case, use_cache).result())
+    best = min(runs, key=lambda run: run["total"])
+    return {**best, "repeat": repeat}
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=models.ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    path = Path(path)
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line]
+
+
+def append_history(run, path=HISTORY_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as file:
+        file.write(json.dumps(run, sort_keys=True) + "\n")
+
+
+def baseline(history, quality, use_cache=False):
+    """Latest successful result of every case among comparable runs."""
+    results = {}
+    for run in history:
+        if run.get("quality") == quality and run.get("cache") == use_cache:
+            results.update(
+                (name, result)
+                for name, result in run["results"].items()
+                if "error" not in result
+            )
+    return results
+
+
+def compare(results, previous, threshold=THRESHOLD):
+    """Pair every result with its baseline and flag regressions.
+
+    Results that failed or have no baseline are left out.
+
+    Returns:
+        list: ``(name, result, previous result, regressed)`` tuples.
+    """
+    rows = []
+    for name, result in results.items():
+        before = previous.get(name)
+        if before is None or "error" in result:
+            continue
+        regressed = (
+            result["total"] - before["total"] > NOISE_FLOOR
+            and result["total"] > before["total"] * (1 + threshold)
+        )
+        rows.append((name, result, before, regressed))
+    return rows
+
+
+def run(patterns=(), repeat=1, use_cache=False, progress=print):
+    """Run the cases matching any of ``patterns``, or all of them.
+
+    Returns:
+        dict: the run as recorded in the history file.
+    """
+    selected = [
+        case
+        for case in cases()
+        if not patterns or any(fnmatch(case.name, pattern) for pattern in patterns)
+    ]
+    results = {}
+    for case in selected:
+        try:
+            results[case.name] = run_case(case, repeat, use_cache)
+        except Exception as error:
+            results[case.name] = {"error": repr(error)}
+        progress(case.name, results[case.name])
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "quality": get_quality().value,
+        "cache": use_cache,
+        "versions": library_versions(),
+        "results": results,
+    }
@@ -0,0 +1,31 @@
+"""Bulk boolean operations.
+
+Folding ``+`` or ``-`` over a list of shapes runs one boolean per operand and
+each step re-intersects an ever-growing result. These helpers hand every
+operand to OCCT in a single multi-argument boolean instead.
+"""
+
+from build123d import Shape
+
+
+def _operands(shapes):
+    return [shape for shape in shapes if shape is not None]
+
+
+def fuse_all(shapes) -> Shape:
+    """Fuse ``shapes`` into one shape with a single boolean."""
+    shapes = _operands(shapes)
+    if not shapes:
+        raise ValueError("fuse_all needs at least one shape")
+    first, *rest = shapes
+    if not rest:
+        return first
+    return first + rest
+
+
+def cut_all(shape: Shape, tools) -> Shape:
+    """Subtract every shape in ``tools`` from ``shape`` with a single boolean."""
+    tools = _operands(tools)
+    if not tools:
+        return shape
+    return shape - tools
@@ -0,0 +1,78 @@
+"""Binary BREP serialization of build123d results.
+
+Shapes are written with OCCT's ``BinTools`` format, which is far faster to
+read back than the text BREP produced by ``export_brep``. A small JSON header
+records the build123d class of every shape so a round trip gives back the
+same kind of object (``Part``, ``Solid``, ...), and lets tuples of shapes and
+``None`` placeholders survive as well.
+"""
+
+import io
+import json
+import tempfile
+
+from build123d import topology
+from build123d.topology import Shape, downcast
+from OCP.BinTools import BinTools
+from OCP.TopoDS import TopoDS_Shape
+
+
+def _topology_class(shape):
+    for cls in type(shape).__mro__:
+        if cls.__module__ == topology.__name__:
+            return cls.__name__
+    raise TypeError(f"{type(shape).__name__} is not a build123d shape")
+
+
+def _write_shape(shape):
+    stream = io.BytesIO()
+    BinTools.Write_s(shape.wrapped, stream)
+    return stream.getvalue()
+
+
+def _read_shape(cls_name, data):
+    # Reading BinTools data back through a Python stream is unreliable for
+    # larger shapes, so go through a temporary file instead.
+    with tempfile.NamedTemporaryFile(suffix=".brep") as tmp:
+        tmp.write(data)
+        tmp.flush()
+        shape = TopoDS_Shape()
+        BinTools.Read_s(shape, tmp.name)
+    return getattr(topology, cls_name)(downcast(shape))
+
+
+def dumps(obj) -> bytes:
+    """Serialize a shape, or a tuple/list of shapes and ``None``, to bytes."""
+    if isinstance(obj, Shape):
+        kind, items = "shape", [obj]
+    elif isinstance(obj, (tuple, list)):
+        kind, items = type(obj).__name__, list(obj)
+    else:
+        raise TypeError(f"Cannot serialize {type(obj).__name__} as BREP")
+    header, blobs = [], []
+    for item in items:
+        if item is None:
+            header.append(None)
+            continue
+        blob = _write_shape(item)
+        header.append({"cls": _topology_class(item), "size": len(blob)})
+        blobs.append(blob)
+    head = json.dumps({"kind": kind, "items": header}).encode()
+    return b"".join([head, b"\n", *blobs])
+
+
+def loads(data: bytes):
+    """Inverse of :func:`dumps`."""
+    head, _, body = data.partition(b"\n")
+    header = json.loads(head)
+    items, offset = [], 0
+    for entry in header["items"]:
+        if entry is None:
+            items.append(None)
+            continue
+        end = offset + entry["size"]
+        items.append(_read_shape(entry["cls"], body[offset:end]))
+        offset = end
+    if header["kind"] == "shape":
+        return items[0]
+    return tuple(items) if header["kind"] == "tuple" else items
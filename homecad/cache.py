@@ -0,0 +1,183 @@
+"""Disk-backed memoization of parametric sub-shapes.
+
+Decorate a pure shape builder with :func:`disk_cache` and its results are
+stored as binary BREP under ``HOMECAD_CACHE_DIR`` (``~/.cache/homecad`` by
+default). Entries are keyed on the function's identity and source, the values
+of the module-level constants it reads, the fingerprints of the ``homecad``
+and model functions it calls, the call arguments, the installed library
+versions (see :func:`homecad.manifest.library_versions`) and the quality
+level, so editing a helper or one of its constants invalidates the entries
+of every builder that uses it, and only those. The directory, including the
+reports of :mod:`homecad.validate`, is trimmed back to
+``HOMECAD_CACHE_SIZE`` bytes (1 GiB by default) by evicting the least
+recently used entries once a process has stored more than fits.
+
+Set ``HOMECAD_CACHE=0`` to bypass the cache entirely.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+from enum import Enum
+from pathlib import Path
+from types import CodeType
+
+from homecad import brep
+from homecad.manifest import library_versions
+from homecad.quality import get_quality
+
+CACHE_DIR = Path(
+    os.environ.get("HOMECAD_CACHE_DIR", Path.home() / ".cache" / "homecad")
+)
+CACHE_SIZE = int(os.environ.get("HOMECAD_CACHE_SIZE", 1 << 30))
+CACHE_ENABLED = os.environ.get("HOMECAD_CACHE", "1") != "0"
+
+_CONSTANT_TYPES = (bool, int, float, str, bytes, tuple, list, Enum, type(None))
+# Packages whose functions are fingerprinted along with the builders calling
+# them, wherever they are defined.
+_LOCAL_PACKAGES = ("homecad", "models")
+# Files that count towards the cache size: shapes and validation reports.
+_ENTRY_PATTERNS = ("*/*.brep", "checks/*/*.json")
+
+# Bytes in the cache as of this process' last scan, plus what it stored since.
+_size = None
+
+
+def _referenced_names(code: CodeType):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+def _is_local(value, func):
+    """Whether function ``value`` is part of this project's code, as seen from
+    ``func``: defined in ``func``'s module, in ``homecad`` or in a model."""
+    module = value.__module__ or ""
+    return module == func.__module__ or module.split(".")[0] in _LOCAL_PACKAGES
+
+
+def _function_fingerprint(func, seen=None) -> str:
+    """Hash ``func``'s source together with the globals it reads.
+
+    Module-level constants contribute their values, and the functions it
+    calls from its own module, from ``homecad`` or from other models
+    contribute their own fingerprints, so a change anywhere in that part of
+    the call tree of a cached builder invalidates it. Functions reached
+    through a module attribute (``module.function``) and library code are
+    not followed; the latter is covered by the library versions.
+    """
+    func = inspect.unwrap(func)
+    seen = set() if seen is None else seen
+    seen.add(func)
+    namespace = func.__globals__
+    dependencies = []
+    for name in sorted(_referenced_names(func.__code__) & namespace.keys()):
+        value = inspect.unwrap(namespace[name])
+        if isinstance(value, _CONSTANT_TYPES):
+            dependencies.append((name, repr(value)))
+        elif (
+            inspect.isfunction(value)
+            and _is_local(value, func)
+            and value not in seen
+        ):
+            dependencies.append((name, _function_fingerprint(value, seen)))
+    identity = f"{Path(inspect.getfile(func)).stem}.{func.__qualname__}"
+    payload = repr(
+        (identity, inspect.getsource(func), dependencies, library_versions())
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cache_key(fingerprint: str, args, kwargs) -> str:
+    payload = repr((fingerprint, get_quality().value, args, sorted(kwargs.items())))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / key[:2] / f"{key}.brep"
+
+
+def load(key: str):
+    """Return the cached result for ``key`` or ``None`` on a miss."""
+    path = _entry_path(key)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    os.utime(path)
+    return brep.loads(data)
+
+
+def write(path: Path, data: bytes):
+    """Atomically write cache entry ``path`` and trim the cache if it is full.
+
+    The cache directory is scanned on a process' first write and then only
+    once what the process wrote since takes it over its size limit.
+    """
+    global _size
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, delete=False)
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+    if _size is None:
+        evict()
+    else:
+        _size += len(data)
+        if _size > CACHE_SIZE:
+            evict()
+
+
+def store(key: str, result):
+    """Write ``result`` under ``key``, trimming the cache to its size limit."""
+    write(_entry_path(key), brep.dumps(result))
+
+
+def evict(limit: int = None):
+    """Delete least recently used entries until the cache fits in ``limit``."""
+    global _size
+    limit = CACHE_SIZE if limit is None else limit
+    entries = []
+    for pattern in _ENTRY_PATTERNS:
+        for path in CACHE_DIR.glob(pattern):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+    _size = total
+
+
+def disk_cache(func):
+    """Memoize a pure shape builder on disk as binary BREP."""
+    fingerprint = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal fingerprint
+        if not CACHE_ENABLED:
+            return func(*args, **kwargs)
+        if fingerprint is None:
+            fingerprint = _function_fingerprint(func)
+        key = cache_key(fingerprint, args, kwargs)
+        result = load(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            store(key, result)
+        return result
+
+    return wrapper
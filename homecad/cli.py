@@ -0,0 +1,491 @@
+"""The ``homecad`` command line.
+
+Commands import the CAD stack only when they need it, so that ``homecad
+request`` talks to a running build server without paying for it.
+"""
+
+import argparse
+import ast
+import inspect
+import time
+from pathlib import Path
+
+from homecad import models
+from homecad.quality import Quality, set_quality
+
+
+def _parse_size(text):
+    """Parse a byte size such as ``500000``, ``500k`` or ``2M``."""
+    units = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+    text = text.strip().lower().removesuffix("b")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _parse_params(items):
+    params = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        try:
+            params[name] = ast.literal_eval(value)
+        except (SyntaxError, ValueError):
+            params[name] = value
+    return params
+
+
+def _bad_params(name, func, *args, **params):
+    """Why model ``name``'s ``func`` does not take ``params``, or None."""
+    try:
+        inspect.signature(func).bind(*args, **params)
+    except TypeError as error:
+        return f"{name}: bad {func.__name__}() parameters: {error}"
+    return None
+
+
+def _check_build_params(names, params):
+    """Print why any of the models ``names`` does not take ``params``.
+
+    Returns:
+        bool: whether every model's ``build()`` takes them.
+    """
+    errors = [_bad_params(name, models.load(name).build, **params) for name in names]
+    errors = [error for error in errors if error is not None]
+    for error in errors:
+        print(error)
+    if errors:
+        print("-p NAME=VALUE is passed to every selected model")
+    return not errors
+
+
+def _build_here(name, params, options, out_dir):
+    from homecad import scheduler
+
+    try:
+        return scheduler.build_model(name, params, options, out_dir)
+    except Exception as error:
+        return {"error": repr(error)}
+
+
+def cmd_build(args):
+    from homecad import scheduler, trace
+    from homecad.manifest import (
+        build_key,
+        is_current,
+        load_manifest,
+        manifest_entry,
+        write_manifest,
+    )
+
+    set_quality(args.quality)
+    if args.out is None:
+        args.out = models.exports_dir(args.quality)
+    if args.trace:
+        trace.enable()
+    names = args.models or models.model_names()
+    params = _parse_params(args.param)
+    if params and not _check_build_params(names, params):
+        return 1
+    options = {
+        option: value
+        for option, value in (
+            ("max_triangles", args.max_triangles),
+            ("max_bytes", args.max_size),
+            ("check", False if args.no_check else None),
+            ("min_wall_thickness", args.min_wall),
+        )
+        if value is not None
+    }
+    manifest = load_manifest(args.out)
+    keys, pending = {}, []
+    for name in names:
+        keys[name] = build_key(models.model_path(name), params, options)
+        if not args.force and is_current(args.out, manifest.get(name), keys[name]):
+            print(f"{name}: up to date")
+            continue
+        pending.append(name)
+
+    start = time.perf_counter()
+    if args.jobs == 1 or args.trace:
+        results = (
+            (name, _build_here(name, params, options, args.out)) for name in pending
+        )
+    else:
+        times = scheduler.expected_times(pending, manifest)
+        jobs = [
+            (name, scheduler.build_model, (name, params, options, args.out))
+            for name in scheduler.longest_first(times)
+        ]
+        results = scheduler.run_isolated(
+            jobs,
+            max_workers=args.jobs or None,
+            started=lambda name: print(f"{name}: started", flush=True),
+        )
+    failed = []
+    for name, result in results:
+        if "error" in result:
+            failed.append(name)
+            print(f"{name}: failed: {result['error']}", flush=True)
+            continue
+        manifest[name] = manifest_entry(args.out, keys[name], params, result)
+        write_manifest(args.out, manifest)
+        print(
+            f"{name}: built in {result['build_time']:.2f}s, "
+            f"checked in {result['check_time']:.2f}s, "
+            f"exported in {result['export_time']:.2f}s, "
+            f"{result['triangles']} triangles",
+            flush=True,
+        )
+    if len(pending) > 1:
+        print(f"{len(pending)} models in {time.perf_counter() - start:.2f}s")
+    if args.trace:
+        trace.write(args.trace)
+        print(f"trace written to {args.trace}, slowest operations:")
+        for name, site, count, total in trace.summary():
+            print(f"  {total:8.2f}s  {count:4d}x  {name} at {site}")
+        trace.disable()
+    return 1 if failed else 0
+
+
+def cmd_watch(args):
+    from homecad import watch
+
+    set_quality(args.quality)
+    if args.out is None:
+        args.out = models.exports_dir(args.quality)
+
+    def report(name, result):
+        if "error" in result:
+            print(f"{name}: failed:\n{result['error']}", flush=True)
+        else:
+            print(
+                f"{name}: built in {result['build_time']:.2f}s, "
+                f"checked in {result['check_time']:.2f}s, "
+                f"exported in {result['export_time']:.2f}s",
+                flush=True,
+            )
+
+    params = _parse_params(args.param)
+    if params and not _check_build_params(args.models or models.model_names(), params):
+        return 1
+    print(f"watching {models.MODELS_DIR} and homecad/, Ctrl-C to stop", flush=True)
+    watch.watch(
+        args.models,
+        params=params,
+        out_dir=args.out,
+        show=not args.no_show,
+        report=report,
+    )
+    return 0
+
+
+def cmd_serve(args):
+    from homecad import client, daemon
+
+    def ready(path):
+        print(f"serving builds on {path}, Ctrl-C to stop", flush=True)
+
+    daemon.serve(args.socket or client.SOCKET_PATH, ready=ready)
+    return 0
+
+
+def cmd_request(args):
+    from homecad import client
+
+    path = args.socket or client.SOCKET_PATH
+    failed = []
+    for name in args.models:
+        fields = {"quality": args.quality, "force": args.force}
+        if args.out is not None:
+            fields["out"] = str(Path(args.out).resolve())
+        try:
+            response = client.request(
+                name, _parse_params(args.param), path=path, **fields
+            )
+        except (FileNotFoundError, ConnectionRefusedError):
+            print(f"no build server on {path}, start one with `homecad serve`")
+            return 1
+        if not response["ok"]:
+            failed.append(name)
+            print(f"{name}: failed: {response['error']}")
+        elif response["up_to_date"]:
+            print(f"{name}: up to date")
+        else:
+            print(
+                f"{name}: built in {response['build_time']:.2f}s, "
+                f"checked in {response['check_time']:.2f}s, "
+                f"exported in {response['export_time']:.2f}s, "
+                f"{response['triangles']} triangles"
+            )
+    return 1 if failed else 0
+
+
+def cmd_coupon(args):
+    from homecad.coupon import ladder
+    from homecad.export import export_shapes
+
+    set_quality(args.quality)
+    if args.out is None:
+        args.out = models.exports_dir(args.quality) / "coupons"
+    module = models.load(args.model)
+    if not hasattr(module, "coupon"):
+        print(f"{args.model} has no coupon()")
+        return 1
+    tolerances = None
+    if args.tolerances:
+        start, stop = args.tolerances
+        tolerances = ladder(start, stop, args.steps)
+    params = _parse_params(args.param)
+    error = _bad_params(args.model, module.coupon, tolerances, **params)
+    if error is not None:
+        print(error)
+        return 1
+    start_time = time.perf_counter()
+    parts = module.coupon(tolerances, **params)
+    built = time.perf_counter()
+    result = export_shapes(
+        parts, Path(args.out) / args.model, source=models.model_path(args.model)
+    )
+    export_time = time.perf_counter() - built - result["check_time"]
+    print(
+        f"{args.model}: {len(parts)} parts built in {built - start_time:.2f}s, "
+        f"checked in {result['check_time']:.2f}s, "
+        f"exported in {export_time:.2f}s to {result['files'][-1]}"
+    )
+    return 0
+
+
+def _format_result(result):
+    if "error" in result:
+        return f"failed: {result['error']}"
+    return (
+        f"{result['total']:7.2f}s (geometry {result['geometry']:.2f}s, "
+        f"export {result['export']:.2f}s), check {result['check']:.2f}s, "
+        f"{result['triangles']} triangles"
+    )
+
+
+def cmd_bench(args):
+    from homecad import bench
+
+    set_quality(args.quality)
+    history = args.history or bench.HISTORY_PATH
+    threshold = bench.THRESHOLD if args.threshold is None else args.threshold
+    previous = bench.baseline(bench.load_history(history), args.quality, args.cache)
+
+    def progress(name, result):
+        print(f"{name}: {_format_result(result)}", flush=True)
+
+    run = bench.run(
+        args.cases, repeat=args.repeat, use_cache=args.cache, progress=progress
+    )
+    if not args.no_record:
+        bench.append_history(run, history)
+
+    rows = bench.compare(run["results"], previous, threshold)
+    if rows:
+        print("\ncompared with the previous runs:")
+    for name, result, before, regressed in rows:
+        change = result["total"] / before["total"] - 1 if before["total"] else 0.0
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"  {name}: {before['total']:.2f}s -> {result['total']:.2f}s "
+            f"({change:+.0%}){flag}"
+        )
+    return 1 if any(regressed for *_, regressed in rows) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="homecad")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build and export models headlessly")
+    build.add_argument("models", nargs="*", help="models to build, default all")
+    build.add_argument(
+        "--out", help="export directory, default exports/ or exports/draft/"
+    )
+    build.add_argument(
+        "-q",
+        "--quality",
+        choices=[quality.value for quality in Quality],
+        default=Quality.FINAL.value,
+        help="draft skips cosmetic details and tessellates coarsely",
+    )
+    build.add_argument(
+        "-f", "--force", action="store_true", help="rebuild up-to-date models"
+    )
+    build.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="models built at once in separate processes, longest first; "
+        "0 uses every CPU",
+    )
+    build.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="parameter override passed to every selected model's build()",
+    )
+    build.add_argument(
+        "--max-triangles",
+        type=int,
+        metavar="N",
+        help="triangle budget per model, met by coarser tessellation",
+    )
+    build.add_argument(
+        "--max-size",
+        type=_parse_size,
+        metavar="BYTES",
+        help="STL size budget per model, e.g. 500k or 2M",
+    )
+    build.add_argument(
+        "--no-check",
+        action="store_true",
+        help="export without checking the parts for validity and thin walls",
+    )
+    build.add_argument(
+        "--min-wall",
+        type=float,
+        metavar="MM",
+        help="thinnest wall the pre-export check accepts, default 0.25",
+    )
+    build.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="record every build123d operation to a Chrome trace JSON file",
+    )
+    build.set_defaults(func=cmd_build)
+
+    watch_parser = commands.add_parser(
+        "watch", help="rebuild models in a warm process whenever they change"
+    )
+    watch_parser.add_argument("models", nargs="*", help="models to watch, default all")
+    watch_parser.add_argument(
+        "--out", help="export directory, default exports/ or exports/draft/"
+    )
+    watch_parser.add_argument(
+        "-q",
+        "--quality",
+        choices=[quality.value for quality in Quality],
+        default=Quality.DRAFT.value,
+    )
+    watch_parser.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="parameter override passed to every selected model's build()",
+    )
+    watch_parser.add_argument(
+        "--no-show", action="store_true", help="do not send results to the viewer"
+    )
+    watch_parser.set_defaults(func=cmd_watch)
+
+    serve = commands.add_parser(
+        "serve", help="keep a build server running on a Unix socket"
+    )
+    serve.add_argument("--socket", help="socket path, default $HOMECAD_SOCKET")
+    serve.set_defaults(func=cmd_serve)
+
+    request = commands.add_parser(
+        "request", help="build models through a running build server"
+    )
+    request.add_argument("models", nargs="+", help="models to build")
+    request.add_argument("--socket", help="socket path, default $HOMECAD_SOCKET")
+    request.add_argument(
+        "--out", help="export directory, default exports/ or exports/draft/"
+    )
+    request.add_argument(
+        "-q",
+        "--quality",
+        choices=[quality.value for quality in Quality],
+        default=Quality.FINAL.value,
+    )
+    request.add_argument(
+        "-f", "--force", action="store_true", help="rebuild up-to-date models"
+    )
+    request.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="parameter override passed to every selected model's build()",
+    )
+    request.set_defaults(func=cmd_request)
+
+    coupon = commands.add_parser(
+        "coupon", help="export a plate of fit test coupons over a tolerance range"
+    )
+    coupon.add_argument("model", help="model offering a coupon")
+    coupon.add_argument(
+        "-t",
+        "--tolerances",
+        nargs=2,
+        type=float,
+        metavar=("FROM", "TO"),
+        help="tolerance range in mm, default the model's",
+    )
+    coupon.add_argument(
+        "-n",
+        "--steps",
+        type=int,
+        default=10,
+        help="variants over the --tolerances range, default 10",
+    )
+    coupon.add_argument("--out", help="export directory, default exports/coupons/")
+    coupon.add_argument(
+        "-q",
+        "--quality",
+        choices=[quality.value for quality in Quality],
+        default=Quality.FINAL.value,
+    )
+    coupon.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="parameter override passed to coupon(), for models that take any",
+    )
+    coupon.set_defaults(func=cmd_coupon)
+
+    bench_parser = commands.add_parser(
+        "bench", help="time model builds and exports and track regressions"
+    )
+    bench_parser.add_argument(
+        "cases", nargs="*", help="case name patterns, e.g. 'window_mount*'"
+    )
+    bench_parser.add_argument(
+        "-r", "--repeat", type=int, default=1, help="runs per case, best is kept"
+    )
+    bench_parser.add_argument(
+        "-q",
+        "--quality",
+        choices=[quality.value for quality in Quality],
+        default=Quality.FINAL.value,
+    )
+    bench_parser.add_argument(
+        "--cache", action="store_true", help="keep the disk cache enabled"
+    )
+    bench_parser.add_argument(
+        "--history", help="history file, default benchmarks/history.jsonl"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        help="relative slowdown reported as a regression, default 0.1",
+    )
+    bench_parser.add_argument(
+        "--no-record", action="store_true", help="do not append to the history"
+    )
+    bench_parser.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
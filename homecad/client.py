@@ -0,0 +1,33 @@
+"""Client of the build server in :mod:`homecad.daemon`.
+
+Only the standard library is imported here, so a request costs a socket
+round trip rather than an interpreter full of CAD libraries.
+"""
+
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+
+SOCKET_PATH = Path(
+    os.environ.get(
+        "HOMECAD_SOCKET",
+        Path(os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()))
+        / f"homecad-{os.getuid()}.sock",
+    )
+)
+
+
+def request(model, params=None, path=SOCKET_PATH, **fields):
+    """Ask the server on ``path`` to build ``model`` and return its response.
+
+    ``fields`` are further request fields: ``options``, ``quality``, ``out``
+    and ``force``.
+    """
+    message = {"model": model, "params": params or {}, **fields}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(path))
+        connection.sendall(json.dumps(message).encode() + b"\n")
+        with connection.makefile("rb") as reader:
+            return json.loads(reader.readline())
@@ -0,0 +1,102 @@
+"""Tolerance test coupons: one body, a ladder of mating features.
+
+Fit tolerances are tuned by printing the same joint at several tolerances.
+A coupon plate keeps that cheap. The part of the joint that does not depend
+on the tolerance is built once, only the mating feature is built per step
+and added to or cut from the body, and the variants are laid out on one
+plate. The counterpart every variant is tried against is placed next to each
+one as a copy sharing its topology, so the 3MF export writes its mesh once
+and instances it (see :func:`homecad.mesh.tessellate`)::
+
+    plate = coupon_plate(
+        lambda tolerance: make_inner(radius - tolerance),
+        ladder(0, 0.45),
+        body=make_cover(),
+        counterpart=make_socket(radius),
+    )
+
+Models offering coupons expose ``coupon(tolerances=None)``, which
+``homecad coupon`` builds and exports. Models whose ``build()`` takes
+parameters accept the same ones as ``coupon(tolerances=None, **params)``;
+``homecad coupon -p`` refuses parameters a model's ``coupon()`` does not
+take.
+"""
+
+from copy import copy
+from math import ceil, sqrt
+
+import numpy as np
+from build123d import Location, Mode
+
+COUPON_SPACING = 5
+
+
+def ladder(start, stop, count=10):
+    """``count`` evenly spaced tolerances from ``start`` to ``stop``."""
+    return [round(float(value), 4) for value in np.linspace(start, stop, count)]
+
+
+def _on_plate(shape, x, y):
+    """Move ``shape`` to stand on z = 0 centred on ``(x, y)``, in place."""
+    box = shape.bounding_box()
+    return shape.move(
+        Location((x - box.center().X, y - box.center().Y, -box.min.Z))
+    )
+
+
+def coupon_plate(
+    feature,
+    tolerances,
+    body=None,
+    mode=Mode.ADD,
+    counterpart=None,
+    spacing=COUPON_SPACING,
+    columns=None,
+):
+    """One variant of a joint per tolerance, laid out on one plate.
+
+    Args:
+        feature: called with each tolerance, returns the mating feature.
+        tolerances: tolerance of every variant, e.g. from :func:`ladder`.
+        body (optional): the unchanging rest of the part, built once by the
+            caller. Each variant is ``body`` with the feature added or, for
+            ``mode=Mode.SUBTRACT``, cut. Without a body the features are
+            the variants.
+        counterpart (optional): the fixed mating part, placed beside every
+            variant.
+        spacing (optional): gap between neighbouring parts.
+        columns (optional): variants per row, default a square grid.
+
+    Returns:
+        list: the parts, row by row from the smallest tolerance, each variant
+        followed by its counterpart. Variants are labelled with their
+        tolerance.
+    """
+    variants = []
+    for tolerance in tolerances:
+        variant = feature(tolerance)
+        if body is not None:
+            variant = body - variant if mode == Mode.SUBTRACT else body + variant
+        variant.label = f"tolerance {tolerance:g}"
+        variants.append(variant)
+
+    sizes = [variant.bounding_box().size for variant in variants]
+    width = max(size.X for size in sizes)
+    depth = max(size.Y for size in sizes)
+    pair_depth = depth
+    if counterpart is not None:
+        counterpart_size = counterpart.bounding_box().size
+        width = max(width, counterpart_size.X)
+        pair_depth += spacing + counterpart_size.Y
+
+    columns = columns or ceil(sqrt(len(variants)))
+    parts = []
+    for i, variant in enumerate(variants):
+        row, column = divmod(i, columns)
+        x = column * (width + spacing)
+        y = -row * (pair_depth + spacing)
+        parts.append(_on_plate(variant, x, y - depth / 2))
+        if counterpart is not None:
+            y -= depth + spacing + counterpart_size.Y / 2
+            parts.append(_on_plate(copy(counterpart), x, y))
+    return parts
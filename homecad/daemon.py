@@ -0,0 +1,154 @@
+"""A long-lived local build server on a Unix socket.
+
+``homecad serve`` imports the CAD stack once and then builds models on
+request, so notebooks, editor hooks and the command line skip the interpreter
+and OCCT start-up, and the in-process caches (Gridfinity profiles, imported
+models) stay warm between requests. Models and ``homecad`` modules edited
+since they were imported are reloaded before a build, and builds that are
+up to date in the export manifest are not repeated.
+
+The protocol is one JSON object per line in each direction. A request names
+a model and optionally ``params``, ``options`` (export budgets), ``quality``,
+``out`` and ``force``::
+
+    {"model": "window_mount", "params": {"grid_size": [5, 3]}}
+
+and the response carries the export paths and timings::
+
+    {"ok": true, "model": "window_mount", "files": [...], "triangles": 2310,
+     "build_time": 1.6, "check_time": 0.1, "export_time": 0.2,
+     "total_time": 2.0,
+     "up_to_date": false}
+
+or ``{"ok": false, "error": "..."}``. :func:`homecad.client.request` sends
+requests without importing the CAD stack.
+"""
+
+import json
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from homecad import models
+from homecad.client import SOCKET_PATH
+from homecad.manifest import (
+    build_key,
+    is_current,
+    load_manifest,
+    manifest_entry,
+    source_files,
+    write_manifest,
+)
+from homecad.quality import Quality, set_quality
+from homecad.scheduler import timed_build
+from homecad.watch import reload_modules
+
+# Modification times of the sources of every model built so far.
+_mtimes = {}
+# Builds share this process' global state (quality level, builder context),
+# so connections are served concurrently but build one at a time.
+_build_lock = threading.Lock()
+
+
+def _refresh(name):
+    """Reload model ``name`` and the homecad modules edited since its build."""
+    files = source_files(models.model_path(name))
+    mtimes = {file: file.stat().st_mtime_ns for file in files}
+    previous = _mtimes.get(name)
+    if previous is not None and previous != mtimes:
+        reload_modules({file for file in files if previous.get(file) != mtimes[file]})
+        models.reload(name)
+    _mtimes[name] = mtimes
+
+
+def handle(message):
+    """Build the model of request ``message`` and return the response."""
+    name = message["model"]
+    params = message.get("params") or {}
+    options = message.get("options") or {}
+    quality = Quality(message.get("quality", Quality.FINAL.value)).value
+    set_quality(quality)
+    out_dir = Path(message.get("out") or models.exports_dir(quality))
+    start = time.perf_counter()
+    _refresh(name)
+    key = build_key(models.model_path(name), params, options)
+    manifest = load_manifest(out_dir)
+    entry = manifest.get(name)
+    up_to_date = not message.get("force") and is_current(out_dir, entry, key)
+    if up_to_date:
+        result = {
+            "files": [str(out_dir / file) for file in entry["files"]],
+            "triangles": entry["triangles"],
+            "build_time": 0.0,
+            "check_time": 0.0,
+            "export_time": 0.0,
+        }
+    else:
+        _, result = timed_build(name, params, options, out_dir)
+        manifest[name] = manifest_entry(out_dir, key, params, result)
+        write_manifest(out_dir, manifest)
+    return {
+        "ok": True,
+        "model": name,
+        **result,
+        "total_time": time.perf_counter() - start,
+        "up_to_date": up_to_date,
+    }
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                with _build_lock:
+                    response = handle(json.loads(line))
+            except Exception as error:
+                response = {
+                    "ok": False,
+                    "error": repr(error),
+                    "traceback": traceback.format_exc(),
+                }
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+def _claim(path):
+    """Remove a stale socket at ``path``, refusing if a server is running."""
+    if not path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+    raise RuntimeError(f"A build server is already listening on {path}")
+
+
+def serve(path=SOCKET_PATH, ready=None):
+    """Serve build requests on the Unix socket ``path`` until interrupted.
+
+    Any number of clients may connect; their requests are built one at a
+    time, in the order they arrive.
+    """
+    path = Path(path)
+    _claim(path)
+    with _Server(str(path), _Handler) as server:
+        if ready is not None:
+            ready(path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+
@@ -0,0 +1,71 @@
+"""Mesh export of finished models."""
+
+import time
+from pathlib import Path
+
+from homecad import mesh
+from homecad.quality import TESSELLATION, get_quality
+from homecad.validate import MIN_WALL_THICKNESS, validate
+
+EXPORT_FORMATS = (".stl", ".3mf")
+
+
+def export_shapes(
+    shapes,
+    path,
+    source=None,
+    formats=EXPORT_FORMATS,
+    max_triangles=None,
+    max_bytes=None,
+    check=True,
+    min_wall_thickness=MIN_WALL_THICKNESS,
+):
+    """Mesh ``shapes`` once and write them next to each other as ``path`` + format.
+
+    Args:
+        shapes: a shape or an iterable of shapes; each becomes its own mesh.
+        path: output path without extension.
+        source (optional): model source file recorded in the 3MF metadata.
+        formats (optional): file extensions to write.
+        max_triangles (optional): triangle budget of the whole export, met by
+            coarsening the parts' tessellation (see :func:`mesh.tessellate`).
+        max_bytes (optional): size budget of the binary STL, turned into a
+            triangle budget. The 3MF is compressed and always smaller.
+        check (optional): check every part with :func:`validate.validate`
+            first, so that nothing is written for a broken model.
+        min_wall_thickness (optional): thinnest wall the check accepts.
+
+    Returns:
+        dict: ``files`` written, the total number of ``triangles`` and the
+        ``check_time`` spent checking the parts, so callers can tell it
+        apart from the export itself.
+
+    Raises:
+        validate.InvalidShapeError: if a part fails its checks.
+    """
+    start = time.perf_counter()
+    if check:
+        validate(shapes, min_wall_thickness)
+    check_time = time.perf_counter() - start
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if max_bytes is not None:
+        budget = mesh.triangle_budget(max_bytes)
+        max_triangles = budget if max_triangles is None else min(max_triangles, budget)
+    meshes = mesh.tessellate(
+        shapes, *TESSELLATION[get_quality()], max_triangles=max_triangles
+    )
+    metadata = []
+    if source is not None:
+        source = Path(source)
+        metadata.append(
+            ("build123d", source.name, source.read_text(encoding="utf-8"), "python")
+        )
+    files = [str(path.parent / f"{path.name}{suffix}") for suffix in formats]
+    for file in files:
+        mesh.write(meshes, file, metadata)
+    return {
+        "files": files,
+        "triangles": sum(len(m.triangles) for m in meshes),
+        "check_time": check_time,
+    }
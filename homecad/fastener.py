@@ -0,0 +1,94 @@
+"""Cached ISO thread and fastener geometry.
+
+Helical threads are by far the most expensive solids in the models, and a
+given size, pitch and length always sweeps to the same shape. The builders
+here wrap ``bd_warehouse.fastener`` with :func:`homecad.cache.disk_cache`, so
+each distinct thread is swept once and then loaded from disk, across runs and
+worker processes. Results are plain build123d shapes; the thread dimensions
+of a size are available from :func:`metric_size`.
+
+In draft quality threads and screws are plain cylinders of the same
+envelope.
+"""
+
+from bd_warehouse.fastener import IsoThread, SetScrew
+from build123d import Align, Cylinder
+
+from homecad.cache import disk_cache
+from homecad.quality import is_draft
+
+_CENTER_TOP = (Align.CENTER, Align.CENTER, Align.MAX)
+
+
+def metric_size(size):
+    """Major diameter and pitch of an ISO metric size such as ``"M6-1"``."""
+    diameter, _, pitch = size.upper().removeprefix("M").partition("-")
+    return float(diameter), float(pitch)
+
+
+def minor_diameter(major_diameter, pitch):
+    """ISO 68-1 basic minor diameter."""
+    return major_diameter - 1.082532 * pitch
+
+
+@disk_cache
+def iso_thread(
+    major_diameter,
+    pitch,
+    length,
+    external=True,
+    end_finishes=("fade", "fade"),
+    align=_CENTER_TOP,
+):
+    """An ``IsoThread``, cached on its size, pitch, length, side and ends."""
+    if is_draft():
+        return Cylinder(major_diameter / 2, length, align=align) - Cylinder(
+            minor_diameter(major_diameter, pitch) / 2, length, align=align
+        )
+    return IsoThread(
+        major_diameter=major_diameter,
+        pitch=pitch,
+        length=length,
+        external=external,
+        end_finishes=end_finishes,
+        align=align,
+    )
+
+
+@disk_cache
+def set_screw(size, length, align=_CENTER_TOP):
+    """A fully threaded ``SetScrew`` of ``size``, e.g. ``"M6-1"``."""
+    if is_draft():
+        return Cylinder(metric_size(size)[0] / 2, length, align=align)
+    return SetScrew(size=size, length=length, simple=False, align=align)
+
+
+@disk_cache
+def screw_and_thread(
+    size,
+    length,
+    allowance=0.1,
+    end_finishes=("square", "square"),
+    align=_CENTER_TOP,
+):
+    """A set screw and the internal thread it screws into, built as a pair.
+
+    The internal thread's major diameter is ``allowance`` larger than the
+    screw's. Both share the same length and alignment, so the thread can be
+    fused into a hole of the screw's diameter plus clearance.
+
+    Returns:
+        tuple: the screw and the internal thread.
+    """
+    diameter, pitch = metric_size(size)
+    return (
+        set_screw(size, length, align=align),
+        iso_thread(
+            diameter + allowance,
+            pitch,
+            length,
+            external=False,
+            end_finishes=end_finishes,
+            align=align,
+        ),
+    )
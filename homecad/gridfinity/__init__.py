@@ -0,0 +1,68 @@
+"""Gridfinity dimensions shared by the Gridfinity-compatible models.
+
+The package itself is plain numbers so layout code can use it without
+importing the CAD stack. All lengths are in millimetres, build123d's native
+unit. The solids and sketches built from these numbers live in
+:mod:`homecad.gridfinity.profiles`.
+"""
+
+MM = 1
+
+GF_UNIT_HEIGHT = 7 * MM
+GF_UNIT_WIDTH = 42 * MM
+GF_BOX_UNIT_WIDTH = 41.5 * MM
+GF_BOX_RADIUS = 7.5 * MM / 2
+GF_BASE_PART_SIZE = (0.8, 1.8, 2.15)
+GF_BASE_SLICE_SIZE = GF_BASE_PART_SIZE[0] + GF_BASE_PART_SIZE[2]
+GF_STACKING_LIP_PART_SIZE = (0.7, 1.8, 1.9)
+GF_STACKING_LIP_SLICE_SIZE = GF_STACKING_LIP_PART_SIZE[0] + GF_STACKING_LIP_PART_SIZE[2]
+# Baseplate ridge between two cells: bottom chamfer, straight part and top
+# chamfer heights, its half width at the bottom, and how far rails lift it.
+GF_BASEPLATE_PART_SIZE = (0.7, 1.8, 2.15)
+GF_BASEPLATE_HALF_WIDTH = GF_BASEPLATE_PART_SIZE[2]
+GF_BASEPLATE_HEIGHT_OFFSET = 0.35 * MM
+
+GF_BASE_TOTAL_HEIGHT = sum(GF_BASE_PART_SIZE)
+GF_STACKING_LIP_TOTAL_HEIGHT = sum(GF_STACKING_LIP_PART_SIZE)
+
+
+def _cal_gf_struct_spec(unit_width, init_height, init_radius, part_size):
+    half_width_4 = unit_width / 2
+    half_height_4 = init_height
+    corner_radius_4 = init_radius
+    half_width_3 = half_width_4 - part_size[2]
+    half_height_3 = half_height_4 - part_size[2]
+    corner_radius_3 = corner_radius_4 - part_size[2]
+    half_width_2 = half_width_3
+    half_height_2 = half_height_3 - part_size[1]
+    corner_radius_2 = corner_radius_3
+    half_width_1 = half_width_2 - part_size[0]
+    half_height_1 = half_height_2 - part_size[0]
+    corner_radius_1 = corner_radius_2
+    return [
+        (half_width_1, half_height_1, corner_radius_1),
+        (half_width_2, half_height_2, corner_radius_2),
+        (half_width_3, half_height_3, corner_radius_3),
+        (half_width_4, half_height_4, corner_radius_4),
+    ]
+
+
+GF_BASE_SIZE = _cal_gf_struct_spec(
+    GF_BOX_UNIT_WIDTH,
+    GF_BASE_TOTAL_HEIGHT,
+    GF_BOX_RADIUS,
+    GF_BASE_PART_SIZE,
+)
+
+GF_STACKING_LIP_SIZE = _cal_gf_struct_spec(
+    GF_BOX_UNIT_WIDTH,
+    GF_STACKING_LIP_TOTAL_HEIGHT,
+    GF_BOX_RADIUS,
+    GF_STACKING_LIP_PART_SIZE,
+)
+
+GF_STACKING_LIP_SIZE.insert(
+    0, (GF_BOX_UNIT_WIDTH / 2, -GF_STACKING_LIP_SLICE_SIZE, GF_BOX_RADIUS)
+)
+
+GF_UNIT_WITDH_TOLERANCE = (GF_UNIT_WIDTH - GF_BOX_UNIT_WIDTH) / 2
@@ -0,0 +1,131 @@
+"""Gridfinity solids and sketches built once and handed out as located copies.
+
+The base unit and the baseplate node profile only depend on the spec, so
+each is built once per process; callers get copies that share its topology
+and are moved into place without rebuilding or deep-copying any geometry.
+Stacking lips depend on the bin size and are cached on disk per size.
+"""
+
+from functools import lru_cache
+
+from build123d import (
+    Align,
+    BuildPart,
+    BuildSketch,
+    Location,
+    Locations,
+    Mode,
+    Plane,
+    Polygon,
+    Rectangle,
+    RectangleRounded,
+    Vector,
+    fillet,
+    loft,
+    sweep,
+)
+from build123d.topology import downcast
+
+from homecad.cache import disk_cache
+from homecad.gridfinity import (
+    GF_BASE_SIZE,
+    GF_BASEPLATE_HALF_WIDTH,
+    GF_BASEPLATE_HEIGHT_OFFSET,
+    GF_BASEPLATE_PART_SIZE,
+    GF_BOX_RADIUS,
+    GF_BOX_UNIT_WIDTH,
+    GF_STACKING_LIP_SIZE,
+    GF_UNIT_HEIGHT,
+    GF_UNIT_WIDTH,
+    GF_UNIT_WITDH_TOLERANCE,
+)
+
+
+def _located(shape, location):
+    """A copy of ``shape`` at ``location`` sharing its topology."""
+    return shape.__class__(downcast(shape.wrapped.Moved(Location(location).wrapped)))
+
+
+@lru_cache
+def _base_unit():
+    with BuildPart() as part:
+        for half_width, height, radius in GF_BASE_SIZE:
+            with BuildSketch(Plane.XY.offset(height)):
+                rect = Rectangle(half_width * 2, half_width * 2)
+                if radius > 0:
+                    fillet(rect.vertices(), radius)
+        loft(ruled=True)
+    return part.part
+
+
+def base_unit(origin=(0, 0, 0)):
+    """The base of one Gridfinity cell, centred on ``origin``."""
+    return _located(_base_unit(), origin)
+
+
+@disk_cache
+def stacking_lip(size_x, size_y, height_unit, cut_before_height=0):
+    """The stacking lip on top of a ``size_x`` by ``size_y`` bin.
+
+    The lip is one cross-section swept along the bin outline, so its cost
+    follows the perimeter rather than the bin volume. The profile is the
+    spec measured inwards from the outer wall, which keeps every corner
+    concentric with the outline's. All rounded rectangles of the spec but
+    the innermost share those corner centres; the innermost one's corners
+    come out with a 1.15 mm radius instead of its 1.85 mm. Anything below
+    ``cut_before_height`` is cut off.
+    """
+    top = height_unit * GF_UNIT_HEIGHT
+    path = RectangleRounded(
+        size_x * GF_UNIT_WIDTH - GF_UNIT_WITDH_TOLERANCE * 2,
+        size_y * GF_UNIT_WIDTH - GF_UNIT_WITDH_TOLERANCE * 2,
+        GF_BOX_RADIUS,
+    ).wire().moved(Location((0, 0, top)))
+    start = path @ 0
+    inward = Vector(0, 0, 1).cross(path % 0)
+    if inward.dot(Vector(start.X, start.Y, 0)) > 0:
+        inward = -inward
+    plane = Plane(origin=start, x_dir=inward, z_dir=inward.cross(Vector(0, 0, 1)))
+    points = [
+        (GF_BOX_UNIT_WIDTH / 2 - half_width, height)
+        for half_width, height, _ in GF_STACKING_LIP_SIZE
+    ]
+    bottom = points[0][1]
+    with BuildSketch(plane) as profile:
+        Polygon(*points, align=None)
+        if cut_before_height > top + bottom:
+            with Locations((0, bottom)):
+                Rectangle(
+                    GF_BOX_RADIUS,
+                    cut_before_height - top - bottom,
+                    align=(Align.MIN, Align.MIN),
+                    mode=Mode.SUBTRACT,
+                )
+    return sweep(profile.sketch, path)
+
+
+@lru_cache
+def _node_sketch():
+    half_width = GF_BASEPLATE_HALF_WIDTH
+    offset = GF_BASEPLATE_HEIGHT_OFFSET
+    middle = offset + GF_BASEPLATE_PART_SIZE[0] + GF_BASEPLATE_PART_SIZE[1]
+    top = middle + GF_BASEPLATE_PART_SIZE[2]
+    with BuildSketch() as sketch:
+        Polygon(
+            (-half_width, offset),
+            (half_width, offset),
+            (half_width, middle),
+            (0, top),
+            (-half_width, middle),
+            align=None,
+        )
+        Rectangle(half_width * 2, offset, align=(Align.CENTER, Align.MIN))
+    return sketch.sketch
+
+
+def node_sketch(plane=Plane.XY):
+    """Cross-section of a baseplate ridge on ``plane``, standing on its y axis.
+
+    The ridge is lifted by ``GF_BASEPLATE_HEIGHT_OFFSET`` on a solid strip.
+    """
+    return _located(_node_sketch(), plane.location)
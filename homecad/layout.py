@@ -0,0 +1,504 @@
+"""Geometry-free layout of the Gridfinity seed starter plate.
+
+The hole grid, the supporting pillars and the filling hole of the seed
+starter cover plate are pure arithmetic on a handful of parameters. Keeping
+that arithmetic here means a layout can be inspected without building any
+solid, and every parameter may also be a NumPy array so thousands of drawer
+and hole sizes can be screened in one vectorized call::
+
+    layout = seed_starter_layout(
+        gf_unit_x=np.arange(2, 9)[:, None],
+        gf_unit_y=np.arange(2, 9)[None, :],
+        starter_min_width=55,
+        support_hole_width=43,
+    )
+    layout.hole_count  # 7x7 array of cell counts
+
+:func:`optimize_seed_starter_layout` searches the same model for the hole
+width, corner radius and pitch that fit the most cells, or the largest
+cells, into a drawer, in a few milliseconds and before any solid is built.
+"""
+
+from itertools import product
+from math import pi
+from typing import NamedTuple
+
+import nlopt
+import numpy as np
+
+from homecad.gridfinity import (
+    GF_STACKING_LIP_SLICE_SIZE,
+    GF_UNIT_WIDTH,
+    GF_UNIT_WITDH_TOLERANCE,
+)
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.ndarray) and value.ndim == 0 else value
+
+
+def _cal_gap(
+    total,
+    num,
+    filling_hole_num,
+    filling_hole_outer_radius,
+    starter_min_width,
+    support_hole_width,
+):
+    total = total - (
+        filling_hole_outer_radius * 2 * filling_hole_num + support_hole_width * num
+    )
+    gap = total / (num + filling_hole_num + 1)
+    min_gap = starter_min_width - support_hole_width
+    fixed = gap < min_gap
+    fixed_gap = (total - min_gap * (num - 1)) / (filling_hole_num + 2)
+    return (
+        np.where(fixed, fixed_gap, gap),
+        np.where(fixed, min_gap - fixed_gap, 0.0),
+    )
+
+
+class SeedStarterLayout(NamedTuple):
+    """Hole and pillar placement on a seed starter cover plate.
+
+    Fields are floats/ints for scalar inputs and broadcast arrays when the
+    layout was computed from arrays. Coordinates are relative to the plate
+    centre.
+    """
+
+    cover_x_max: float
+    cover_y_max: float
+    support_hole_width: float
+    filling_hole: bool
+    filling_hole_in_new_row: bool
+    filling_hole_outer_radius: float
+    num_x: int
+    num_y: int
+    gap_x: float
+    gap_fix_x: float
+    gap_y: float
+    gap_fix_y: float
+
+    @property
+    def hole_count(self):
+        """Number of seed holes, not counting a reserved filling hole slot."""
+        reserved = np.logical_and(
+            self.filling_hole, np.logical_not(self.filling_hole_in_new_row)
+        )
+        return _scalar(np.asarray(self.num_x * self.num_y - reserved.astype(int)))
+
+    @property
+    def valid(self):
+        """Whether at least one hole fits and no gap is negative."""
+        return _scalar(
+            (np.asarray(self.num_x) >= 1)
+            & (np.asarray(self.num_y) >= 1)
+            & (np.asarray(self.gap_x) >= 0)
+            & (np.asarray(self.gap_y) >= 0)
+        )
+
+    def _row_offset(self):
+        return np.where(
+            self.filling_hole_in_new_row,
+            self.filling_hole_outer_radius * 2 + self.gap_y,
+            0.0,
+        )
+
+    def hole_location(self, i, j):
+        """Centre of the hole in column ``i`` and row ``j``."""
+        x = self.support_hole_width / 2 - self.cover_x_max / 2 + self.gap_x
+        y = self.support_hole_width / 2 - self.cover_y_max / 2 + self.gap_y
+        y = y + self._row_offset()
+        x = x + i * (self.support_hole_width + self.gap_x + self.gap_fix_x)
+        y = y + j * (self.support_hole_width + self.gap_y + self.gap_fix_y)
+        return (_scalar(np.asarray(x)), _scalar(np.asarray(y)))
+
+    def pillar_location(self, i, j):
+        """Centre of the supporting pillar between columns ``i``, ``i + 1``
+        and rows ``j``, ``j + 1``."""
+        x = (
+            self.gap_x
+            - self.cover_x_max / 2
+            + self.support_hole_width
+            + (self.gap_x + self.gap_fix_x) / 2
+            + i * (self.support_hole_width + self.gap_x + self.gap_fix_x)
+        )
+        y = (
+            self.gap_y
+            - self.cover_y_max / 2
+            + self.support_hole_width
+            + (self.gap_y + self.gap_fix_y) / 2
+            + j * (self.support_hole_width + self.gap_y + self.gap_fix_y)
+        )
+        y = y + self._row_offset()
+        return (_scalar(np.asarray(x)), _scalar(np.asarray(y)))
+
+    def filling_hole_location(self):
+        """Centre of the filling hole, or ``None`` without one."""
+        self._require_scalar()
+        if not self.filling_hole:
+            return None
+        if self.filling_hole_in_new_row:
+            return (
+                self.cover_x_max / 2 - self.gap_x - self.support_hole_width / 2,
+                -self.cover_y_max / 2 + self.gap_y + self.filling_hole_outer_radius,
+            )
+        return self.hole_location(self.num_x - 1, 0)
+
+    def hole_locations(self):
+        """Centres of every seed hole, row by row."""
+        self._require_scalar()
+        locations = [
+            self.hole_location(i, j)
+            for j, i in product(range(self.num_y), range(self.num_x))
+        ]
+        if self.filling_hole and not self.filling_hole_in_new_row:
+            locations.pop(self.num_x - 1)
+        return locations
+
+    def pillar_locations(self):
+        """Centres of every supporting pillar."""
+        self._require_scalar()
+        return [
+            self.pillar_location(i, j)
+            for i, j in product(range(self.num_x - 1), range(self.num_y - 1))
+        ]
+
+    def _require_scalar(self):
+        if isinstance(self.num_x, np.ndarray) or isinstance(self.num_y, np.ndarray):
+            raise ValueError("Location lists need a layout built from scalars")
+
+
+def seed_starter_layout(
+    gf_unit_x,
+    gf_unit_y,
+    cover_thickness=1,
+    wall_thickness=1,
+    with_stack_lip=True,
+    starter_min_width=55,
+    support_hole_width=41.5,
+    filling_hole=True,
+    filling_hole_in_new_row=True,
+    filling_hole_radius=10,
+) -> SeedStarterLayout:
+    """Compute the seed starter plate layout.
+
+    Takes the same parameters, with the same meaning, as
+    ``make_seed_starter_plate``. Any of them may be NumPy arrays, in which
+    case they are broadcast against each other.
+    """
+    edge_delta = GF_UNIT_WITDH_TOLERANCE * 2 + np.where(
+        with_stack_lip, GF_STACKING_LIP_SLICE_SIZE * 2, np.multiply(wall_thickness, 2)
+    )
+    cover_x_max = np.multiply(gf_unit_x, GF_UNIT_WIDTH) - edge_delta
+    cover_y_max = np.multiply(gf_unit_y, GF_UNIT_WIDTH) - edge_delta
+    filling_hole_in_new_row = np.logical_and(filling_hole_in_new_row, filling_hole)
+    filling_hole_outer_radius = np.add(filling_hole_radius, cover_thickness)
+    filling_hole_num = filling_hole_in_new_row.astype(int)
+
+    num_x = np.floor((cover_x_max - support_hole_width) / starter_min_width) + 1
+    num_y = (
+        np.floor(
+            (
+                cover_y_max
+                - support_hole_width
+                - filling_hole_outer_radius * 2 * filling_hole_num
+            )
+            / starter_min_width
+        )
+        + 1
+    )
+    num_x, num_y = num_x.astype(int), num_y.astype(int)
+
+    # Degenerate drawers in a screening grid may divide by zero; they come out
+    # as invalid layouts rather than warnings.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap_x, gap_fix_x = _cal_gap(
+            cover_x_max,
+            num_x,
+            0,
+            filling_hole_outer_radius,
+            starter_min_width,
+            support_hole_width,
+        )
+        gap_y, gap_fix_y = _cal_gap(
+            cover_y_max,
+            num_y,
+            filling_hole_num,
+            filling_hole_outer_radius,
+            starter_min_width,
+            support_hole_width,
+        )
+
+    return SeedStarterLayout(
+        *(
+            _scalar(np.asarray(value))
+            for value in (
+                cover_x_max,
+                cover_y_max,
+                support_hole_width,
+                filling_hole,
+                filling_hole_in_new_row,
+                filling_hole_outer_radius,
+                num_x,
+                num_y,
+                gap_x,
+                gap_fix_x,
+                gap_y,
+                gap_fix_y,
+            )
+        )
+    )
+
+
+# Grids whose best mesh point has less than this share of the best hole area
+# found so far are not refined.
+REFINE_MARGIN = 0.95
+
+
+class LayoutOptimum(NamedTuple):
+    """The result of :func:`optimize_seed_starter_layout`.
+
+    ``params`` are the ``make_seed_starter_plate`` parameters that were
+    optimized, ``layout`` is the layout they produce and ``cell_area`` the
+    open area of one seed hole.
+    """
+
+    params: dict
+    layout: SeedStarterLayout
+    cell_area: float
+
+
+def _cell_area(width, conner_radius):
+    return width**2 - (4 - pi) * conner_radius**2
+
+
+def _conner_radius(layout, pillar_keepout, radius_min):
+    """The smallest hole corner radius that keeps the holes clear of the
+    pillars by ``pillar_keepout``.
+
+    A pillar sits between the rounded corners of four holes. With ``a`` and
+    ``b`` half the gaps between them, the outer wall of a corner of radius
+    ``r`` is ``hypot(a + r, b + r) - r`` from the pillar axis, which grows
+    with ``r`` and reaches ``k`` at ``r = k - a - b + sqrt(2 (k - a)(k - b))``.
+    """
+    a = np.divide(np.add(layout.gap_x, layout.gap_fix_x), 2)
+    b = np.divide(np.add(layout.gap_y, layout.gap_fix_y), 2)
+    k = pillar_keepout
+    with np.errstate(invalid="ignore"):
+        radius = k - a - b + np.sqrt(2 * (k - a) * (k - b))
+    radius = np.where(a**2 + b**2 >= k**2, radius_min, np.maximum(radius, radius_min))
+    has_pillars = (np.asarray(layout.num_x) > 1) & (np.asarray(layout.num_y) > 1)
+    return np.where(has_pillars, radius, radius_min)
+
+
+def _slack(
+    layout,
+    conner_radius,
+    cover_thickness,
+    filling_hole_radius,
+    min_wall_gap,
+    min_edge_gap,
+    radius_max,
+):
+    """How far ``layout`` is inside each constraint, negative if violated."""
+    width = np.asarray(layout.support_hole_width)
+    between_x = np.add(layout.gap_x, layout.gap_fix_x) - 2 * cover_thickness
+    between_y = np.add(layout.gap_y, layout.gap_fix_y) - 2 * cover_thickness
+    no_slack_needed = np.inf
+    return np.stack(
+        np.broadcast_arrays(
+            # Plate margins.
+            np.subtract(layout.gap_x, min_edge_gap),
+            np.subtract(layout.gap_y, min_edge_gap),
+            # Plate between the walls of neighbouring holes.
+            np.where(layout.num_x > 1, between_x - min_wall_gap, no_slack_needed),
+            np.where(layout.num_y > 1, between_y - min_wall_gap, no_slack_needed),
+            # Corners that clear the pillars, with straight sides between them.
+            radius_max - conner_radius,
+            (width - 1) / 2 - conner_radius,
+            # The filling hole stays on the plate under the last column, or
+            # fits in the place of a seed hole.
+            np.where(
+                layout.filling_hole_in_new_row,
+                np.add(layout.gap_x, width / 2)
+                - layout.filling_hole_outer_radius
+                - min_edge_gap,
+                np.where(
+                    layout.filling_hole,
+                    width / 2 - filling_hole_radius,
+                    no_slack_needed,
+                ),
+            ),
+        )
+    )
+
+
+def _refine(evaluate, num_x, num_y, start, lower, upper):
+    """Maximize the hole area from the feasible ``start`` without leaving
+    the ``num_x`` by ``num_y`` grid; ``start`` if nlopt finds nothing better.
+    """
+
+    def area(x, grad):
+        layout, conner_radius, slack = evaluate(*x)
+        if layout.num_x != num_x or layout.num_y != num_y or np.min(slack) < 0:
+            # Subplex treats an infinitely bad point as outside the domain.
+            return -np.inf
+        return float(_cell_area(x[0], conner_radius))
+
+    opt = nlopt.opt(nlopt.LN_SBPLX, 2)
+    opt.set_lower_bounds(lower)
+    opt.set_upper_bounds(upper)
+    opt.set_max_objective(area)
+    opt.set_initial_step([0.1, 0.1])
+    opt.set_xtol_abs(1e-4)
+    opt.set_maxeval(200)
+    start = np.array(start, dtype=float)
+    try:
+        x = opt.optimize(start)
+    except nlopt.RoundoffLimited:
+        return start
+    return x if area(x, None) >= area(start, None) else start
+
+
+def optimize_seed_starter_layout(
+    gf_unit_x,
+    gf_unit_y,
+    objective="count",
+    min_count=1,
+    cover_thickness=1,
+    wall_thickness=1,
+    with_stack_lip=True,
+    filling_hole=True,
+    filling_hole_in_new_row=True,
+    filling_hole_radius=10,
+    internal_supporting_pillar_radius=3.5,
+    min_wall_gap=2,
+    min_edge_gap=0,
+    pillar_clearance=1,
+    hole_width_bounds=(35, 60),
+    hole_conner_radius_bounds=(3, 15),
+    resolution=128,
+) -> LayoutOptimum:
+    """Choose the seed hole grid for a ``gf_unit_x`` by ``gf_unit_y`` drawer.
+
+    Maximizes the open area of a hole over the hole width, its corner radius
+    and ``starter_min_width``, subject to
+
+    - at least ``min_wall_gap`` of plate between the walls of neighbouring
+      holes and ``min_edge_gap`` between the outer holes and the plate edge,
+    - ``pillar_clearance`` between each supporting pillar's collar and the
+      holes around it,
+    - the filling hole fitting beside the grid, or in place of a hole.
+
+    With ``objective="count"`` only grids with the most holes compete; with
+    ``objective="size"`` every grid with at least ``min_count`` holes does.
+    The layout is screened over a ``resolution`` squared mesh of widths and
+    pitches in one vectorized call, and the best mesh point of each
+    competing grid is refined with nlopt's Subplex within that grid. Bounds
+    are ``(min, max)`` in millimetres; the other parameters are those of
+    ``make_seed_starter_plate``.
+
+    Raises:
+        ValueError: if no layout satisfies the constraints.
+    """
+    if objective not in ("count", "size"):
+        raise ValueError(f"Unknown objective {objective!r}, use 'count' or 'size'")
+    (width_min, width_max), (radius_min, radius_max) = (
+        hole_width_bounds,
+        hole_conner_radius_bounds,
+    )
+    pillar_keepout = (
+        internal_supporting_pillar_radius
+        + wall_thickness
+        + pillar_clearance
+        + cover_thickness
+    )
+    fixed = dict(
+        cover_thickness=cover_thickness,
+        wall_thickness=wall_thickness,
+        with_stack_lip=with_stack_lip,
+        filling_hole=filling_hole,
+        filling_hole_in_new_row=filling_hole_in_new_row,
+        filling_hole_radius=filling_hole_radius,
+    )
+
+    def evaluate(width, gap):
+        layout = seed_starter_layout(
+            gf_unit_x,
+            gf_unit_y,
+            starter_min_width=np.add(width, gap),
+            support_hole_width=width,
+            **fixed,
+        )
+        conner_radius = _conner_radius(layout, pillar_keepout, radius_min)
+        slack = _slack(
+            layout,
+            conner_radius,
+            cover_thickness,
+            filling_hole_radius,
+            min_wall_gap,
+            min_edge_gap,
+            radius_max,
+        )
+        return layout, conner_radius, slack
+
+    # A gap narrower than the wall minimum only matters where the even
+    # spacing is wider anyway, and then widening it changes nothing.
+    gap_min = min_wall_gap + 2 * cover_thickness
+    gap_max = np.max(np.multiply((gf_unit_x, gf_unit_y), GF_UNIT_WIDTH))
+    widths = np.linspace(width_min, width_max, resolution)[:, None]
+    gaps = np.linspace(gap_min, gap_max, resolution)[None, :]
+    layout, conner_radius, slack = evaluate(widths, gaps)
+    count = np.asarray(layout.hole_count)
+    area = _cell_area(widths, conner_radius)
+    feasible = layout.valid & np.all(slack >= 0, axis=0) & (count >= min_count)
+    if not feasible.any():
+        raise ValueError(
+            f"No seed hole layout fits a {gf_unit_x}x{gf_unit_y} drawer "
+            "with these constraints"
+        )
+    if objective == "count":
+        feasible &= count == count[feasible].max()
+
+    # The best mesh point of every competing grid, refined within its grid.
+    # Refining moves less than a mesh step, so grids far behind are skipped.
+    grid = np.asarray(layout.num_x) * 1000 + np.asarray(layout.num_y)
+    grid = np.broadcast_to(grid, feasible.shape)
+    starts = []
+    for key in np.unique(grid[feasible]):
+        candidates = np.where(feasible & (grid == key), area, -np.inf)
+        i, j = np.unravel_index(np.argmax(candidates), candidates.shape)
+        starts.append((candidates[i, j], int(key), i, j))
+    best = None
+    for mesh_area, key, i, j in sorted(starts, reverse=True):
+        if best is not None and mesh_area < REFINE_MARGIN * best[0]:
+            break
+        num_x, num_y = divmod(key, 1000)
+        x = _refine(
+            evaluate,
+            num_x,
+            num_y,
+            (widths[i, 0], gaps[0, j]),
+            (width_min, gap_min),
+            (width_max, gap_max),
+        )
+        _, found_radius, _ = evaluate(*x)
+        found_area = float(_cell_area(x[0], found_radius))
+        if best is None or found_area > best[0]:
+            best = (found_area, x, found_radius)
+
+    found_area, (width, gap), found_radius = best
+    params = dict(
+        starter_min_width=float(width + gap),
+        support_hole_width=float(width),
+        support_hole_conner_radius=float(found_radius),
+    )
+    layout = seed_starter_layout(
+        gf_unit_x,
+        gf_unit_y,
+        starter_min_width=params["starter_min_width"],
+        support_hole_width=params["support_hole_width"],
+        **fixed,
+    )
+    return LayoutOptimum(params, layout, found_area)
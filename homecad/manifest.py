@@ -0,0 +1,137 @@
+"""Content-hash manifests that record what an export directory was built from.
+
+A build is keyed on the source of the model script, the source of every
+``homecad`` module it imports (directly or through other ``homecad`` modules),
+its parameters, the versions of the CAD libraries and the quality level.
+Export directories keep a ``manifest.json`` mapping each build to its key and
+to its files, relative to the directory, so anything whose key and files are
+unchanged can be skipped.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from importlib import metadata
+from pathlib import Path
+
+from homecad.quality import get_quality
+
+MANIFEST_NAME = "manifest.json"
+PACKAGE_DIR = Path(__file__).resolve().parent
+LIBRARIES = ("build123d", "cadquery-ocp", "bd_warehouse", "numpy")
+
+
+def library_versions():
+    """Installed versions of the libraries that shape the geometry."""
+    versions = {"python": ".".join(map(str, sys.version_info[:3]))}
+    for library in LIBRARIES:
+        try:
+            versions[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            versions[library] = None
+    return versions
+
+
+def _imported_modules(path):
+    tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module
+            yield from (f"{node.module}.{alias.name}" for alias in node.names)
+
+
+def source_files(path):
+    """``path`` and every ``homecad`` module it depends on, sorted."""
+    files, pending = set(), [Path(path).resolve()]
+    while pending:
+        file = pending.pop()
+        if file in files:
+            continue
+        files.add(file)
+        for module in _imported_modules(file):
+            package, _, name = module.partition(".")
+            if package != PACKAGE_DIR.name or not name:
+                continue
+            stem = PACKAGE_DIR / name.replace(".", "/")
+            for candidate in (stem.with_suffix(".py"), stem / "__init__.py"):
+                if candidate.exists():
+                    pending.append(candidate)
+    return sorted(files)
+
+
+def source_hash(path):
+    """Hash of ``path`` and the ``homecad`` modules it depends on."""
+    digest = hashlib.sha256()
+    for file in source_files(path):
+        digest.update(file.name.encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def build_key(source, params, options=None):
+    """Key of a build of the model script ``source`` with ``params``.
+
+    ``options`` are export options that change the output, such as budgets.
+    """
+    payload = json.dumps(
+        [
+            source_hash(source),
+            params,
+            options or {},
+            library_versions(),
+            get_quality().value,
+        ],
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def is_current(out_dir, entry, key):
+    """Whether manifest ``entry`` was built with ``key`` and its files exist."""
+    return (
+        entry is not None
+        and entry.get("key") == key
+        and all((Path(out_dir) / file).exists() for file in entry["files"])
+    )
+
+
+def relative_files(out_dir, files):
+    """``files`` relative to ``out_dir``, as recorded in its manifest."""
+    return [os.path.relpath(file, out_dir) for file in files]
+
+
+def manifest_entry(out_dir, key, params, result):
+    """Entry of a build with ``key`` whose export ``result`` is in ``out_dir``.
+
+    ``result`` is what :func:`homecad.scheduler.build_model` returns.
+    """
+    return {
+        "key": key,
+        "params": params,
+        "files": relative_files(out_dir, result["files"]),
+        "triangles": result["triangles"],
+        "build_time": result["build_time"],
+        "check_time": result["check_time"],
+        "export_time": result["export_time"],
+    }
+
+
+def load_manifest(out_dir):
+    path = Path(out_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def write_manifest(out_dir, manifest):
+    path = Path(out_dir) / MANIFEST_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False) as tmp:
+        json.dump(manifest, tmp, indent=2, sort_keys=True)
+    os.replace(tmp.name, path)
@@ -0,0 +1,658 @@
+"""Tessellation into NumPy arrays and streaming STL / 3MF writers.
+
+Shapes are tessellated once into :class:`Mesh` arrays, which every output
+format then writes from. The writers stream their output in chunks instead
+of building whole files in memory, and vertex welding is a vectorized
+``np.unique`` rather than a list lookup per vertex.
+
+Before writing, :func:`simplify` removes the vertices the surface does not
+need: those inside flat regions, which BRepMesh leaves where coplanar faces
+were not merged, those along straight creases, and the ends of sub-micron
+edges together with their sliver triangles. Its edge collapses are chosen
+and checked for a whole round at once on the arrays.
+
+Repeated parts are meshed once: a part that shares its topology with an
+earlier one (``copy``) becomes an instance of the earlier mesh, placed by its
+location. Deep copies (``pack``, ``moved``, ``copy.deepcopy``) share no
+topology; they become instances without being tessellated when their
+vertices and face areas and centroids are the earlier part's translated.
+3MF files store such a mesh once and place it with build items.
+"""
+
+import math
+import zipfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+from build123d import TOLERANCE, Compound
+from OCP.BRep import BRep_Tool
+from OCP.BRepGProp import BRepGProp
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+from OCP.GProp import GProp_GProps
+from OCP.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS
+
+CHUNK_SIZE = 1 << 16
+
+# Coarsest deflections used to meet a triangle budget, and the bisection steps
+# spent approaching it.
+MAX_LINEAR_DEFLECTION = 0.1
+MAX_ANGULAR_DEFLECTION = 0.8
+FIT_STEPS = 4
+
+# Edges shorter than this (mm) are collapsed by :func:`simplify`, far below
+# the deflection of any tessellation and what a printer resolves.
+SIMPLIFY_TOLERANCE = 1e-3
+# 1 - cosine of the angle under which triangles count as coplanar, and the
+# smallest (doubled) triangle area kept.
+_FLAT = 1e-10
+_AREA = 1e-12
+# Decimals kept of face areas and centroids when matching translated copies;
+# they are integrated, so coarser than the vertices' TOLERANCE.
+_FACE_DIGITS = 4
+
+_STL_DTYPE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+)
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+ <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+ <Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+ <Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+
+class Mesh(NamedTuple):
+    """A welded triangle mesh of one shape."""
+
+    vertices: np.ndarray  # (n, 3) float64
+    triangles: np.ndarray  # (m, 3) uint32 indices into vertices
+    name: str = ""
+    # (3, 4) affine placement of a shared mesh, None when already in place
+    transform: Optional[np.ndarray] = None
+
+    def placed_vertices(self):
+        """The vertices in their final position."""
+        if self.transform is None:
+            return self.vertices
+        return self.vertices @ self.transform[:, :3].T + self.transform[:, 3]
+
+
+def _split(shapes):
+    for shape in shapes if isinstance(shapes, Iterable) else [shapes]:
+        if isinstance(shape, Compound):
+            yield from _split(list(shape))
+        else:
+            yield shape
+
+
+def _matrix(trsf):
+    """The (3, 4) affine matrix of a ``gp_Trsf``."""
+    return np.array([[trsf.Value(i, j) for j in range(1, 5)] for i in range(1, 4)])
+
+
+def _face_triangles(face):
+    location = TopLoc_Location()
+    triangulation = BRep_Tool.Triangulation_s(face, location)
+    if triangulation is None:
+        return None
+    count = triangulation.NbNodes()
+    nodes = np.array([triangulation.Node(i).Coord() for i in range(1, count + 1)])
+    if not location.IsIdentity():
+        matrix = _matrix(location.Transformation())
+        nodes = nodes @ matrix[:, :3].T + matrix[:, 3]
+    triangles = np.array(
+        [
+            triangulation.Triangle(i).Get()
+            for i in range(1, triangulation.NbTriangles() + 1)
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    if face.Orientation() == TopAbs_REVERSED:
+        triangles = triangles[:, ::-1]
+    return nodes, triangles - 1
+
+
+def weld(vertices, triangles, digits=None):
+    """Merge vertices equal to ``digits`` decimals and drop degenerate triangles.
+
+    ``digits`` defaults to the precision of build123d's ``TOLERANCE``, which is
+    what ``Mesher`` rounds to.
+    """
+    if digits is None:
+        digits = -int(round(math.log(TOLERANCE, 10), 1))
+    unique, inverse = np.unique(
+        np.round(vertices, digits), axis=0, return_inverse=True
+    )
+    triangles = inverse.reshape(-1)[triangles]
+    keep = (
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 2] != triangles[:, 0])
+    )
+    return unique, triangles[keep].astype(np.uint32)
+
+
+def _edges(triangles, size):
+    """The undirected edges of ``triangles`` over ``size`` vertices.
+
+    Returns:
+        tuple: the ``(k, 2)`` edges, the number of triangles on each, the
+        half-edges sorted by edge (half-edge ``3i + j`` of triangle ``i``
+        starts at its corner ``j``) and where each edge's run of them starts.
+    """
+    half = np.stack([triangles, np.roll(triangles, -1, axis=1)], axis=-1)
+    half = np.sort(half.reshape(-1, 2), axis=1)
+    keys = half[:, 0] * size + half[:, 1]
+    order = np.argsort(keys)
+    keys = keys[order]
+    first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[first, len(keys)])
+    return np.stack(np.divmod(keys[first], size), axis=1), counts, order, first
+
+
+def _adjacency(pairs, size):
+    """CSR lists ``(offsets, items)`` of ``pairs[:, 1]`` per ``pairs[:, 0]``."""
+    order = np.argsort(pairs[:, 0], kind="stable")
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pairs[:, 0], minlength=size), out=offsets[1:])
+    return offsets, pairs[order, 1]
+
+
+def _expand(offsets, items, rows):
+    """Flatten the CSR lists of ``rows`` into ``(position in rows, item)``."""
+    counts = offsets[rows + 1] - offsets[rows]
+    owner = np.repeat(np.arange(len(rows)), counts)
+    first = np.repeat(offsets[rows] - np.cumsum(counts) + counts, counts)
+    return owner, items[first + np.arange(len(owner))]
+
+
+def _grow(values, edges):
+    """``values`` raised to their maximum over each vertex' neighbours."""
+    grown = values.copy()
+    edges = edges[(values[edges] >= 0).any(axis=1)]
+    np.maximum.at(grown, edges[:, 0], values[edges[:, 1]])
+    np.maximum.at(grown, edges[:, 1], values[edges[:, 0]])
+    return grown
+
+
+def _collapses(vertices, triangles, tolerance, active):
+    """Half-edge collapses ``(v, u)`` that keep the surface of ``triangles``.
+
+    An ``active`` vertex ``v`` is merged into its neighbour ``u`` if their
+    edge is shorter than ``tolerance``, if every triangle around ``v`` lies
+    in one plane, or if ``v`` lies on a straight crease between two planes
+    and ``u`` is next to it on the crease. A collapse must not turn any
+    remaining triangle over or, except for short edges, out of its plane,
+    and must keep the mesh manifold. The vertices collapsed are at least
+    three edges apart, so that all their collapses can be applied at once.
+
+    Returns:
+        tuple: ``v`` and ``u``, the mask of the other candidates, waiting
+        for a later round, and that of the vertices chosen but without a
+        valid collapse.
+    """
+    size = len(vertices)
+    corners = vertices[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    edges, counts, order, first = _edges(triangles, size)
+
+    # An edge is flat if it joins two consistently oriented coplanar triangles,
+    # any other edge is a feature.
+    flat = np.zeros(len(edges), dtype=bool)
+    pairs = np.flatnonzero(counts == 2)
+    half_a, half_b = order[first[pairs]], order[first[pairs] + 1]
+    flat[pairs] = (
+        np.einsum("ij,ij->i", normals[half_a // 3], normals[half_b // 3])
+        > 1 - _FLAT
+    ) & (triangles.reshape(-1)[half_a] != triangles.reshape(-1)[half_b])
+    feature = edges[~flat]
+    feature_degree = np.bincount(feature.ravel(), minlength=size)
+    directions = vertices[feature[:, 1]] - vertices[feature[:, 0]]
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    turn = np.stack(
+        [
+            np.bincount(feature[:, 0], directions[:, i], size)
+            - np.bincount(feature[:, 1], directions[:, i], size)
+            for i in range(3)
+        ],
+        axis=1,
+    )
+    straight = (feature_degree == 2) & (np.einsum("ij,ij->i", turn, turn) < 2 * _FLAT)
+    movable = active.copy()
+    movable[edges[counts != 2].ravel()] = False
+
+    # Candidates, both directions of every edge.
+    index = np.tile(np.arange(len(edges)), 2)
+    v = np.concatenate([edges[:, 0], edges[:, 1]])
+    u = np.concatenate([edges[:, 1], edges[:, 0]])
+    keep = movable[v] & ((feature_degree[v] == 0) | (straight[v] & ~flat[index]))
+    length = np.linalg.norm(vertices[v] - vertices[u], axis=1)
+    short = length < tolerance
+    keep |= movable[v] & short
+    index, v, u, length, short = (a[keep] for a in (index, v, u, length, short))
+    waiting = np.zeros(size, dtype=bool)
+    waiting[v] = True
+
+    # Vertices ranking first among the candidates within two edges of them,
+    # those with short edges first and the others in random order, so that
+    # many collapse at once even on a regular grid.
+    candidates = np.flatnonzero(waiting)
+    has_short = np.zeros(size, dtype=bool)
+    has_short[v[short]] = True
+    shuffle = np.random.default_rng(len(triangles)).random(len(candidates))
+    rank = np.full(size, -1)
+    rank[candidates[np.lexsort((shuffle, has_short[candidates]))]] = np.arange(
+        len(candidates)
+    )
+    chosen = _grow(_grow(rank, edges), edges) == rank
+    chosen &= waiting
+    waiting &= ~chosen
+    keep = chosen[v]
+    index, v, u, length, short = (a[keep] for a in (index, v, u, length, short))
+
+    # Every triangle around v must stay the right way up, and in its plane
+    # unless the edge is short; those also containing u disappear.
+    around = np.flatnonzero(chosen[triangles].any(axis=1))
+    corner = np.stack([triangles[around].ravel(), np.repeat(around, 3)], axis=1)
+    owner, around = _expand(*_adjacency(corner[chosen[corner[:, 0]]], size), v)
+    moved = np.where(
+        (triangles[around] == v[owner, None])[..., None],
+        vertices[u[owner], None],
+        vertices[triangles[around]],
+    )
+    new = np.cross(moved[:, 1] - moved[:, 0], moved[:, 2] - moved[:, 0])
+    area = np.linalg.norm(new, axis=1)
+    cosine = np.einsum("ij,ij->i", new, normals[around]) / np.maximum(area, _AREA)
+    removed = (triangles[around] == u[owner, None]).any(axis=1)
+    upright = (area > _AREA) & (cosine > np.where(short[owner], 0, 1 - _FLAT))
+    valid = np.bincount(owner, ~(removed | upright), len(v)) == 0
+
+    # Link condition: v and u only share the neighbours across their edge.
+    marked = chosen.copy()
+    marked[u] = True
+    near = edges[marked[edges].any(axis=1)]
+    near = np.concatenate([near, near[:, ::-1]])
+    neighbours = _adjacency(near[marked[near[:, 0]]], size)
+    owner_v, near_v = _expand(*neighbours, v)
+    owner_u, near_u = _expand(*neighbours, u)
+    both = np.concatenate([owner_v, owner_u]) * size + np.concatenate([near_v, near_u])
+    shared_keys, shared = np.unique(both, return_counts=True)
+    common = np.bincount(shared_keys[shared == 2] // size, minlength=len(v))
+    valid &= common == counts[index]
+
+    # The shortest valid collapse of every chosen vertex.
+    v, u, length = v[valid], u[valid], length[valid]
+    order = np.lexsort((length, v))
+    order = order[np.unique(v[order], return_index=True)[1]]
+    v, u = v[order], u[order]
+    stuck = chosen
+    stuck[v] = False
+    return v, u, waiting, stuck
+
+
+def simplify(vertices, triangles, tolerance=SIMPLIFY_TOLERANCE):
+    """Remove the vertices of a welded mesh that its surface does not need.
+
+    Flat regions are re-triangulated from their outlines, vertices along
+    straight creases are dropped, and edges shorter than ``tolerance``
+    collapse together with their sliver triangles (see :func:`_collapses`).
+    Apart from the short edges, which move the surface by less than
+    ``tolerance``, the surface is unchanged. Vertices on open or
+    non-manifold edges are kept, and a ``tolerance`` of 0 leaves the mesh
+    as it is.
+
+    The collapses are applied in rounds. The first looks at the whole mesh,
+    later ones only at the triangles near vertices still waiting and near
+    the last round's changes.
+    """
+    if not len(triangles) or tolerance <= 0:
+        return vertices, triangles
+    triangles = triangles.astype(np.int64)
+    active = np.ones(len(vertices), dtype=bool)
+    stuck = np.zeros(len(vertices), dtype=bool)
+    nearby = slice(None)
+    while active.any():
+        v, u, waiting, failed = _collapses(
+            vertices, triangles[nearby], tolerance, active
+        )
+        target = np.arange(len(vertices))
+        target[v] = u
+        triangles = target[triangles]
+        keep = (
+            (triangles[:, 0] != triangles[:, 1])
+            & (triangles[:, 1] != triangles[:, 2])
+            & (triangles[:, 2] != triangles[:, 0])
+        )
+        triangles = triangles[keep]
+        # A vertex without a valid collapse waits until one of its
+        # neighbours collapses. The targets may have got short edges.
+        changed = np.zeros(len(vertices), dtype=bool)
+        changed[u] = True
+        changed[triangles[changed[triangles].any(axis=1)]] = True
+        stuck |= failed
+        active = waiting | (stuck & changed)
+        active[u] = True
+        stuck &= ~changed
+        ring = np.zeros(len(vertices), dtype=bool)
+        ring[triangles[active[triangles].any(axis=1)]] = True
+        nearby = ring[triangles].any(axis=1)
+    used, triangles = np.unique(triangles, return_inverse=True)
+    return vertices[used], triangles.reshape(-1, 3).astype(np.uint32)
+
+
+def _signature(shape):
+    """Key equal for shapes that are translated copies of each other.
+
+    The key holds the shape's vertices and the area and centroid of each of
+    its faces, all relative to the lowest vertex corner. Vertices alone do
+    not tell a rotated or mirrored copy from a translated one when the
+    shape is symmetric, its faces do: a half cylinder turned about its axis
+    has the same corners but its curved face bulges the other way.
+
+    Returns:
+        tuple: the key and the offset of the shape's lowest vertex corner.
+    """
+    points = np.array([(vertex.X, vertex.Y, vertex.Z) for vertex in shape.vertices()])
+    if not len(points):
+        return None, None
+    origin = points.min(axis=0)
+    points = np.round(points - origin, -int(round(math.log(TOLERANCE, 10), 1)))
+    points = points[np.lexsort(points.T[::-1])]
+    faces = []
+    explorer = TopExp_Explorer(shape.wrapped, TopAbs_FACE)
+    while explorer.More():
+        properties = GProp_GProps()
+        BRepGProp.SurfaceProperties_s(explorer.Current(), properties)
+        centre = properties.CentreOfMass()
+        faces.append((properties.Mass(), centre.X(), centre.Y(), centre.Z()))
+        explorer.Next()
+    faces = np.round(np.array(faces).reshape(-1, 4) - [0, *origin], _FACE_DIGITS)
+    faces = faces[np.lexsort(faces.T[::-1])]
+    key = (len(shape.edges()), points.tobytes(), faces.tobytes())
+    return key, origin
+
+
+def _translation(offset):
+    transform = np.zeros((3, 4))
+    transform[:, :3] = np.eye(3)
+    transform[:, 3] = offset
+    return transform
+
+
+def _mesh_shape(shape, linear_deflection, angular_deflection):
+    # Drop any earlier triangulation, BRepMesh would only ever refine it.
+    BRepTools.Clean_s(shape.wrapped)
+    BRepMesh_IncrementalMesh(
+        shape.wrapped, linear_deflection, True, angular_deflection, True
+    )
+    vertices, triangles, offset = [], [], 0
+    explorer = TopExp_Explorer(shape.wrapped, TopAbs_FACE)
+    while explorer.More():
+        face = _face_triangles(TopoDS.Face_s(explorer.Current()))
+        explorer.Next()
+        if face is None:
+            continue
+        vertices.append(face[0])
+        triangles.append(face[1] + offset)
+        offset += len(face[0])
+    if not triangles:
+        return None
+    return Mesh(
+        *simplify(*weld(np.concatenate(vertices), np.concatenate(triangles))),
+        name=shape.label or "",
+    )
+
+
+def _fit(shape, mesh, budget, linear_deflection, angular_deflection):
+    """Coarsen ``shape``'s ``mesh`` until it has at most ``budget`` triangles.
+
+    Both deflections are scaled by a common factor, each capped at
+    MAX_LINEAR_DEFLECTION and MAX_ANGULAR_DEFLECTION, and the factor is
+    found by growing it fourfold and then bisecting. Returns the finest mesh
+    within budget, or the coarsest one possible.
+    """
+
+    def remesh(scale):
+        return _mesh_shape(
+            shape,
+            min(linear_deflection * scale, MAX_LINEAR_DEFLECTION),
+            min(angular_deflection * scale, MAX_ANGULAR_DEFLECTION),
+        )
+
+    max_scale = max(
+        MAX_LINEAR_DEFLECTION / linear_deflection,
+        MAX_ANGULAR_DEFLECTION / angular_deflection,
+    )
+    if max_scale <= 1:
+        return mesh
+    low, high, fitted = 1.0, 1.0, None
+    while fitted is None:
+        low, high = high, min(high * 4, max_scale)
+        candidate = remesh(high)
+        if len(candidate.triangles) <= budget or high == max_scale:
+            fitted = candidate
+    for _ in range(FIT_STEPS):
+        scale = (low * high) ** 0.5
+        candidate = remesh(scale)
+        if len(candidate.triangles) <= budget:
+            high, fitted = scale, candidate
+        else:
+            low = scale
+    return fitted
+
+
+def _fit_all(parts, meshes, copies, budget, linear_deflection, angular_deflection):
+    """Coarsen the ``meshes`` of ``parts`` to fit ``budget`` triangles in all.
+
+    ``copies`` counts the placements of every mesh. The budget is shared
+    among the parts in proportion to their triangle counts. A part that
+    cannot get below its share keeps its coarsest mesh, and the other parts
+    are fitted again to share what it leaves.
+    """
+    fitted = list(meshes)
+    free = set(range(len(meshes)))
+    while free:
+        left = budget - sum(
+            len(fitted[i].triangles) * copies[i]
+            for i in range(len(meshes))
+            if i not in free
+        )
+        total = sum(len(meshes[i].triangles) * copies[i] for i in free)
+        coarsest = set()
+        for i in free:
+            share = max(int(left * len(meshes[i].triangles) / total), 0)
+            fitted[i] = meshes[i]
+            if len(meshes[i].triangles) > share:
+                fitted[i] = _fit(
+                    parts[i], meshes[i], share, linear_deflection, angular_deflection
+                )
+            if len(fitted[i].triangles) > share:
+                coarsest.add(i)
+        if not coarsest or coarsest == free:
+            break
+        free -= coarsest
+    return fitted
+
+
+def triangle_budget(max_bytes):
+    """Triangles that fit in a binary STL of ``max_bytes``."""
+    return max((max_bytes - 84) // 50, 1)
+
+
+def tessellate(
+    shapes, linear_deflection=0.001, angular_deflection=0.1, max_triangles=None
+):
+    """Tessellate ``shapes`` into one welded, simplified :class:`Mesh` per solid.
+
+    Compounds are split into their children, and the deflections have the
+    same (relative) meaning as in ``Mesher.add_shape``. Repeated parts share
+    the arrays of the first one and carry a ``transform``.
+
+    With ``max_triangles`` the parts are first meshed at the given
+    deflections; if that is over budget, the budget is shared among the
+    parts in proportion to their triangle counts and each part over its
+    share is re-meshed with coarser deflections to fit it (see
+    :func:`_fit_all`). The budget is only exceeded if the coarsest meshes of
+    the parts together exceed it, and then those are returned.
+    """
+    parts, meshes, copies = [], [], []
+    origins, signatures = [], {}
+    placements = []  # (index into meshes, name, transform)
+    for shape in _split(shapes):
+        key, origin = _signature(shape)
+        for index, part in enumerate(parts):
+            if shape.wrapped.IsPartner(part.wrapped):
+                relative = shape.wrapped.Location().Transformation().Multiplied(
+                    part.wrapped.Location().Transformation().Inverted()
+                )
+                transform = _matrix(relative)
+                break
+        else:
+            index, transform = signatures.get(key), None
+            if index is not None:
+                transform = _translation(origin - origins[index])
+        if index is None:
+            result = _mesh_shape(shape, linear_deflection, angular_deflection)
+            if result is None:
+                continue
+            index = len(parts)
+            parts.append(shape)
+            meshes.append(result)
+            copies.append(0)
+            origins.append(origin)
+            if key is not None:
+                signatures.setdefault(key, index)
+        copies[index] += 1
+        placements.append((index, shape.label or "", transform))
+    total = sum(len(result.triangles) * n for result, n in zip(meshes, copies))
+    if max_triangles is not None and total > max_triangles:
+        meshes = _fit_all(
+            parts, meshes, copies, max_triangles, linear_deflection, angular_deflection
+        )
+    return [
+        Mesh(meshes[index].vertices, meshes[index].triangles, name, transform)
+        for index, name, transform in placements
+    ]
+
+
+def write_stl(meshes, path):
+    """Write ``meshes`` as one binary STL, streamed a chunk at a time."""
+    count = sum(len(mesh.triangles) for mesh in meshes)
+    with open(path, "wb") as file:
+        file.write(b"STL written by homecad".ljust(80, b" "))
+        file.write(np.uint32(count).tobytes())
+        for mesh in meshes:
+            vertices = mesh.placed_vertices()
+            for start in range(0, len(mesh.triangles), CHUNK_SIZE):
+                corners = vertices[mesh.triangles[start : start + CHUNK_SIZE]]
+                normals = np.cross(
+                    corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+                )
+                lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+                np.divide(normals, lengths, out=normals, where=lengths > 0)
+                chunk = np.zeros(len(corners), dtype=_STL_DTYPE)
+                chunk["normal"] = normals
+                chunk["vertices"] = corners
+                file.write(chunk.tobytes())
+
+
+def _rows(template, array):
+    """Format every row of ``array`` with ``template``, chunk by chunk."""
+    for start in range(0, len(array), CHUNK_SIZE):
+        chunk = array[start : start + CHUNK_SIZE]
+        yield (template * len(chunk)) % tuple(chunk.ravel().tolist())
+
+
+def _item_transform(transform):
+    """3MF ``transform`` attribute, whose matrix multiplies row vectors."""
+    if transform is None:
+        return ""
+    values = [*transform[:, :3].T.ravel(), *transform[:, 3]]
+    return f' transform="{" ".join(f"{value:.6f}" for value in values)}"'
+
+
+def write_3mf(meshes, path, metadata=()):
+    """Write ``meshes`` as a 3MF package, streaming the model XML into the zip.
+
+    Args:
+        meshes: the :class:`Mesh` objects, each becoming an item. Meshes that
+            share their arrays are written as one object placed by several
+            items with transforms.
+        path: output file.
+        metadata (optional): ``(name_space, name, value, type)`` tuples.
+    """
+    namespaces = sorted({name_space for name_space, *_ in metadata})
+    prefixes = {name_space: f"ns{i}" for i, name_space in enumerate(namespaces)}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        package.writestr("_rels/.rels", _RELS)
+        with package.open("3D/3dmodel.model", "w") as model:
+
+            def emit(text):
+                model.write(text.encode("utf-8"))
+
+            emit(
+                '<?xml version="1.0" encoding="UTF-8"?>\n<model unit="millimeter"'
+                ' xml:lang="en-US"'
+                ' xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02"'
+            )
+            for name_space, prefix in prefixes.items():
+                emit(f" xmlns:{prefix}={quoteattr(name_space)}")
+            emit(">\n")
+            for name_space, name, value, metadata_type in metadata:
+                emit(
+                    f" <metadata name={quoteattr(f'{prefixes[name_space]}:{name}')}"
+                    f' preserve="0" type={quoteattr(metadata_type)}>'
+                    f"{escape(value)}</metadata>\n"
+                )
+            emit(" <resources>\n")
+            objects, items = {}, []
+            for mesh in meshes:
+                index = objects.get(id(mesh.vertices))
+                if index is not None:
+                    items.append((index, mesh.transform))
+                    continue
+                index = objects[id(mesh.vertices)] = len(objects) + 1
+                items.append((index, mesh.transform))
+                name = f" name={quoteattr(mesh.name)}" if mesh.name else ""
+                emit(f'  <object id="{index}" type="model"{name}>\n')
+                emit("   <mesh>\n    <vertices>\n")
+                template = '     <vertex x="%.6f" y="%.6f" z="%.6f"/>\n'
+                for text in _rows(template, mesh.vertices):
+                    emit(text)
+                emit("    </vertices>\n    <triangles>\n")
+                template = '     <triangle v1="%d" v2="%d" v3="%d"/>\n'
+                for text in _rows(template, mesh.triangles):
+                    emit(text)
+                emit("    </triangles>\n   </mesh>\n  </object>\n")
+            emit(" </resources>\n <build>\n")
+            for index, transform in items:
+                emit(f'  <item objectid="{index}"{_item_transform(transform)}/>\n')
+            emit(" </build>\n</model>\n")
+
+
+def write(meshes, path, metadata=()):
+    """Write ``meshes`` in the format given by the suffix of ``path``."""
+    suffix = Path(path).suffix
+    if suffix == ".stl":
+        write_stl(meshes, path)
+    elif suffix == ".3mf":
+        write_3mf(meshes, path, metadata)
+    else:
+        raise ValueError(f"Unknown file format {suffix}, expected .stl or .3mf")
@@ -0,0 +1,74 @@
+"""Discovery and headless building of the scripts under ``models/``.
+
+Every model module exposes ``build(**params)``, which returns the shape or
+shapes to export, and only runs its build, export and viewer code when
+executed as a script. That makes them safe to import here in batch.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MODELS_DIR = ROOT_DIR / "models"
+EXPORTS_DIR = ROOT_DIR / "exports"
+
+
+def exports_dir(quality="final"):
+    """Default export directory of a quality level given by name.
+
+    Final exports go to ``exports/``, others to a subdirectory named after
+    their level, such as ``exports/draft/``.
+    """
+    return EXPORTS_DIR if quality == "final" else EXPORTS_DIR / quality
+
+
+def model_names():
+    """Names of all models, i.e. the file stems under ``models/``."""
+    return sorted(path.stem for path in MODELS_DIR.glob("*.py"))
+
+
+def model_path(name):
+    path = MODELS_DIR / f"{name}.py"
+    if not path.exists():
+        raise ValueError(f"Unknown model {name!r}, expected one of {model_names()}")
+    return path
+
+
+def load(name):
+    """Import the model module ``name``, once per process."""
+    module_name = f"models.{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, model_path(name))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def reload(name):
+    """Import the model module ``name`` again, e.g. after it was edited."""
+    sys.modules.pop(f"models.{name}", None)
+    return load(name)
+
+
+def build(name, **params):
+    """Build model ``name`` and return its shapes."""
+    return load(name).build(**params)
+
+
+def export(name, shapes, out_dir=EXPORTS_DIR, **options):
+    """Export ``shapes`` of model ``name`` the way its script does.
+
+    ``options`` are passed on to :func:`homecad.export.export_shapes`.
+    """
+    from homecad.export import export_shapes
+
+    return export_shapes(
+        shapes, Path(out_dir) / name, source=model_path(name), **options
+    )
@@ -0,0 +1,60 @@
+"""Build independent parts in worker processes.
+
+Each task runs in a separate process and its result travels back to the
+parent as binary BREP (see :mod:`homecad.brep`), so OCCT work on independent
+parts is no longer serialized on a single core.
+
+Workers are handed the module and name of each task's function and import it
+themselves, models through :func:`homecad.models.load`, so tasks work under
+every multiprocessing start method and not only where workers are forked
+with the parent's modules already imported.
+"""
+
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+from homecad import brep, models, trace
+
+
+def reference(func):
+    """The ``(module, name)`` a worker process imports ``func`` by."""
+    name = getattr(func, "__qualname__", "")
+    if not name or "<" in name or "." in name:
+        raise ValueError(f"{func!r} is not a module-level function")
+    return func.__module__, name
+
+
+def resolve(ref):
+    """Import the function named by :func:`reference` in this process."""
+    module_name, name = ref
+    package, _, model = module_name.partition(".")
+    if package == "models" and model:
+        module = models.load(model)
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, name)
+
+
+def _build(ref, args, kwargs):
+    return brep.dumps(resolve(ref)(*args, **kwargs))
+
+
+def build_parts(tasks, parallel=True, max_workers=None):
+    """Run ``tasks`` and return their results under the same keys.
+
+    Args:
+        tasks (dict): name -> ``(func, args, kwargs)``. ``func`` must be a
+            module-level function returning a shape or a tuple of shapes.
+        parallel (bool, optional): build in a process pool. When False the
+            tasks run one after another in this process, as they also do
+            while :mod:`homecad.trace` is recording. Defaults to True.
+        max_workers (int, optional): pool size. Defaults to the CPU count.
+    """
+    if not parallel or trace.enabled():
+        return {name: func(*args, **kwargs) for name, (func, args, kwargs) in tasks.items()}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            name: pool.submit(_build, reference(func), args, kwargs)
+            for name, (func, args, kwargs) in tasks.items()
+        }
+        return {name: brep.loads(future.result()) for name, future in futures.items()}
@@ -0,0 +1,59 @@
+"""Global draft/final level of detail.
+
+``final`` builds every model at full fidelity. ``draft`` is meant for the
+edit and view loop: cosmetic fillets and chamfers are skipped, threads
+become plain cylinders and exports are tessellated coarsely. The level comes
+from ``HOMECAD_QUALITY`` (``final`` by default) and can be changed with
+:func:`set_quality`, which also exports it to worker processes.
+
+Shapes cached by :func:`homecad.cache.disk_cache` and build manifests are
+keyed on the level, so draft and final results never mix.
+"""
+
+import os
+from enum import Enum
+
+
+class Quality(Enum):
+    DRAFT = "draft"
+    FINAL = "final"
+
+
+# Linear (relative) and angular deflection used to tessellate exports.
+TESSELLATION = {
+    Quality.DRAFT: (0.01, 0.5),
+    Quality.FINAL: (0.001, 0.1),
+}
+
+
+def get_quality() -> Quality:
+    return Quality(os.environ.get("HOMECAD_QUALITY", Quality.FINAL.value).lower())
+
+
+def set_quality(quality):
+    """Switch to ``quality``, a :class:`Quality` or its name."""
+    os.environ["HOMECAD_QUALITY"] = Quality(quality).value
+
+
+def is_draft() -> bool:
+    return get_quality() == Quality.DRAFT
+
+
+def cosmetic_fillet(*args, **kwargs):
+    """``fillet`` that is skipped in draft quality."""
+    if is_draft():
+        return None
+    # Imported on use: the level is read by code that never touches the CAD
+    # stack, and ``homecad.trace`` sees the call through the build123d module.
+    import build123d
+
+    return build123d.fillet(*args, **kwargs)
+
+
+def cosmetic_chamfer(*args, **kwargs):
+    """``chamfer`` that is skipped in draft quality."""
+    if is_draft():
+        return None
+    import build123d
+
+    return build123d.chamfer(*args, **kwargs)
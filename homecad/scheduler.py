@@ -0,0 +1,122 @@
+"""Build many models at once, longest first.
+
+Every model build runs in its own worker process, at most ``max_workers`` at
+a time, so a build that raises or crashes the interpreter is reported as a
+failure of that model while the others carry on. Models are started in
+order of their expected duration, taken from the build manifest and the
+benchmark history, so the longest build starts first and the total is
+bounded by it instead of by the sum of all builds. Results are yielded as
+each build finishes.
+"""
+
+import os
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+
+from homecad import bench, models
+from homecad.quality import get_quality
+
+
+def timed_build(name, params, options, out_dir):
+    """Build and export model ``name``, timing both phases.
+
+    Returns:
+        tuple: the shapes and the export result with ``build_time`` and
+        ``export_time`` added; ``export_time`` leaves out the result's
+        ``check_time``.
+    """
+    start = time.perf_counter()
+    shapes = models.build(name, **params)
+    built = time.perf_counter()
+    result = models.export(name, shapes, out_dir=out_dir, **options)
+    return shapes, {
+        **result,
+        "build_time": built - start,
+        "export_time": time.perf_counter() - built - result["check_time"],
+    }
+
+
+def build_model(name, params, options, out_dir):
+    """The export result of :func:`timed_build`, which is picklable."""
+    return timed_build(name, params, options, out_dir)[1]
+
+
+def expected_times(names, manifest=None, history=None):
+    """Expected build and export time of each of ``names``, None if unknown.
+
+    The last recorded build in ``manifest`` wins over the benchmark
+    ``history`` of the current quality level.
+    """
+    manifest = manifest or {}
+    if history is None:
+        history = bench.load_history()
+    benchmarks = bench.baseline(history, get_quality().value)
+    times = {}
+    for name in names:
+        entry = manifest.get(name) or {}
+        if "build_time" in entry:
+            times[name] = (
+                entry["build_time"]
+                + entry.get("check_time", 0.0)
+                + entry.get("export_time", 0.0)
+            )
+        elif name in benchmarks:
+            times[name] = benchmarks[name]["total"]
+        else:
+            times[name] = None
+    return times
+
+
+def longest_first(times):
+    """Names in ``times`` ordered longest first, those never timed before all."""
+    return sorted(
+        times, key=lambda name: (times[name] is not None, -(times[name] or 0))
+    )
+
+
+def _work(connection, func, args):
+    try:
+        result = func(*args)
+    except Exception as error:
+        result = {"error": repr(error)}
+    connection.send(result)
+    connection.close()
+
+
+def run_isolated(jobs, max_workers=None, started=None):
+    """Run ``jobs`` in worker processes and yield their results as they finish.
+
+    Args:
+        jobs: ``(name, func, args)`` tuples, started in the given order.
+            ``func`` must return something picklable.
+        max_workers (int, optional): processes running at once, default the
+            CPU count.
+        started (callable, optional): called with a job's name as it starts.
+
+    Yields:
+        tuple: ``(name, result)``, where a job that raised or whose process
+        died has ``{"error": ...}`` as result.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    pending, running = list(jobs), {}
+    while pending or running:
+        while pending and len(running) < max_workers:
+            name, func, args = pending.pop(0)
+            receiver, sender = Pipe(duplex=False)
+            process = Process(target=_work, args=(sender, func, args), name=name)
+            process.start()
+            sender.close()
+            running[receiver] = (name, process)
+            if started is not None:
+                started(name)
+        for receiver in wait(list(running)):
+            name, process = running.pop(receiver)
+            try:
+                result = receiver.recv()
+            except EOFError:
+                process.join()
+                result = {"error": f"worker exited with code {process.exitcode}"}
+            receiver.close()
+            process.join()
+            yield name, result
@@ -0,0 +1,113 @@
+"""Position queries over the edges, faces or vertices of a part.
+
+build123d's ``filter_by_position`` and ``sort_by`` move a copy of every
+candidate into the frame of the axis on every call, and chained filters do
+it once per filter. :class:`ShapeIndex` reads the centres once into a NumPy
+array and keeps one sorted order per axis, so axis queries are a binary
+search and box and nearest queries are a single vectorized pass. Within a
+builder, :func:`index` caches the indexes of a part, so repeated lookups on
+an unchanged part share one, and the cache goes away with the builder::
+
+    top_face = index(part, "faces").at(Axis.Z, height)[0]
+    corner = index(part, "edges").nearest((x, y, z))[0]
+
+Results are ``ShapeList`` objects ordered the way build123d orders them, so
+they can replace ``sort_by`` and ``filter_by_position`` one for one.
+"""
+
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from build123d import Axis, Builder, ShapeList, Vector
+
+POSITION_TOLERANCE = 0.001
+
+# Builder -> {(shape, kind): index}. Sub-shapes refer to their part, so a
+# cache keyed on parts alone would keep every indexed part alive.
+_indexes = WeakKeyDictionary()
+
+
+class ShapeIndex:
+    """Sorted centres of ``shapes`` for fast position queries."""
+
+    def __init__(self, shapes):
+        self.shapes = list(shapes)
+        self.centers = np.array(
+            [tuple(shape.center()) for shape in self.shapes], dtype=float
+        ).reshape(-1, 3)
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def _positions(self, axis):
+        """Centres along ``axis``, with the order that sorts them."""
+        key = (tuple(axis.position), tuple(axis.direction))
+        if key not in self._orders:
+            positions = (self.centers - tuple(axis.position)) @ tuple(axis.direction)
+            order = np.argsort(positions, kind="stable")
+            self._orders[key] = order, positions[order]
+        return self._orders[key]
+
+    def _select(self, indices):
+        return ShapeList(self.shapes[i] for i in indices)
+
+    def sort_by(self, axis=Axis.Z, reverse=False):
+        """All shapes ordered by their centre along ``axis``."""
+        order, _ = self._positions(axis)
+        return self._select(order[::-1] if reverse else order)
+
+    def filter_by_position(self, axis, minimum, maximum):
+        """Shapes centred between ``minimum`` and ``maximum`` along ``axis``.
+
+        Bounds are inclusive and the result is ordered along ``axis``.
+        """
+        order, positions = self._positions(axis)
+        start = np.searchsorted(positions, minimum, side="left")
+        end = np.searchsorted(positions, maximum, side="right")
+        return self._select(order[start:end])
+
+    def at(self, axis, value, tolerance=POSITION_TOLERANCE):
+        """Shapes centred at ``value`` along ``axis``."""
+        return self.filter_by_position(axis, value - tolerance, value + tolerance)
+
+    def within(self, minimum, maximum):
+        """Shapes whose centre lies in the box from ``minimum`` to ``maximum``.
+
+        Corners may have fewer than three coordinates, and ``None`` leaves a
+        coordinate unbounded. The result is ordered like chained
+        ``filter_by_position`` calls along X, Y and Z order it: by the last
+        bounded coordinate, then by the ones before it.
+        """
+        lower = np.array([-np.inf if v is None else v for v in minimum], dtype=float)
+        upper = np.array([np.inf if v is None else v for v in maximum], dtype=float)
+        centers = self.centers[:, : len(lower)]
+        inside = np.all((centers >= lower) & (centers <= upper), axis=1)
+        inside = np.flatnonzero(inside)
+        bounded = np.isfinite(lower) | np.isfinite(upper)
+        keys = [centers[inside, axis] for axis in np.flatnonzero(bounded)]
+        return self._select(inside[np.lexsort([inside, *keys])])
+
+    def nearest(self, point, count=1):
+        """The ``count`` shapes centred closest to ``point``, closest first."""
+        distances = np.linalg.norm(self.centers - tuple(Vector(point)), axis=1)
+        count = min(count, len(distances))
+        closest = np.argpartition(distances, count - 1)[:count] if count else []
+        return self._select(sorted(closest, key=lambda i: distances[i]))
+
+
+def index(shape, kind="edges"):
+    """The :class:`ShapeIndex` of ``shape``'s ``kind`` sub-shapes.
+
+    ``kind`` names a ``Shape`` method such as ``"edges"``, ``"faces"`` or
+    ``"vertices"``. Inside a builder, indexes are cached by identity of the
+    shape's topology until the builder is gone, so an index is reused until
+    the part is modified. Outside of one every call builds a new index.
+    """
+    builder = Builder._get_context(log=False)
+    if builder is None:
+        return ShapeIndex(getattr(shape, kind)())
+    cache = _indexes.setdefault(builder, {})
+    if (shape, kind) not in cache:
+        cache[shape, kind] = ShapeIndex(getattr(shape, kind)())
+    return cache[shape, kind]
@@ -0,0 +1,124 @@
+"""Parameter sweeps that build a catalog of model variants.
+
+Every combination of the swept values is built in a worker process and
+exported, and ``manifest.json`` in the output directory records each
+variant's parameters, files, build and export time and triangle count.
+Variants are keyed on their parameters and on the source of the module that
+builds them (see :mod:`homecad.manifest`), so re-running a sweep only builds
+what is new or stale. Workers share sub-shapes through :mod:`homecad.cache`.
+"""
+
+import ast
+import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from pathlib import Path
+
+from homecad.export import export_shapes
+from homecad.manifest import (
+    build_key,
+    is_current,
+    load_manifest,
+    relative_files,
+    write_manifest,
+)
+from homecad.parallel import reference, resolve
+
+
+def parse_values(text):
+    """Parse ``"2,3,4"``, an inclusive range ``"2:5"`` or ``"40:60:5"``."""
+    if ":" in text:
+        start, stop, *step = (ast.literal_eval(part) for part in text.split(":"))
+        step = step[0] if step else 1
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    return [ast.literal_eval(part) for part in text.split(",")]
+
+
+def parse_ranges(items):
+    """Parse ``NAME=VALUES`` command line items into a dict of value lists."""
+    ranges = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        ranges[name] = parse_values(values)
+    return ranges
+
+
+def expand(ranges):
+    """Every combination of ``ranges`` as a list of parameter dicts."""
+    names = list(ranges)
+    return [dict(zip(names, values)) for values in product(*ranges.values())]
+
+
+def variant_name(prefix, params):
+    return "-".join([prefix, *(f"{name}={value}" for name, value in params.items())])
+
+
+def _build_variant(ref, params, path, source):
+    start = time.perf_counter()
+    shapes = resolve(ref)(**params)
+    built = time.perf_counter()
+    exported = export_shapes(shapes, path, source=source)
+    return {
+        **exported,
+        "build_time": built - start,
+        "export_time": time.perf_counter() - built - exported["check_time"],
+    }
+
+
+def sweep(build, ranges, out_dir, prefix, fixed=None, max_workers=None):
+    """Build and export every combination of ``ranges``.
+
+    Args:
+        build: module-level function taking the swept and ``fixed`` keyword
+            arguments and returning the shapes to export.
+        ranges (dict): parameter name -> list of values to sweep.
+        out_dir: directory receiving the exports and the manifest.
+        prefix (str): file name prefix of every variant.
+        fixed (dict, optional): keyword arguments shared by all variants.
+        max_workers (int, optional): pool size. Defaults to the CPU count.
+
+    Returns:
+        dict: the updated manifest, variant name -> entry. A variant that
+        failed to build has its ``error`` as entry and is built again next
+        time.
+    """
+    source = inspect.getsourcefile(build)
+    ref = reference(build)
+    manifest = load_manifest(out_dir)
+    pending = {}
+    for variant in expand(ranges):
+        params = {**(fixed or {}), **variant}
+        name = variant_name(prefix, variant)
+        key = build_key(source, params)
+        if is_current(out_dir, manifest.get(name), key):
+            print(f"{name}: up to date")
+            continue
+        pending[name] = (params, key)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_build_variant, ref, params, Path(out_dir) / name, source): name
+            for name, (params, key) in pending.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            params, key = pending[name]
+            try:
+                result = future.result()
+            except Exception as error:
+                manifest[name] = {"params": params, "error": repr(error)}
+                write_manifest(out_dir, manifest)
+                print(f"{name}: failed: {error!r}")
+                continue
+            result["files"] = relative_files(out_dir, result["files"])
+            manifest[name] = {"key": key, "params": params, **result}
+            write_manifest(out_dir, manifest)
+            print(
+                f"{name}: built in {result['build_time']:.1f}s, "
+                f"checked in {result['check_time']:.1f}s, "
+                f"exported in {result['export_time']:.1f}s, "
+                f"{result['triangles']} triangles"
+            )
+    return manifest
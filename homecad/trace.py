@@ -0,0 +1,251 @@
+"""Opt-in per-operation profiling of model builds.
+
+:func:`enable` wraps the expensive build123d entry points - builder
+contexts, booleans, fillets, chamfers, lofts, thickens and friends, ``pack``
+- together with the disk cache, the pre-export check and the mesh export,
+and records one event per call: wall time, change in resident memory, the
+face and edge count of the result and the line in ``models/`` that made the
+call. :func:`write` saves the events in Chrome trace format, which
+``chrome://tracing`` and https://ui.perfetto.dev display as a nested
+timeline::
+
+    with tracing("trace.json"):
+        homecad.models.build("window_mount")
+
+``homecad build --trace trace.json`` does the same from the command line.
+
+Model modules bind build123d names on import (``from build123d import *``),
+so models imported before :func:`enable` are patched in place as well. While
+tracing, :func:`homecad.parallel.build_parts` runs its tasks in this process
+so that their operations show up in the trace too.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import build123d
+from build123d.build_common import Builder
+from build123d.topology import Shape
+
+from homecad import cache, export, mesh
+
+OPERATIONS = (
+    "chamfer",
+    "extrude",
+    "fillet",
+    "loft",
+    "make_face",
+    "mirror",
+    "offset",
+    "pack",
+    "revolve",
+    "section",
+    "split",
+    "sweep",
+    "thicken",
+)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# Frames skipped when looking for the line that made a call.
+_INTERNAL_PATHS = (
+    str(Path(build123d.__file__).parent),
+    str(Path(functools.__file__).parent),
+    __file__,
+    cache.__file__,
+)
+
+_events = None
+_patches = []
+
+
+def enabled():
+    return _events is not None
+
+
+def _rss():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return 0
+
+
+def _call_site():
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename.startswith(_INTERNAL_PATHS):
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return f"{Path(frame.f_code.co_filename).name}:{frame.f_lineno}"
+
+
+def _counts(result):
+    shapes = result if isinstance(result, (list, tuple)) else [result]
+    counts = {"faces": 0, "edges": 0}
+    for shape in shapes:
+        if isinstance(shape, Shape) and shape.wrapped is not None:
+            counts["faces"] += len(shape.faces())
+            counts["edges"] += len(shape.edges())
+    return counts
+
+
+def _record(name, category, start, rss, site, result=None):
+    end = time.perf_counter_ns()
+    _events.append(
+        {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start / 1000,
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"site": site, "rss_delta": _rss() - rss, **_counts(result)},
+        }
+    )
+
+
+def _traced(func, name, category):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _events is None:
+            return func(*args, **kwargs)
+        site, rss, start = _call_site(), _rss(), time.perf_counter_ns()
+        result = func(*args, **kwargs)
+        _record(name, category, start, rss, site, result)
+        return result
+
+    return wrapper
+
+
+def _traced_bool_op(func):
+    @functools.wraps(func)
+    def wrapper(self, args, tools, operation):
+        if _events is None:
+            return func(self, args, tools, operation)
+        name = type(operation).__name__.removeprefix("BRepAlgoAPI_").lower()
+        site, rss, start = _call_site(), _rss(), time.perf_counter_ns()
+        result = func(self, args, tools, operation)
+        _record(name, "boolean", start, rss, site, result)
+        return result
+
+    return wrapper
+
+
+def _traced_enter(func):
+    @functools.wraps(func)
+    def wrapper(self):
+        if _events is not None:
+            self._trace_start = (_call_site(), _rss(), time.perf_counter_ns())
+        # Builder.__enter__ only nests into a parent builder opened in its
+        # caller's frame, which is now this wrapper, so redo that check.
+        parent = Builder._get_context()
+        result = func(self)
+        if parent is not None and parent._python_frame is sys._getframe(1):
+            self.builder_parent = parent
+        return result
+
+    return wrapper
+
+
+def _traced_exit(func):
+    @functools.wraps(func)
+    def wrapper(self, exception_type, exception_value, traceback):
+        result = func(self, exception_type, exception_value, traceback)
+        start = self.__dict__.pop("_trace_start", None)
+        if _events is not None and start is not None:
+            site, rss, start = start
+            _record(type(self).__name__, "builder", start, rss, site, self._obj)
+        return result
+
+    return wrapper
+
+
+def _patch(owner, name, wrapper):
+    original = getattr(owner, name)
+    setattr(owner, name, wrapper)
+    _patches.append((owner, name, original))
+
+
+def enable():
+    """Start recording; previous events are discarded."""
+    global _events
+    _events = []
+    if _patches:
+        return
+    _patch(Shape, "_bool_op", _traced_bool_op(Shape._bool_op))
+    _patch(Builder, "__enter__", _traced_enter(Builder.__enter__))
+    _patch(Builder, "__exit__", _traced_exit(Builder.__exit__))
+    models = [
+        module
+        for name, module in list(sys.modules.items())
+        if name.startswith("models.") or name == "__main__"
+    ]
+    for name in OPERATIONS:
+        original = getattr(build123d, name)
+        wrapper = _traced(original, name, "operation")
+        for owner in [build123d, *models]:
+            if getattr(owner, name, None) is original:
+                _patch(owner, name, wrapper)
+    for owner, name in ((cache, "load"), (cache, "store")):
+        _patch(owner, name, _traced(getattr(owner, name), f"cache.{name}", "cache"))
+    for owner, name in (
+        (export, "export_shapes"),
+        (mesh, "tessellate"),
+        (mesh, "write_stl"),
+        (mesh, "write_3mf"),
+    ):
+        _patch(owner, name, _traced(getattr(owner, name), name, "export"))
+    _patch(export, "validate", _traced(export.validate, "validate", "check"))
+
+
+def disable():
+    """Stop recording and restore the original functions."""
+    global _events
+    _events = None
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+
+
+def events():
+    """The events recorded since :func:`enable`."""
+    return list(_events or [])
+
+
+def write(path):
+    """Write the recorded events to ``path`` in Chrome trace format."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events(), "displayTimeUnit": "ms"}))
+
+
+def summary(limit=10):
+    """Total time per operation and call site, slowest first."""
+    totals = {}
+    for event in events():
+        key = (event["name"], event["args"]["site"])
+        count, total = totals.get(key, (0, 0.0))
+        totals[key] = (count + 1, total + event["dur"] / 1e6)
+    rows = [
+        (name, site, count, total) for (name, site), (count, total) in totals.items()
+    ]
+    return sorted(rows, key=lambda row: row[3], reverse=True)[:limit]
+
+
+@contextmanager
+def tracing(path=None):
+    """Trace the body and write the events to ``path``, if given."""
+    enable()
+    try:
+        yield
+    finally:
+        if path is not None:
+            write(path)
+        disable()
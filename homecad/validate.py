@@ -0,0 +1,307 @@
+"""Validity and printability checks run before a model is exported.
+
+A bad boolean usually still tessellates, and then only shows up in the
+slicer as a missing wall or a part that will not slice. Every part of an
+export is checked for
+
+- a valid BREP (OCCT's ``BRepCheck_Analyzer``),
+- closed, manifold shells: every edge bounds exactly two faces,
+- exactly one solid,
+- a volume above zero,
+- walls at least ``min_wall_thickness`` thick, measured by casting a ray
+  into the material from the middle and four inner points of every face;
+  wedges, such as thread teeth, are not walls (see :func:`wall_thickness`).
+
+Parts are checked in worker processes, as binary BREP like
+:mod:`homecad.parallel` builds them. Each report is cached on disk under the
+hash of the part's BREP and the check settings, so unchanged parts are not
+checked again; reports are evicted together with :mod:`homecad.cache`'s
+shapes. :func:`homecad.export.export_shapes` raises :class:`InvalidShapeError`
+before anything is written if a part fails.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import cos, inf, radians
+from pathlib import Path
+
+from build123d import Compound, Shape
+from OCP.BRep import BRep_Tool
+from OCP.BRepAdaptor import BRepAdaptor_Surface
+from OCP.BRepCheck import BRepCheck_Analyzer
+from OCP.BRepClass import BRepClass_FaceClassifier
+from OCP.BRepLProp import BRepLProp_SLProps
+from OCP.BRepTools import BRepTools
+from OCP.gp import gp_Lin, gp_Pnt2d
+from OCP.IntCurvesFace import IntCurvesFace_ShapeIntersector
+from OCP.TopAbs import TopAbs_EDGE, TopAbs_FACE, TopAbs_IN, TopAbs_REVERSED
+from OCP.TopExp import TopExp
+from OCP.TopoDS import TopoDS
+from OCP.TopTools import (
+    TopTools_IndexedDataMapOfShapeListOfShape,
+    TopTools_IndexedMapOfShape,
+)
+
+from homecad import brep, cache
+from homecad.manifest import library_versions
+
+# Thinner than any nozzle can lay down, so such a wall is a modelling error
+# rather than a design choice.
+MIN_WALL_THICKNESS = 0.25
+MIN_VOLUME = 1e-3
+# Points of each face, as fractions of its parameter ranges, from which the
+# wall thickness is measured.
+_WALL_SAMPLES = ((0.5, 0.5), (0.25, 0.25), (0.25, 0.75), (0.75, 0.25), (0.75, 0.75))
+_RAY_TOLERANCE = 1e-3
+# Largest angle between the two sides of a wall; ISO thread flanks are 60
+# degrees apart.
+_MAX_WALL_ANGLE = 30
+_WALL_COSINE = cos(radians(_MAX_WALL_ANGLE))
+
+CHECKS_DIR = cache.CACHE_DIR / "checks"
+
+
+class InvalidShapeError(ValueError):
+    """Raised when parts of an export fail their checks."""
+
+    def __init__(self, reports):
+        self.reports = [report for report in reports if report["issues"]]
+        super().__init__(
+            "; ".join(
+                f"{report['name']}: {', '.join(report['issues'])}"
+                for report in self.reports
+            )
+        )
+
+    def __reduce__(self):
+        # Rebuilt from the reports, not the message, when it is sent back
+        # from a worker process.
+        return type(self), (self.reports,)
+
+
+def _edge_faces(shape):
+    """Faces of every non-degenerate edge of ``shape``, as a map of the edges
+    to their faces counted with multiplicity, so that a seam counts twice."""
+    edges = TopTools_IndexedDataMapOfShapeListOfShape()
+    TopExp.MapShapesAndAncestors_s(shape.wrapped, TopAbs_EDGE, TopAbs_FACE, edges)
+    for i in range(1, edges.Extent() + 1):
+        if BRep_Tool.Degenerated_s(TopoDS.Edge_s(edges.FindKey(i))):
+            continue
+        yield list(edges.FindFromIndex(i))
+
+
+def _outward_normal(face, u, v):
+    props = BRepLProp_SLProps(BRepAdaptor_Surface(face), u, v, 1, _RAY_TOLERANCE)
+    if not props.IsNormalDefined():
+        return None
+    normal = props.Normal()
+    if face.Orientation() == TopAbs_REVERSED:
+        normal.Reverse()
+    return normal
+
+
+def wall_thickness(shape):
+    """The thinnest wall of ``shape`` and where it was measured.
+
+    From a few points inside every face, a ray is cast against the face's
+    outward normal to where it leaves the material again. A wall is where
+    the ray leaves roughly straight, within ``_MAX_WALL_ANGLE``: wedges such
+    as thread teeth and fillets running out tangentially taper to an edge by
+    design, so rays leaving through a flank at an angle or through a face
+    next to the one they started from are not counted. Returns
+    ``(inf, None)`` if no wall was measured.
+    """
+    faces = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(shape.wrapped, TopAbs_FACE, faces)
+    neighbours = {i: set() for i in range(1, faces.Extent() + 1)}
+    for edge_faces in _edge_faces(shape):
+        indices = {faces.FindIndex(face) for face in edge_faces}
+        for i in indices:
+            neighbours[i] |= indices
+    intersector = IntCurvesFace_ShapeIntersector()
+    intersector.Load(shape.wrapped, _RAY_TOLERANCE)
+    thinnest, where = inf, None
+    for index in range(1, faces.Extent() + 1):
+        occ_face = TopoDS.Face_s(faces.FindKey(index))
+        u_min, u_max, v_min, v_max = BRepTools.UVBounds_s(occ_face)
+        for a, b in _WALL_SAMPLES:
+            u = u_min + (u_max - u_min) * a
+            v = v_min + (v_max - v_min) * b
+            classifier = BRepClass_FaceClassifier(
+                occ_face, gp_Pnt2d(u, v), _RAY_TOLERANCE
+            )
+            if classifier.State() != TopAbs_IN:
+                continue
+            outward = _outward_normal(occ_face, u, v)
+            if outward is None:
+                continue
+            point = BRep_Tool.Surface_s(occ_face).Value(u, v)
+            intersector.Perform(gp_Lin(point, outward.Reversed()), 0, inf)
+            hits = [
+                i
+                for i in range(1, intersector.NbPnt() + 1)
+                if intersector.WParameter(i) > _RAY_TOLERANCE
+            ]
+            if not hits:
+                continue
+            hit = min(hits, key=intersector.WParameter)
+            distance = intersector.WParameter(hit)
+            if distance >= thinnest:
+                continue
+            exit_face = intersector.Face(hit)
+            if faces.FindIndex(exit_face) in neighbours[index]:
+                continue
+            exit_normal = _outward_normal(
+                exit_face, intersector.UParameter(hit), intersector.VParameter(hit)
+            )
+            if exit_normal is None or -exit_normal.Dot(outward) < _WALL_COSINE:
+                continue
+            thinnest, where = distance, (point.X(), point.Y(), point.Z())
+    return thinnest, where
+
+
+def check_shape(shape, min_wall_thickness=MIN_WALL_THICKNESS):
+    """Check one part and return its report.
+
+    Returns:
+        dict: the ``issues`` found (empty if the part passed), its
+        ``solids`` and ``volume``, and its thinnest ``wall`` with the point
+        ``wall_at`` where it was measured.
+    """
+    issues = []
+    if not BRepCheck_Analyzer(shape.wrapped).IsValid():
+        issues.append("invalid BREP")
+    face_counts = [len(edge_faces) for edge_faces in _edge_faces(shape)]
+    open_edges = sum(count < 2 for count in face_counts)
+    if open_edges:
+        issues.append(f"{open_edges} open edges")
+    non_manifold_edges = sum(count > 2 for count in face_counts)
+    if non_manifold_edges:
+        issues.append(f"{non_manifold_edges} non-manifold edges")
+    solids = len(shape.solids())
+    if solids != 1:
+        issues.append(f"{solids} solids")
+    volume = shape.volume if solids else 0.0
+    if volume < MIN_VOLUME:
+        issues.append("no volume")
+    wall, wall_at = wall_thickness(shape) if solids else (inf, None)
+    if wall < min_wall_thickness:
+        x, y, z = wall_at
+        issues.append(
+            f"{wall:.2f} mm wall at ({x:.1f}, {y:.1f}, {z:.1f}), "
+            f"thinner than {min_wall_thickness:g} mm"
+        )
+    return {
+        "issues": issues,
+        "solids": solids,
+        "volume": volume,
+        "wall": None if wall == inf else wall,
+        "wall_at": wall_at,
+    }
+
+
+def _parts(shapes):
+    """The parts of ``shapes``, with compounds of compounds, such as
+    ``Compound([part_a, part_b])``, split into their children. The solids of
+    one ``Part`` stay together, so that a fuse that fell apart is caught."""
+    for shape in [shapes] if isinstance(shapes, Shape) else shapes:
+        children = list(shape) if isinstance(shape, Compound) else []
+        if any(isinstance(child, Compound) for child in children):
+            yield from _parts(children)
+        else:
+            yield shape
+
+
+def _check(data, min_wall_thickness):
+    return check_shape(brep.loads(data), min_wall_thickness)
+
+
+def _fingerprint():
+    """Hash of this module and the geometry libraries, part of every key."""
+    source = Path(__file__).read_bytes()
+    return hashlib.sha256(source + repr(library_versions()).encode()).hexdigest()
+
+
+def _report_path(key):
+    return CHECKS_DIR / key[:2] / f"{key}.json"
+
+
+def _load_report(key):
+    path = _report_path(key)
+    try:
+        report = json.loads(path.read_text())
+        os.utime(path)
+    except (FileNotFoundError, ValueError):
+        return None
+    return report
+
+
+def _store_report(key, report):
+    cache.write(_report_path(key), json.dumps(report).encode())
+
+
+def check_shapes(
+    shapes,
+    min_wall_thickness=MIN_WALL_THICKNESS,
+    max_workers=None,
+    use_cache=None,
+):
+    """Check every part of ``shapes`` and return their reports, in order.
+
+    Parts whose report is cached are not checked again; the others are
+    checked at most ``max_workers`` (default the CPU count) at a time, in
+    worker processes when there is more than one of them. Every report
+    carries the part's ``name``, its label or its position among the parts
+    (see :func:`_parts`). ``use_cache`` defaults to
+    :data:`homecad.cache.CACHE_ENABLED`.
+    """
+    if use_cache is None:
+        use_cache = cache.CACHE_ENABLED
+    shapes = list(_parts(shapes))
+    fingerprint = _fingerprint()
+    reports, pending = [None] * len(shapes), {}
+    for i, shape in enumerate(shapes):
+        data = brep.dumps(shape)
+        key = hashlib.sha256(
+            data + repr((fingerprint, min_wall_thickness)).encode()
+        ).hexdigest()
+        report = _load_report(key) if use_cache else None
+        if report is None:
+            pending[i] = (key, data)
+        reports[i] = report
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if len(pending) > 1 and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            futures = {
+                i: pool.submit(_check, data, min_wall_thickness)
+                for i, (_, data) in pending.items()
+            }
+            checked = {i: future.result() for i, future in futures.items()}
+    else:
+        checked = {
+            i: check_shape(shapes[i], min_wall_thickness) for i in pending
+        }
+    for i, report in checked.items():
+        if use_cache:
+            _store_report(pending[i][0], report)
+        reports[i] = report
+
+    return [
+        {"name": shape.label or f"part {i}", **report}
+        for i, (shape, report) in enumerate(zip(shapes, reports))
+    ]
+
+
+def validate(shapes, min_wall_thickness=MIN_WALL_THICKNESS, max_workers=None):
+    """Check ``shapes`` and raise :class:`InvalidShapeError` if any part fails.
+
+    Returns:
+        list: the reports of :func:`check_shapes`.
+    """
+    reports = check_shapes(shapes, min_wall_thickness, max_workers)
+    if any(report["issues"] for report in reports):
+        raise InvalidShapeError(reports)
+    return reports
@@ -0,0 +1,24 @@
+"""Lazy access to the OCP CAD viewer.
+
+``ocp_vscode`` is slow to import and tries to reach a running viewer, so it
+is only imported when something is actually shown.
+"""
+
+
+def show(*objects, **kwargs):
+    """Send ``objects`` to the OCP viewer."""
+    from ocp_vscode import show as ocp_show
+
+    ocp_show(*objects, **kwargs)
+
+
+def connected():
+    """Whether an OCP viewer is listening; False if ``ocp_vscode`` is missing."""
+    try:
+        from ocp_vscode.comms import get_port, port_check
+    except ImportError:
+        return False
+    try:
+        return port_check(get_port())
+    except Exception:
+        return False
@@ -0,0 +1,164 @@
+"""Rebuild models as their sources change, in one warm process.
+
+``homecad watch`` pays for importing build123d and OCCT once and then waits
+for changes under ``models/`` and ``homecad/``. A saved model is re-imported
+and only that model is rebuilt and exported. A saved ``homecad`` module is
+reloaded together with the modules that import it, and every watched model
+depending on it (see :func:`homecad.manifest.source_files`) is rebuilt.
+In-process caches of untouched modules stay warm across rebuilds, and the
+result is shown in the OCP viewer when one is listening.
+"""
+
+import importlib
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from homecad import models, viewer
+from homecad.manifest import (
+    PACKAGE_DIR,
+    build_key,
+    load_manifest,
+    manifest_entry,
+    source_files,
+    write_manifest,
+)
+from homecad.scheduler import timed_build
+
+# Seconds without further changes before rebuilding, so that the several
+# events of one save trigger a single rebuild.
+DEBOUNCE = 0.3
+
+
+class _Changes(FileSystemEventHandler):
+    """Collects the Python files changed since the last :meth:`take`."""
+
+    def __init__(self):
+        self.changed = threading.Event()
+        self.last_change = 0.0
+        self._lock = threading.Lock()
+        self._paths = set()
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        with self._lock:
+            self._paths.update(
+                Path(path).resolve() for path in paths if str(path).endswith(".py")
+            )
+            if self._paths:
+                self.last_change = time.monotonic()
+                self.changed.set()
+
+    def take(self):
+        with self._lock:
+            paths, self._paths = self._paths, set()
+            self.changed.clear()
+        return paths
+
+
+def _depends_on(file, paths):
+    """Whether ``file`` or a module it imports is in ``paths``."""
+    try:
+        return bool(set(source_files(file)) & paths)
+    except SyntaxError:
+        # Unparsable after an edit: rebuild it so that the error is reported.
+        return Path(file).resolve() in paths
+
+
+def reload_modules(paths):
+    """Reload the imported ``homecad`` modules affected by changed ``paths``.
+
+    A module is affected when it or anything it imports changed. Modules are
+    reloaded dependencies first, so every reloaded module binds the new
+    versions of the others.
+    """
+    affected = []
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if not name.startswith(f"{PACKAGE_DIR.name}.") or file is None:
+            continue
+        if _depends_on(file, paths):
+            affected.append((len(source_files(file)), name))
+    for _, name in sorted(affected):
+        importlib.reload(sys.modules[name])
+    return [name for _, name in sorted(affected)]
+
+
+def watched_models(names, paths):
+    """The models among ``names`` that depend on any of ``paths``."""
+    return [
+        name
+        for name in names
+        if (models.MODELS_DIR / f"{name}.py").exists()
+        and _depends_on(models.model_path(name), paths)
+    ]
+
+
+def rebuild(name, params, options, out_dir, show=True):
+    """Re-import, build and export model ``name`` and record it in the manifest."""
+    models.reload(name)
+    key = build_key(models.model_path(name), params, options)
+    shapes, result = timed_build(name, params, options, out_dir)
+    manifest = load_manifest(out_dir)
+    manifest[name] = manifest_entry(out_dir, key, params, result)
+    write_manifest(out_dir, manifest)
+    if show and viewer.connected():
+        viewer.show(shapes)
+    return result
+
+
+def watch(
+    names=(),
+    params=None,
+    options=None,
+    out_dir=models.EXPORTS_DIR,
+    show=True,
+    report=print,
+):
+    """Build ``names`` (default all models) and rebuild them on every change.
+
+    ``report(name, result)`` is called after every build, with
+    ``{"error": ...}`` as result when the build failed. Runs until
+    interrupted.
+    """
+    params, options = params or {}, options or {}
+
+    def rebuild_all(selected):
+        for name in selected:
+            try:
+                result = rebuild(name, params, options, out_dir, show)
+            except Exception:
+                result = {"error": traceback.format_exc(limit=-3).rstrip()}
+            report(name, result)
+
+    rebuild_all(names or models.model_names())
+    changes = _Changes()
+    observer = Observer()
+    observer.schedule(changes, str(models.MODELS_DIR))
+    observer.schedule(changes, str(PACKAGE_DIR), recursive=True)
+    observer.start()
+    try:
+        while True:
+            changes.changed.wait()
+            while time.monotonic() - changes.last_change < DEBOUNCE:
+                time.sleep(DEBOUNCE)
+            paths = changes.take()
+            try:
+                reload_modules(paths)
+            except Exception:
+                report("homecad", {"error": traceback.format_exc(limit=-3).rstrip()})
+                continue
+            current = names or models.model_names()
+            rebuild_all(watched_models(current, paths))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
@@ -1,5 +1,6 @@
 from build123d import *
-from ocp_vscode import *
+from homecad.coupon import coupon_plate, ladder
+from homecad.export import export_shapes
 
 FRAME_HEIGHT = 8 * MM
 FRAME_WITDH = 8 * MM
@@ -11,68 +12,102 @@ HOLE_INTERVAL = (TOP_ARM_MIN_LENGTH - HOLES * HOLE_DIAMETER) / (HOLES + 1)
 HOLE_DEPTH = FRAME_WITDH * 0.5 * 1
 ERROR = 0.3 * MM
 
-with BuildPart() as part_female:
-    with BuildSketch() as sketch_female:
-        with BuildLine() as line:
-            Line((0, 0), (TOP_ARM_MIN_LENGTH, 0))
-            Line((0, 0), (0, -SIDE_ARM_LENGTH))
-            offset(line.line, amount=FRAME_HEIGHT, side=Side.LEFT)
-        make_face()
-    thicken(amount=FRAME_WITDH)
-
-    with Locations((0, 0, FRAME_WITDH / 2)):
-        box = Box(
-            TOP_ARM_MIN_LENGTH,
-            FRAME_HEIGHT,
-            FRAME_WITDH / 2,
-            align=Align.MIN,
-            mode=Mode.SUBTRACT,
-        )
-
-    with BuildSketch(box.faces().sort_by(sort_by=Axis.Z)[0]) as sketch_hole:
-        hole_x = HOLE_DIAMETER / 2 + HOLE_INTERVAL - TOP_ARM_MIN_LENGTH / 2
-        with Locations(
-            *[(hole_x + (HOLE_INTERVAL + HOLE_DIAMETER) * i, 0) for i in range(HOLES)]
-        ):
-            RegularPolygon(HOLE_DIAMETER / 2 + ERROR / 2, side_count=5)
-    thicken(amount=HOLE_DEPTH + ERROR, mode=Mode.SUBTRACT)
-
-
-with BuildPart() as part_male:
-    with BuildSketch() as sketch_male:
-        with BuildLine() as line:
-            Line((0, 0), (TOP_ARM_MIN_LENGTH, 0))
-            Line((TOP_ARM_MIN_LENGTH, 0), (TOP_ARM_MIN_LENGTH, -SIDE_ARM_LENGTH))
-            offset(line.line, amount=FRAME_HEIGHT, side=Side.LEFT)
-        make_face()
-    thicken(amount=FRAME_WITDH)
-
-    with Locations((0, 0, 0)):
-        box = Box(
-            TOP_ARM_MIN_LENGTH,
-            FRAME_HEIGHT,
-            FRAME_WITDH / 2,
-            align=Align.MIN,
-            mode=Mode.SUBTRACT,
-        )
-
-    with BuildSketch(box.faces().sort_by(sort_by=Axis.Z)[-1]) as sketch_hole:
-        hole_x = HOLE_DIAMETER / 2 + HOLE_INTERVAL - TOP_ARM_MIN_LENGTH / 2
-        with Locations(
-            *[(hole_x + (HOLE_INTERVAL + HOLE_DIAMETER) * i, 0) for i in range(HOLES)]
-        ):
+
+def build():
+    with BuildPart() as part_female:
+        with BuildSketch() as sketch_female:
+            with BuildLine() as line:
+                Line((0, 0), (TOP_ARM_MIN_LENGTH, 0))
+                Line((0, 0), (0, -SIDE_ARM_LENGTH))
+                offset(line.line, amount=FRAME_HEIGHT, side=Side.LEFT)
+            make_face()
+        thicken(amount=FRAME_WITDH)
+
+        with Locations((0, 0, FRAME_WITDH / 2)):
+            box = Box(
+                TOP_ARM_MIN_LENGTH,
+                FRAME_HEIGHT,
+                FRAME_WITDH / 2,
+                align=Align.MIN,
+                mode=Mode.SUBTRACT,
+            )
+
+        with BuildSketch(box.faces().sort_by(sort_by=Axis.Z)[0]) as sketch_hole:
+            hole_x = HOLE_DIAMETER / 2 + HOLE_INTERVAL - TOP_ARM_MIN_LENGTH / 2
+            with Locations(
+                *[
+                    (hole_x + (HOLE_INTERVAL + HOLE_DIAMETER) * i, 0)
+                    for i in range(HOLES)
+                ]
+            ):
+                RegularPolygon(HOLE_DIAMETER / 2 + ERROR / 2, side_count=5)
+        thicken(amount=HOLE_DEPTH + ERROR, mode=Mode.SUBTRACT)
+
+    with BuildPart() as part_male:
+        with BuildSketch() as sketch_male:
+            with BuildLine() as line:
+                Line((0, 0), (TOP_ARM_MIN_LENGTH, 0))
+                Line((TOP_ARM_MIN_LENGTH, 0), (TOP_ARM_MIN_LENGTH, -SIDE_ARM_LENGTH))
+                offset(line.line, amount=FRAME_HEIGHT, side=Side.LEFT)
+            make_face()
+        thicken(amount=FRAME_WITDH)
+
+        with Locations((0, 0, 0)):
+            box = Box(
+                TOP_ARM_MIN_LENGTH,
+                FRAME_HEIGHT,
+                FRAME_WITDH / 2,
+                align=Align.MIN,
+                mode=Mode.SUBTRACT,
+            )
+
+        with BuildSketch(box.faces().sort_by(sort_by=Axis.Z)[-1]) as sketch_hole:
+            hole_x = HOLE_DIAMETER / 2 + HOLE_INTERVAL - TOP_ARM_MIN_LENGTH / 2
+            with Locations(
+                *[
+                    (hole_x + (HOLE_INTERVAL + HOLE_DIAMETER) * i, 0)
+                    for i in range(HOLES)
+                ]
+            ):
+                RegularPolygon(HOLE_DIAMETER / 2, side_count=5)
+        thicken(amount=-HOLE_DEPTH, mode=Mode.ADD)
+
+    part_male.part.move(Location((TOP_ARM_MIN_LENGTH + FRAME_HEIGHT + 10, 0, 0)))
+    return [part_female.part, part_male.part]
+
+
+def coupon(tolerances=None):
+    tab = Box(
+        HOLE_DIAMETER + 2 * HOLE_INTERVAL,
+        FRAME_HEIGHT,
+        FRAME_WITDH / 2,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    )
+    with BuildPart() as part_peg:
+        add(tab)
+        with BuildSketch(Plane.XY.offset(FRAME_WITDH / 2)):
             RegularPolygon(HOLE_DIAMETER / 2, side_count=5)
-    thicken(amount=-HOLE_DEPTH, mode=Mode.ADD)
+        extrude(amount=HOLE_DEPTH)
+
+    def hole(error):
+        with BuildPart() as part_hole:
+            with BuildSketch(Plane.XY.offset(FRAME_WITDH / 2)):
+                RegularPolygon(HOLE_DIAMETER / 2 + error / 2, side_count=5)
+            extrude(amount=-(HOLE_DEPTH + error))
+        return part_hole.part
+
+    return coupon_plate(
+        hole,
+        tolerances or ladder(0.1 * MM, 0.55 * MM),
+        body=tab,
+        mode=Mode.SUBTRACT,
+        counterpart=part_peg.part,
+    )
 
-part_male.part.move(Location((TOP_ARM_MIN_LENGTH + FRAME_HEIGHT + 10, 0, 0)))
 
-exporter = Mesher()
-exporter.add_shape(part_female.part)
-exporter.add_shape(part_male.part)
-exporter.add_code_to_metadata()
-exporter.write("exports/cardboard_clip.stl")
-exporter.write("exports/cardboard_clip.3mf")
+if __name__ == "__main__":
+    from homecad.viewer import show
 
-show_object(part_female.part)
-show_object(part_male.part)
-# show_all()
+    parts = build()
+    export_shapes(parts, "exports/cardboard_clip", source=__file__)
+    show(*parts)
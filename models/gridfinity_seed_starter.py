@@ -1,114 +1,31 @@
 from copy import copy
 from functools import reduce
+from inspect import signature
 from itertools import product
-from math import ceil, floor
+from math import ceil
 from build123d import *
-from ocp_vscode import *
-from bd_warehouse.fastener import *
-
-GF_UNIT_HEIGHT = 7 * MM
-GF_UNIT_WIDTH = 42 * MM
-GF_BOX_UNIT_WIDTH = 41.5 * MM
-GF_BOX_RADIUS = 7.5 * MM / 2
-GF_BASE_PART_SIZE = (0.8, 1.8, 2.15)
-GF_BASE_SLICE_SIZE = GF_BASE_PART_SIZE[0] + GF_BASE_PART_SIZE[2]
-GF_STACKING_LIP_PART_SIZE = (0.7, 1.8, 1.9)
-GF_STACKING_LIP_SLICE_SIZE = GF_STACKING_LIP_PART_SIZE[0] + GF_STACKING_LIP_PART_SIZE[2]
-
-GF_BASE_TOTAL_HEIGHT = sum(GF_BASE_PART_SIZE)
-GF_STACKING_LIP_TOTAL_HEIGHT = sum(GF_STACKING_LIP_PART_SIZE)
-
-
-def _cal_gf_struct_spec(unit_width, init_height, init_radius, part_size):
-    half_width_4 = unit_width / 2
-    half_height_4 = init_height
-    corner_radius_4 = init_radius
-    half_width_3 = half_width_4 - part_size[2]
-    half_height_3 = half_height_4 - part_size[2]
-    corner_radius_3 = corner_radius_4 - part_size[2]
-    half_width_2 = half_width_3
-    half_height_2 = half_height_3 - part_size[1]
-    corner_radius_2 = corner_radius_3
-    half_width_1 = half_width_2 - part_size[0]
-    half_height_1 = half_height_2 - part_size[0]
-    corner_radius_1 = corner_radius_2
-    return [
-        (half_width_1, half_height_1, corner_radius_1),
-        (half_width_2, half_height_2, corner_radius_2),
-        (half_width_3, half_height_3, corner_radius_3),
-        (half_width_4, half_height_4, corner_radius_4),
-    ]
-
-
-GF_BASE_SIZE = _cal_gf_struct_spec(
-    GF_BOX_UNIT_WIDTH,
-    GF_BASE_TOTAL_HEIGHT,
+from homecad.boolean import cut_all, fuse_all
+from homecad.cache import disk_cache
+from homecad.coupon import coupon_plate, ladder
+from homecad.export import export_shapes
+from homecad.fastener import metric_size, screw_and_thread
+from homecad.gridfinity import (
+    GF_UNIT_HEIGHT,
+    GF_UNIT_WIDTH,
     GF_BOX_RADIUS,
-    GF_BASE_PART_SIZE,
-)
-
-GF_STACKING_LIP_SIZE = _cal_gf_struct_spec(
-    GF_BOX_UNIT_WIDTH,
+    GF_BASE_SLICE_SIZE,
+    GF_BASE_TOTAL_HEIGHT,
     GF_STACKING_LIP_TOTAL_HEIGHT,
-    GF_BOX_RADIUS,
-    GF_STACKING_LIP_PART_SIZE,
-)
-
-GF_STACKING_LIP_SIZE.insert(
-    0, (GF_BOX_UNIT_WIDTH / 2, -GF_STACKING_LIP_SLICE_SIZE, GF_BOX_RADIUS)
+    GF_UNIT_WITDH_TOLERANCE,
 )
-
-GF_UNIT_WITDH_TOLERANCE = (GF_UNIT_WIDTH - GF_BOX_UNIT_WIDTH) / 2
-
-
-def _make_gf_base(origin=None):
-    if origin is not None:
-        plane = Plane.XY.shift_origin(origin)
-    else:
-        plane = Plane.XY
-    with BuildPart(plane) as part:
-        for half_width, height, radius in GF_BASE_SIZE:
-            with BuildSketch(plane.offset(height)) as sketch:
-                rect = Rectangle(half_width * 2, half_width * 2)
-                if radius > 0:
-                    fillet(rect.vertices(), radius)
-        loft(ruled=True)
-    return part.part
-
-
-def _make_gf_stacking_lip(size_x, size_y, height_unit, cut_before_height=0):
-    plane = Plane.XY.offset(height_unit * GF_UNIT_HEIGHT - GF_STACKING_LIP_SLICE_SIZE)
-    with BuildPart(plane) as part_1:
-        width_x = size_x * GF_UNIT_WIDTH - GF_UNIT_WITDH_TOLERANCE * 2
-        width_y = size_y * GF_UNIT_WIDTH - GF_UNIT_WITDH_TOLERANCE * 2
-        box = Box(
-            width_x,
-            width_y,
-            GF_STACKING_LIP_TOTAL_HEIGHT + GF_STACKING_LIP_SLICE_SIZE,
-            align=(Align.CENTER, Align.CENTER, Align.MIN),
-        )
-        fillet(box.edges().sort_by()[4:8], radius=GF_BOX_RADIUS)
-        plane = plane.offset(GF_STACKING_LIP_SLICE_SIZE)
-        for half_width, height, radius in GF_STACKING_LIP_SIZE:
-            width_x = (size_x - 1) * GF_UNIT_WIDTH + half_width * 2
-            width_y = (size_y - 1) * GF_UNIT_WIDTH + half_width * 2
-            with BuildSketch(plane.offset(height)):
-                rect = Rectangle(width_x, width_y)
-                if radius > 0:
-                    fillet(rect.vertices(), radius)
-        loft(ruled=True, mode=Mode.SUBTRACT)
-    part = part_1.part
-    if cut_before_height > 0:
-        box = Box(
-            size_x * GF_UNIT_WIDTH,
-            size_y * GF_UNIT_WIDTH,
-            cut_before_height,
-            align=(Align.CENTER, Align.CENTER, Align.MIN),
-        )
-        part -= box
-    return part
+from homecad.gridfinity.profiles import base_unit, stacking_lip
+from homecad.layout import optimize_seed_starter_layout, seed_starter_layout
+from homecad.parallel import build_parts
+from homecad.quality import cosmetic_fillet
+from homecad.spatial import index
 
 
+@disk_cache
 def make_gf_box(
     size_x,
     size_y,
@@ -122,7 +39,7 @@ def make_gf_box(
     for i, j in product(range(size_x), range(size_y)):
         origin_x = i * GF_UNIT_WIDTH - size_x * GF_UNIT_WIDTH / 2 + GF_UNIT_WIDTH / 2
         origin_y = j * GF_UNIT_WIDTH - size_y * GF_UNIT_WIDTH / 2 + GF_UNIT_WIDTH / 2
-        parts.append(_make_gf_base(origin=(origin_x, origin_y, 0)))
+        parts.append(base_unit((origin_x, origin_y, 0)))
     with BuildPart() as part_upper:
         width_x = size_x * GF_UNIT_WIDTH - GF_UNIT_WITDH_TOLERANCE * 2
         width_y = size_y * GF_UNIT_WIDTH - GF_UNIT_WITDH_TOLERANCE * 2
@@ -130,26 +47,27 @@ def make_gf_box(
             with BuildSketch(Plane.XY.offset(GF_BASE_TOTAL_HEIGHT)) as sketch_bottom:
                 rect = Rectangle(width_x, width_y)
                 if round_conner:
-                    fillet(rect.vertices(), radius=GF_BOX_RADIUS)
+                    cosmetic_fillet(rect.vertices(), radius=GF_BOX_RADIUS)
             thicken(sketch_bottom.sketch, amount=bottom_thickness, mode=Mode.ADD)
         with BuildSketch(Plane.XY.offset(GF_BASE_TOTAL_HEIGHT)) as sketch_wall:
             rect = Rectangle(width_x, width_y)
             if round_conner:
-                fillet(rect.vertices(), radius=GF_BOX_RADIUS)
+                cosmetic_fillet(rect.vertices(), radius=GF_BOX_RADIUS)
             offset(amount=-wall_thickness, mode=Mode.SUBTRACT)
         thicken(
             sketch_wall.sketch,
             amount=height_unit * GF_UNIT_HEIGHT - GF_BASE_TOTAL_HEIGHT,
             mode=Mode.ADD,
         )
-    part = sum(parts, start=part_upper.part)
+    part = fuse_all([part_upper.part, *parts])
     if with_stack_lip:
-        part += _make_gf_stacking_lip(
+        part += stacking_lip(
             size_x, size_y, height_unit, cut_before_height=GF_BASE_TOTAL_HEIGHT
         )
     return part
 
 
+@disk_cache
 def make_gf_cover(
     size_x,
     size_y,
@@ -197,6 +115,7 @@ def make_gf_cover(
     return box
 
 
+@disk_cache
 def _make_supporting_pillar(
     radius,
     height_unit,
@@ -231,6 +150,7 @@ def _make_filling_hole(
     )
 
 
+@disk_cache
 def _make_filling_hole_cover(
     radius,
     cover_thickness,
@@ -258,6 +178,7 @@ def _make_filling_hole_cover(
     return part_cover.part
 
 
+@disk_cache
 def _make_water_indicator(
     cover_thickness,
     radius=2.5,
@@ -283,6 +204,7 @@ def _make_water_indicator(
     return part_indicator.part
 
 
+@disk_cache
 def _make_seed_starter_hole(
     width, conner_radius, cover_thickness, thicken_times=2, fillet_bottom=False
 ):
@@ -297,14 +219,14 @@ def _make_seed_starter_hole(
             fillet(rect.vertices(), radius=conner_radius + cover_thickness)
             offset(amount=-cover_thickness, mode=Mode.SUBTRACT)
         shape = thicken(amount=-cover_thickness * thicken_times)
-        fillet(shape.edges().sort_by(Axis.Z)[-1], radius=cover_thickness / 2 - 0.01)
+        edges = index(shape, "edges").sort_by(Axis.Z)
+        cosmetic_fillet(edges[-1], radius=cover_thickness / 2 - 0.01)
         if fillet_bottom:
-            fillet(
-                shape.edges().sort_by(Axis.Z)[8:16], radius=cover_thickness / 2 - 0.01
-            )
+            cosmetic_fillet(edges[8:16], radius=cover_thickness / 2 - 0.01)
     return part_1.part - part_2.part
 
 
+@disk_cache
 def _make_seed_starter_hole_cover(
     width,
     conner_radius,
@@ -344,6 +266,7 @@ def _make_seed_starter_hole_cover(
     )
 
 
+@disk_cache
 def _make_seed_starter_hole_screw_cover(
     width,
     conner_radius,
@@ -353,11 +276,11 @@ def _make_seed_starter_hole_screw_cover(
     handler_height,
 ):
     cover_thicken_times = min(ceil(3 / cover_thickness), 2)
-    screw = SetScrew(
-        size="M6-1",
-        length=cover_thickness * cover_thicken_times,
-        simple=False,
-        align=(Align.CENTER, Align.CENTER, Align.MAX),
+    screw_size = "M6-1"
+    screw_diameter, _ = metric_size(screw_size)
+    thread_allowance = 0.1
+    screw, thread = screw_and_thread(
+        screw_size, cover_thickness * cover_thicken_times, allowance=thread_allowance
     )
     handler = (
         Cylinder(
@@ -372,19 +295,13 @@ def _make_seed_starter_hole_screw_cover(
         )
         + screw
     )
+    # The internal thread's root is at its major diameter; a wider hole
+    # would leave the thread loose, as a second solid.
     hole = Cylinder(
-        screw.thread_diameter / 2 + 0.2,
+        (screw_diameter + thread_allowance) / 2,
         cover_thickness * cover_thicken_times,
         align=(Align.CENTER, Align.CENTER, Align.MAX),
     )
-    thread = IsoThread(
-        major_diameter=screw.thread_diameter + 0.1,
-        pitch=screw.thread_pitch,
-        length=screw.length,
-        external=False,
-        align=(Align.CENTER, Align.CENTER, Align.MAX),
-        end_finishes=("square", "square"),
-    )
     cover_base = (
         _make_seed_starter_hole(
             width - 2 * tolerance,
@@ -401,21 +318,61 @@ def _make_seed_starter_holes(
     width,
     conner_radius,
     cover_thickness,
-    num_x,
-    num_y,
-    hole_locator,
-    reserve_last=False,
+    locations,
+    z=0,
 ):
-    locations = [hole_locator(i, j) for j, i in product(range(num_y), range(num_x))]
-    if reserve_last:
-        locations.pop(num_x - 1)
-    holes = [
+    return [
         _make_seed_starter_hole(
             width, conner_radius, cover_thickness, fillet_bottom=True, thicken_times=1
-        ).move(Location(location))
+        ).move(Location((*location, z)))
         for location in locations
     ]
-    return sum(holes[1:], start=holes[0])
+
+
+@disk_cache
+def _make_seed_starter_cover_plate(
+    gf_unit_x,
+    gf_unit_y,
+    cover_thickness,
+    wall_thickness,
+    with_stack_lip,
+    supporting_pillar_locations,
+    supporting_pillar_radius,
+    supporting_pillar_tolerance,
+    hole_width,
+    hole_conner_radius,
+    hole_locations,
+    filling_hole_location=None,
+    filling_hole_radius=10 * MM,
+):
+    plate = make_gf_cover(
+        gf_unit_x,
+        gf_unit_y,
+        cover_thickness=cover_thickness,
+        wall_thickness=wall_thickness,
+        with_stack_lip=with_stack_lip,
+        supporting_pillar_locations=supporting_pillar_locations,
+        supporting_pillar_radius=supporting_pillar_radius,
+        supporting_pillar_tolerance=supporting_pillar_tolerance,
+    )
+
+    top = GF_BASE_TOTAL_HEIGHT + cover_thickness
+    holes = _make_seed_starter_holes(
+        width=hole_width,
+        conner_radius=hole_conner_radius,
+        cover_thickness=cover_thickness,
+        locations=hole_locations,
+        z=top,
+    )
+    if filling_hole_location is not None:
+        holes.append(
+            _make_filling_hole(
+                radius=filling_hole_radius,
+                outer_radius=filling_hole_radius + cover_thickness,
+                cover_thickness=cover_thickness,
+            ).move(Location((*filling_hole_location, top)))
+        )
+    return cut_all(plate, holes)
 
 
 def make_seed_starter_plate(
@@ -441,190 +398,136 @@ def make_seed_starter_plate(
     water_indicator_floating_block_height=6 * MM,
     internal_supporting_pillar_radius=3.5 * MM,
     internal_supporting_pillar_tolerance=0.1 * MM,
+    parallel=False,
+    max_workers=None,
 ):
-    box = make_gf_box(
-        gf_unit_x,
-        gf_unit_y,
-        gf_unit_z,
-        wall_thickness=wall_thickness,
-        bottom_thickness=cover_thickness,
-    )
-
-    edge_delta = GF_UNIT_WITDH_TOLERANCE * 2
-    if with_stack_lip:
-        edge_delta += GF_STACKING_LIP_SLICE_SIZE * 2
-    else:
-        edge_delta += wall_thickness * 2
-    cover_x_max = gf_unit_x * GF_UNIT_WIDTH - edge_delta
-    cover_y_max = gf_unit_y * GF_UNIT_WIDTH - edge_delta
-    filling_hole_in_new_row = filling_hole_in_new_row and filling_hole
-    filling_hole_outer_radius = filling_hole_radius + cover_thickness
-    num_x = floor((cover_x_max - support_hole_width) / starter_min_width) + 1
-    if filling_hole_in_new_row:
-        num_y = (
-            floor(
-                (cover_y_max - support_hole_width - filling_hole_outer_radius * 2)
-                / starter_min_width
-            )
-            + 1
-        )
-    else:
-        num_y = floor((cover_y_max - support_hole_width) / starter_min_width) + 1
-
-    def _cal_gap(total, num, filling_hole_num):
-        gap_fix = 0
-        total -= (
-            filling_hole_outer_radius * 2 * filling_hole_num + support_hole_width * num
-        )
-        interval_num = num + filling_hole_num + 1
-        gap = total / interval_num
-        if gap < (starter_min_width - support_hole_width):
-            gap_fix = starter_min_width - support_hole_width
-            # gap = (total - starter_min_width * num + gap_fix) / interval_num
-            gap = (total - gap_fix * (num - 1)) / (filling_hole_num + 2)
-            gap_fix -= gap
-        return gap, gap_fix
-
-    gap_x, gap_fix_x = _cal_gap(cover_x_max, num_x, 0)
-    gap_y, gap_fix_y = _cal_gap(cover_y_max, num_y, 1 if filling_hole_in_new_row else 0)
-
-    def _support_pillar_locator(i, j):
-        x = (
-            gap_x
-            - cover_x_max / 2
-            + support_hole_width
-            + (gap_x + gap_fix_x) / 2
-            + i * (support_hole_width + gap_x + gap_fix_x)
-        )
-        y = (
-            gap_y
-            - cover_y_max / 2
-            + support_hole_width
-            + (gap_y + gap_fix_y) / 2
-            + j * (support_hole_width + gap_y + gap_fix_y)
-        )
-        if filling_hole_in_new_row:
-            y += filling_hole_outer_radius * 2 + gap_y
-        return (x, y)
-
-    plate = make_gf_cover(
+    layout = seed_starter_layout(
         gf_unit_x,
         gf_unit_y,
         cover_thickness=cover_thickness,
         wall_thickness=wall_thickness,
         with_stack_lip=with_stack_lip,
-        supporting_pillar_locations=[
-            _support_pillar_locator(i, j)
-            for i, j in product(range(num_x - 1), range(num_y - 1))
-        ],
-        supporting_pillar_radius=internal_supporting_pillar_radius,
-        supporting_pillar_tolerance=internal_supporting_pillar_tolerance,
+        starter_min_width=starter_min_width,
+        support_hole_width=support_hole_width,
+        filling_hole=filling_hole,
+        filling_hole_in_new_row=filling_hole_in_new_row,
+        filling_hole_radius=filling_hole_radius,
     )
 
-    def _hole_locator(i, j):
-        x = support_hole_width / 2 - cover_x_max / 2 + gap_x
-        y = support_hole_width / 2 - cover_y_max / 2 + gap_y
-        if filling_hole_in_new_row:
-            y += filling_hole_outer_radius * 2 + gap_y
-        x += i * (support_hole_width + gap_x + gap_fix_x)
-        y += j * (support_hole_width + gap_y + gap_fix_y)
-        return (x, y)
-
-    plate -= _make_seed_starter_holes(
-        width=support_hole_width,
-        conner_radius=support_hole_conner_radius,
-        cover_thickness=cover_thickness,
-        num_x=num_x,
-        num_y=num_y,
-        hole_locator=_hole_locator,
-        reserve_last=filling_hole and not filling_hole_in_new_row,
-    ).move(Location((0, 0, GF_BASE_TOTAL_HEIGHT + cover_thickness)))
-
-    if filling_hole:
-        if filling_hole_in_new_row:
-            filling_hole_position = Location(
-                (
-                    cover_x_max / 2 - gap_x - support_hole_width / 2,
-                    -cover_y_max / 2 + gap_y + filling_hole_outer_radius,
-                    GF_BASE_TOTAL_HEIGHT + cover_thickness,
-                )
-            )
+    if water_indicator_floating_block_radius is None:
+        if filling_hole:
+            water_indicator_floating_block_radius = filling_hole_radius - 0.2 * MM
         else:
-            filling_hole_position = Location(
-                (
-                    *_hole_locator(num_x - 1, 0),
-                    GF_BASE_TOTAL_HEIGHT + cover_thickness,
-                )
-            )
-
-        plate -= _make_filling_hole(
-            radius=filling_hole_radius,
-            outer_radius=filling_hole_outer_radius,
-            cover_thickness=cover_thickness,
-        ).move(filling_hole_position)
+            water_indicator_floating_block_radius = support_hole_width / 2 - 2 * MM
 
     if hole_cover_hander_with_screw:
-        starter_hole_cover, starter_hole_cover_handler = (
-            _make_seed_starter_hole_screw_cover(
+        hole_cover_task = (
+            _make_seed_starter_hole_screw_cover,
+            (),
+            dict(
                 width=support_hole_width,
                 conner_radius=support_hole_conner_radius,
                 tolerance=hole_cover_tolerance,
                 cover_thickness=cover_thickness,
                 handler_radius=hole_cover_handler_radius,
                 handler_height=hole_cover_handler_height,
-            )
+            ),
         )
     else:
-        starter_hole_cover, starter_hole_cover_handler = _make_seed_starter_hole_cover(
-            width=support_hole_width,
-            conner_radius=support_hole_conner_radius,
-            cover_thickness=cover_thickness,
-            handler_radius=hole_cover_handler_radius,
-            handler_height=hole_cover_handler_height,
-            tolerance=hole_cover_tolerance,
-            handler_tolerance=hole_cover_handler_tolerance,
+        hole_cover_task = (
+            _make_seed_starter_hole_cover,
+            (),
+            dict(
+                width=support_hole_width,
+                conner_radius=support_hole_conner_radius,
+                cover_thickness=cover_thickness,
+                handler_radius=hole_cover_handler_radius,
+                handler_height=hole_cover_handler_height,
+                tolerance=hole_cover_tolerance,
+                handler_tolerance=hole_cover_handler_tolerance,
+            ),
         )
 
-    filling_hole_cover = _make_filling_hole_cover(
-        radius=filling_hole_radius,
-        cover_thickness=cover_thickness,
-        tolerance=hole_cover_tolerance,
-        indicator_radius=hole_cover_handler_radius,
-    )
-
-    if water_indicator_floating_block_radius is None:
-        if filling_hole:
-            water_indicator_floating_block_radius = filling_hole_radius - 0.2 * MM
-        else:
-            water_indicator_floating_block_radius = support_hole_width / 2 - 2 * MM
-
-    water_indicator = _make_water_indicator(
-        cover_thickness=cover_thickness,
-        radius=2.5 * MM if hole_cover_hander_with_screw else hole_cover_handler_radius,
-        height_unit=gf_unit_z,
-        tolerance=water_indicator_tolerance,
-        floating_block_radius=water_indicator_floating_block_radius,
-        floating_block_height=water_indicator_floating_block_height,
-    )
-
-    supporting_pillar = _make_supporting_pillar(
-        radius=internal_supporting_pillar_radius,
-        height_unit=gf_unit_z,
-        cover_thickness=cover_thickness,
+    parts = build_parts(
+        {
+            "box": (
+                make_gf_box,
+                (gf_unit_x, gf_unit_y, gf_unit_z),
+                dict(wall_thickness=wall_thickness, bottom_thickness=cover_thickness),
+            ),
+            "plate": (
+                _make_seed_starter_cover_plate,
+                (),
+                dict(
+                    gf_unit_x=gf_unit_x,
+                    gf_unit_y=gf_unit_y,
+                    cover_thickness=cover_thickness,
+                    wall_thickness=wall_thickness,
+                    with_stack_lip=with_stack_lip,
+                    supporting_pillar_locations=layout.pillar_locations(),
+                    supporting_pillar_radius=internal_supporting_pillar_radius,
+                    supporting_pillar_tolerance=internal_supporting_pillar_tolerance,
+                    hole_width=support_hole_width,
+                    hole_conner_radius=support_hole_conner_radius,
+                    hole_locations=layout.hole_locations(),
+                    filling_hole_location=layout.filling_hole_location(),
+                    filling_hole_radius=filling_hole_radius,
+                ),
+            ),
+            "hole_cover": hole_cover_task,
+            "filling_hole_cover": (
+                _make_filling_hole_cover,
+                (),
+                dict(
+                    radius=filling_hole_radius,
+                    cover_thickness=cover_thickness,
+                    tolerance=hole_cover_tolerance,
+                    indicator_radius=hole_cover_handler_radius,
+                ),
+            ),
+            "water_indicator": (
+                _make_water_indicator,
+                (),
+                dict(
+                    cover_thickness=cover_thickness,
+                    radius=(
+                        2.5 * MM
+                        if hole_cover_hander_with_screw
+                        else hole_cover_handler_radius
+                    ),
+                    height_unit=gf_unit_z,
+                    tolerance=water_indicator_tolerance,
+                    floating_block_radius=water_indicator_floating_block_radius,
+                    floating_block_height=water_indicator_floating_block_height,
+                ),
+            ),
+            "supporting_pillar": (
+                _make_supporting_pillar,
+                (),
+                dict(
+                    radius=internal_supporting_pillar_radius,
+                    height_unit=gf_unit_z,
+                    cover_thickness=cover_thickness,
+                ),
+            ),
+        },
+        parallel=parallel,
+        max_workers=max_workers,
     )
+    starter_hole_cover, starter_hole_cover_handler = parts["hole_cover"]
 
     return (
-        box,
-        plate,
+        parts["box"],
+        parts["plate"],
         starter_hole_cover,
         starter_hole_cover_handler,
-        filling_hole_cover,
-        water_indicator,
-        supporting_pillar,
+        parts["filling_hole_cover"],
+        parts["water_indicator"],
+        parts["supporting_pillar"],
     )
 
 
-kit = make_seed_starter_plate(
+KIT_PARAMS = dict(
     gf_unit_x=4,
     gf_unit_y=3,
     gf_unit_z=6,
@@ -649,12 +552,89 @@ kit = make_seed_starter_plate(
     # water_indicator_floating_block_height=6 * MM,
 )
 
-seed_starter_kit = pack([x for x in kit if x], 10 * MM, align_z=True)
 
-exporter = Mesher()
-exporter.add_shape(seed_starter_kit)
-exporter.add_code_to_metadata()
-exporter.write("exports/gridfinity_seed_starter.stl")
-exporter.write("exports/gridfinity_seed_starter.3mf")
+def make_seed_starter_kit(**params):
+    kit = make_seed_starter_plate(**{**KIT_PARAMS, **params})
+    return pack([x for x in kit if x], 10 * MM, align_z=True)
+
+
+def optimize_kit(objective="count", **params):
+    """Kit parameters with the hole grid chosen by the layout optimizer.
+
+    ``params`` may mix kit parameters with the settings of
+    ``optimize_seed_starter_layout`` such as ``min_wall_gap``.
+    """
+    plate_params = signature(make_seed_starter_plate).parameters
+    settings = {k: v for k, v in params.items() if k not in plate_params}
+    params = {k: v for k, v in params.items() if k in plate_params}
+    shared = signature(optimize_seed_starter_layout).parameters
+    kit = {k: v for k, v in {**KIT_PARAMS, **params}.items() if k in shared}
+    optimum = optimize_seed_starter_layout(objective=objective, **kit, **settings)
+    return {**params, **optimum.params}
+
+
+def coupon(tolerances=None, **params):
+    params = {**KIT_PARAMS, **params}
+    width = params["support_hole_width"]
+    conner_radius = params["support_hole_conner_radius"]
+    cover_thickness = params["cover_thickness"]
+    frame = Box(
+        width + 4 * cover_thickness,
+        width + 4 * cover_thickness,
+        cover_thickness,
+        align=(Align.CENTER, Align.CENTER, Align.MIN),
+    ) - _make_seed_starter_hole(
+        width, conner_radius, cover_thickness, fillet_bottom=True, thicken_times=1
+    ).move(Location((0, 0, cover_thickness)))
+    return coupon_plate(
+        lambda tolerance: _make_seed_starter_hole(
+            width - 2 * tolerance, conner_radius - tolerance, cover_thickness
+        ),
+        tolerances or ladder(0.05 * MM, 0.5 * MM),
+        counterpart=frame,
+    )
+
+
+def build(optimize=None, **params):
+    if optimize:
+        params = optimize_kit(optimize, **params)
+    return make_seed_starter_kit(parallel=True, **params)
+
+
+if __name__ == "__main__":
+    import argparse
 
-show_all()
+    from homecad.sweep import parse_ranges, sweep
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sweep",
+        nargs="+",
+        metavar="NAME=VALUES",
+        help="build a catalog over e.g. gf_unit_x=2:6 starter_min_width=50,55",
+    )
+    parser.add_argument("--out", default="exports/seed_starter_catalog")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--optimize",
+        choices=("count", "size"),
+        help="choose the hole grid for the most or the largest holes",
+    )
+    args = parser.parse_args()
+
+    if args.sweep:
+        sweep(
+            make_seed_starter_kit,
+            parse_ranges(args.sweep),
+            out_dir=args.out,
+            prefix="gridfinity_seed_starter",
+            max_workers=args.workers,
+        )
+    else:
+        from homecad.viewer import show
+
+        seed_starter_kit = build(optimize=args.optimize)
+        export_shapes(
+            seed_starter_kit, "exports/gridfinity_seed_starter", source=__file__
+        )
+        show(seed_starter_kit)
@@ -1,7 +1,9 @@
 from copy import copy
 from math import cos, pi, radians, sin, sqrt, tan
 from build123d import *
-from ocp_vscode import *
+from homecad.coupon import coupon_plate, ladder
+from homecad.export import export_shapes
+from homecad.quality import cosmetic_chamfer, cosmetic_fillet
 
 
 JOINT_RADIUS_OUTER = 6 * MM
@@ -14,7 +16,7 @@ JOINT_TOLERANCE = 0.2 * MM
 class HookGearInnerSketch(BaseSketchObject):
     INNER_RADIUS_RATIO = 0.5
 
-    def __init__(self, is_inside=False, **kwargs):
+    def __init__(self, is_inside=False, tolerance=JOINT_TOLERANCE, **kwargs):
         tooth_number = JOINT_ANGLE_NUMBER
         radius = JOINT_RADIUS_INNER
         tooth_width_half = sin(pi / tooth_number) * radius * self.INNER_RADIUS_RATIO
@@ -23,10 +25,10 @@ class HookGearInnerSketch(BaseSketchObject):
         )
         inner_circle_radius = radius * self.INNER_RADIUS_RATIO
         if is_inside:
-            tooth_width_half -= JOINT_TOLERANCE
-            tooth_height -= JOINT_TOLERANCE 
-            inner_circle_radius -= JOINT_TOLERANCE
-            radius -= JOINT_TOLERANCE * 2
+            tooth_width_half -= tolerance
+            tooth_height -= tolerance
+            inner_circle_radius -= tolerance
+            radius -= tolerance * 2
         with BuildSketch() as sketch:
             with PolarLocations(radius=radius, count=tooth_number):
                 Ellipse(
@@ -39,11 +41,13 @@ class HookGearInnerSketch(BaseSketchObject):
 
 
 class HookGearInnerPart(BasePartObject):
-    def __init__(self, length=5 * MM, is_inside=False, **kwargs):
+    def __init__(
+        self, length=5 * MM, is_inside=False, tolerance=JOINT_TOLERANCE, **kwargs
+    ):
         with BuildPart() as part:
             with BuildSketch() as sketch:
-                HookGearInnerSketch(is_inside=is_inside)
-            thicken(amount=length / 2, both=True)
+                HookGearInnerSketch(is_inside=is_inside, tolerance=tolerance)
+            extrude(amount=length / 2, both=True)
         super().__init__(part.part, **kwargs)
 
 
@@ -76,7 +80,7 @@ class LightHookSketch(BaseSketchObject):
                 )
                 offset(amount=thickness, side=Side.LEFT)
             s = make_face()
-            chamfer(
+            cosmetic_chamfer(
                 s.vertices().sort_by(Axis.Y)[0],
                 length=thickness,
                 length2=self.INSIDE_HOOK_SIZE,
@@ -213,7 +217,7 @@ class ShelfMountGantryHalfPart(BasePartObject):
                     )
                     offset(amount=thickness, side=Side.RIGHT)
                 s = make_face()
-                fillet(
+                cosmetic_fillet(
                     s.vertices().sort_by(Axis.Y)[-2],
                     radius=min(self.INSIDE_HOOK_SIZE, thickness),
                 )
@@ -272,19 +276,38 @@ class ShelfMountHoistPart(BasePartObject):
         super().__init__(part=part.part, **kwargs)
 
 
-light_hook = LightHookPart(thickness=3 * MM, width=10 * MM)
-gantry = ShelfMountGantryHalfPart(
-    thickness=6 * MM, width=10 * MM, light_hook=light_hook
-)
-hoist = ShelfMountHoistPart(width=10 * MM, light_hook=light_hook)
-hook_inner = HookGearInnerPart(length=light_hook.hook_width, is_inside=True)
+def build():
+    light_hook = LightHookPart(thickness=3 * MM, width=10 * MM)
+    gantry = ShelfMountGantryHalfPart(
+        thickness=6 * MM, width=10 * MM, light_hook=light_hook
+    )
+    hoist = ShelfMountHoistPart(width=10 * MM, light_hook=light_hook)
+    hook_inner = HookGearInnerPart(length=light_hook.hook_width, is_inside=True)
+    return pack([gantry, light_hook, hoist, hook_inner], 10 * MM, align_z=True)
+
+
+def coupon(tolerances=None):
+    grip = Cylinder(
+        JOINT_RADIUS_OUTER + 2 * MM,
+        2 * MM,
+        align=(Align.CENTER, Align.CENTER, Align.MAX),
+    )
+    return coupon_plate(
+        lambda tolerance: HookGearInnerPart(
+            length=JOINT_SLOT_WIDTH,
+            is_inside=True,
+            tolerance=tolerance,
+            align=(Align.CENTER, Align.CENTER, Align.MIN),
+        ),
+        tolerances or ladder(0, 0.45 * MM),
+        body=grip,
+        counterpart=HookGearOuterPart(thickness=JOINT_SLOT_WIDTH),
+    )
 
-all_parts = pack([gantry, light_hook, hoist, hook_inner], 10 * MM, align_z=True)
 
-exporter = Mesher()
-exporter.add_shape(all_parts)
-exporter.add_code_to_metadata()
-exporter.write("exports/plant_light_hook_v2.stl")
-exporter.write("exports/plant_light_hook_v2.3mf")
+if __name__ == "__main__":
+    from homecad.viewer import show
 
-show_all()
+    all_parts = build()
+    export_shapes(all_parts, "exports/plant_light_hook_v2", source=__file__)
+    show(all_parts)
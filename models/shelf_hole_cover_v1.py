@@ -1,6 +1,6 @@
 from math import sqrt
 from build123d import *
-from ocp_vscode import *
+from homecad.export import export_shapes
 
 
 CYL_DIAMETER = 20 * MM
@@ -34,33 +34,37 @@ def make_inner(outer_radius, thinkness, position=1):
     return part.part
 
 
-with BuildPart() as part_cover:
-    Cylinder(
-        CYL_RADIUS,
-        HOLE_OUTER_RADIUS_VERT * 4,
-        arc_size=180,
-        align=(Align.CENTER, Align.MIN, Align.CENTER),
-    )
-    Cylinder(CYL_RADIUS - THICKNESS, HOLE_OUTER_RADIUS_HORI * 4, mode=Mode.SUBTRACT)
-    with BuildSketch(Plane.XZ):
-        Ellipse(
-            HOLE_OUTER_RADIUS_HORI,
-            HOLE_OUTER_RADIUS_VERT,
+def make_cover():
+    with BuildPart() as part_cover:
+        Cylinder(
+            CYL_RADIUS,
+            HOLE_OUTER_RADIUS_VERT * 4,
+            arc_size=180,
+            align=(Align.CENTER, Align.MIN, Align.CENTER),
         )
-    thicken(amount=CYL_DIAMETER, both=True, mode=Mode.INTERSECT)
+        Cylinder(CYL_RADIUS - THICKNESS, HOLE_OUTER_RADIUS_HORI * 4, mode=Mode.SUBTRACT)
+        with BuildSketch(Plane.XZ):
+            Ellipse(
+                HOLE_OUTER_RADIUS_HORI,
+                HOLE_OUTER_RADIUS_VERT,
+            )
+        thicken(amount=CYL_DIAMETER, both=True, mode=Mode.INTERSECT)
+    return part_cover.part
 
-part_left_inner = make_inner(HOLE_INSIDE_RADIUS + ERROR, POLE_THICKNESS, 1)
-part_right_inner = make_inner(HOLE_INSIDE_RADIUS - POLE_THICKNESS, POLE_THICKNESS, -1)
-part_cover_left = part_cover.part
-part_cover_right = mirror(part_cover_left, about=Plane.XZ)
-part_left = (part_left_inner + part_cover_left).rotate(Axis.X, 90)
-part_right = (part_right_inner + part_cover_right).rotate(Axis.X, 90)
-cover = pack([part_left, part_right], 10 * MM, align_z=True)
 
-exporter = Mesher()
-exporter.add_shape(cover)
-exporter.add_code_to_metadata()
-exporter.write("exports/shelf_hole_cover_v1.stl")
-exporter.write("exports/shelf_hole_cover_v1.3mf")
+def build():
+    part_left_inner = make_inner(HOLE_INSIDE_RADIUS + ERROR, POLE_THICKNESS, 1)
+    part_right_inner = make_inner(HOLE_INSIDE_RADIUS - POLE_THICKNESS, POLE_THICKNESS, -1)
+    part_cover_left = make_cover()
+    part_cover_right = mirror(part_cover_left, about=Plane.XZ)
+    part_left = (part_left_inner + part_cover_left).rotate(Axis.X, 90)
+    part_right = (part_right_inner + part_cover_right).rotate(Axis.X, 90)
+    return pack([part_left, part_right], 10 * MM, align_z=True)
 
-show_all()
+
+if __name__ == "__main__":
+    from homecad.viewer import show
+
+    cover = build()
+    export_shapes(cover, "exports/shelf_hole_cover_v1", source=__file__)
+    show(cover)
@@ -1,7 +1,8 @@
 from copy import copy
 from math import sqrt
 from build123d import *
-from ocp_vscode import *
+from homecad.coupon import coupon_plate, ladder
+from homecad.export import export_shapes
 
 
 CYL_DIAMETER = 21 * MM
@@ -63,15 +64,27 @@ def make_socket(radius):
     return part.part
 
 
-part_inner = make_inner(HOLE_INSIDE_RADIUS - SOCKET_THICKNESS - TOLERANCE)
-part_cover = (part_inner + make_cover()).rotate(Axis.Z, 180)
-part_socket = make_socket(HOLE_INSIDE_RADIUS)
-cover = pack([part_cover, copy(part_cover), part_socket], 10 * MM, align_z=True)
+def build():
+    part_inner = make_inner(HOLE_INSIDE_RADIUS - SOCKET_THICKNESS - TOLERANCE)
+    part_cover = (part_inner + make_cover()).rotate(Axis.Z, 180)
+    part_socket = make_socket(HOLE_INSIDE_RADIUS)
+    return pack([part_cover, copy(part_cover), part_socket], 10 * MM, align_z=True)
 
-exporter = Mesher()
-exporter.add_shape(cover)
-exporter.add_code_to_metadata()
-exporter.write("exports/shelf_hole_cover_v2.stl")
-exporter.write("exports/shelf_hole_cover_v2.3mf")
 
-show_all()
+def coupon(tolerances=None):
+    return coupon_plate(
+        lambda tolerance: make_inner(
+            HOLE_INSIDE_RADIUS - SOCKET_THICKNESS - tolerance
+        ),
+        tolerances or ladder(0, 0.45 * MM),
+        body=make_cover(),
+        counterpart=make_socket(HOLE_INSIDE_RADIUS),
+    )
+
+
+if __name__ == "__main__":
+    from homecad.viewer import show
+
+    cover = build()
+    export_shapes(cover, "exports/shelf_hole_cover_v2", source=__file__)
+    show(cover)
@@ -1,7 +1,11 @@
 from enum import Enum
 from math import pi, sin
 from build123d import *
-from ocp_vscode import *
+from homecad.export import export_shapes
+from homecad.gridfinity import GF_BASEPLATE_HALF_WIDTH, GF_UNIT_WIDTH
+from homecad.gridfinity.profiles import node_sketch
+from homecad.quality import cosmetic_chamfer, cosmetic_fillet
+from homecad.spatial import index
 
 
 WINDOW_FRAME_HEIGHT = 50 * MM
@@ -11,13 +15,6 @@ WINDOW_FRAME_SECOND_UPPER_HEIGHT = 20 * MM
 WINDOW_FRAME_SECOND_UPPER_THICKNESS = 6 * MM
 WINDOW_FRAME_SECOND_HOOK_MAX_ALLOW_LENGTH = 2 * MM
 
-GRIDFINITY_UNIT_WIDTH = 42 * MM
-GRIDFINITY_FRAME_WIDTH_HALF = 2.15 * MM
-GRIDFINITY_HEIGHT_OFFSET = 0.35 * MM
-GRIDFINITY_HEIGHT_BOTTOM = 0.7 * MM
-GRIDFINITY_HEIGHT_MIDDLE = 1.8 * MM
-GRIDFINITY_HEIGHT_TOP = 2.15 * MM
-
 
 class RAIL_TYPE(Enum):
     PLAIN = 0
@@ -25,28 +22,6 @@ class RAIL_TYPE(Enum):
     GRIDFINITY_FRAME = 2
 
 
-def _make_gridfinity_node_sketch(plane):
-    _bottom_x = GRIDFINITY_FRAME_WIDTH_HALF
-    _middle_y = GRIDFINITY_HEIGHT_BOTTOM + GRIDFINITY_HEIGHT_MIDDLE
-    _top_y = _middle_y + GRIDFINITY_HEIGHT_TOP
-    _height_offset = GRIDFINITY_HEIGHT_OFFSET
-    with BuildSketch(plane.move(Location((0, 0, _height_offset)))) as sketch:
-        with BuildLine():
-            l1 = Line((-_bottom_x, 0), (_bottom_x, 0))
-            l2 = Line(l1 @ 1, (_bottom_x, _middle_y))
-            l3 = Line(l2 @ 1, (0, _top_y))
-            l4 = Line(l3 @ 1, (-_bottom_x, _middle_y))
-            l5 = Line(l4 @ 1, l1 @ 0)
-        make_face()
-        Rectangle(
-            _bottom_x * 2,
-            _height_offset,
-            align=(Align.CENTER, Align.MAX),
-            mode=Mode.ADD,
-        )
-    return sketch.sketch
-
-
 def make_mount(
     gf_unit,
     mount_thickness=2 * MM,
@@ -57,8 +32,8 @@ def make_mount(
     secondary_support_position=0.6,
 ):
     slot_number = gf_unit * 2 + 1
-    slot_width = GRIDFINITY_FRAME_WIDTH_HALF * 2
-    slot_interval = GRIDFINITY_UNIT_WIDTH / 2 - slot_width
+    slot_width = GF_BASEPLATE_HALF_WIDTH * 2
+    slot_interval = GF_UNIT_WIDTH / 2 - slot_width
     mount_outreach_length = (
         slot_width * slot_number
         + slot_interval * (slot_number - 1)
@@ -105,34 +80,34 @@ def make_mount(
             make_face()
         thicken(amount=mount_width)
 
-        def _find_shape_by_axis(shape, axis, v):
-            return shape.filter_by_position(axis, v - 0.001, v + 0.001)
+        def _find_shape_by_axis(kind, axis, v):
+            return index(part_mount.part, kind).at(axis, v)
 
-        fillet(
-            part_mount.edges().sort_by(Axis.X)[2:4],
+        cosmetic_fillet(
+            index(part_mount.part, "edges").sort_by(Axis.X)[2:4],
             (mount_thickness + slot_depth) / 2 - 0.001,
         )
 
-        def _find_edge(edges, x, y):
-            return edges.filter_by_position(
-                Axis.X, x - 0.001, x + 0.001
-            ).filter_by_position(Axis.Y, y - 0.001, y + 0.001)[0]
+        def _find_edge(kind, x, y):
+            return index(part_mount.part, kind).within(
+                (x - 0.001, y - 0.001), (x + 0.001, y + 0.001)
+            )[0]
 
         edge = _find_edge(
-            part_mount.edges(),
+            "edges",
             WINDOW_FRAME_DEPTH + WINDOW_FRAME_SECOND_UPPER_THICKNESS + mount_thickness,
             WINDOW_FRAME_HEIGHT
             + WINDOW_FRAME_SECOND_UPPER_HEIGHT
             - WINDOW_FRAME_SECOND_HOOK_MAX_ALLOW_LENGTH,
         )
-        chamfer(
+        cosmetic_chamfer(
             edge,
             length=WINDOW_FRAME_SECOND_HOOK_MAX_ALLOW_LENGTH - 0.001,
             length2=mount_thickness - 0.001,
         )
 
         face = _find_shape_by_axis(
-            part_mount.faces(),
+            "faces",
             Axis.Y,
             WINDOW_FRAME_HEIGHT + mount_thickness + slot_depth,
         )[0]
@@ -195,11 +170,11 @@ def make_rail(
     slot_depth=3 * MM,
 ):
     num_archor = gf_unit + 1
-    rail_length = GRIDFINITY_UNIT_WIDTH * gf_unit
-    rail_width = GRIDFINITY_FRAME_WIDTH_HALF * 2
+    rail_length = GF_UNIT_WIDTH * gf_unit
+    rail_width = GF_BASEPLATE_HALF_WIDTH * 2
 
     def _archor_location(i):
-        return i * GRIDFINITY_UNIT_WIDTH
+        return i * GF_UNIT_WIDTH
 
     with BuildPart() as rail:
         with BuildSketch():
@@ -212,13 +187,13 @@ def make_rail(
         if rail_type in (RAIL_TYPE.GRIDFINITY_MIDDLE, RAIL_TYPE.GRIDFINITY_FRAME):
             _node_width = rail_width * sin(pi / 3)
             for i in range(num_archor):
-                _sketch = _make_gridfinity_node_sketch(
+                _sketch = node_sketch(
                     Plane.XZ.shift_origin((_archor_location(i), 0, 0))
                 )
                 thicken(_sketch, amount=_node_width, mode=Mode.ADD, both=True)
 
         if rail_type == RAIL_TYPE.GRIDFINITY_FRAME:
-            _sketch = _make_gridfinity_node_sketch(Plane.YZ)
+            _sketch = node_sketch(Plane.YZ)
             thicken(_sketch, amount=rail_length, mode=Mode.ADD)
 
     return rail.part
@@ -229,22 +204,29 @@ MOUNT_THICKNESS = 5 * MM
 MOUNT_WIDTH = 10 * MM
 SLOT_DEPTH = 3 * MM
 
-mount = make_mount(
-    gf_unit=GRID_SIZE[1],
+
+def build(
+    grid_size=GRID_SIZE,
     mount_thickness=MOUNT_THICKNESS,
     mount_width=MOUNT_WIDTH,
     slot_depth=SLOT_DEPTH,
-)
-rails = [
-    make_rail(rail_type=i, gf_unit=GRID_SIZE[0], slot_depth=SLOT_DEPTH)
-    for i in RAIL_TYPE
-]
-model_set = pack([mount] + rails, 10 * MM, align_z=True)
-
-exporter = Mesher()
-exporter.add_shape(model_set)
-exporter.add_code_to_metadata()
-exporter.write("exports/window_mount.stl")
-exporter.write("exports/window_mount.3mf")
-
-show_all()
+):
+    mount = make_mount(
+        gf_unit=grid_size[1],
+        mount_thickness=mount_thickness,
+        mount_width=mount_width,
+        slot_depth=slot_depth,
+    )
+    rails = [
+        make_rail(rail_type=i, gf_unit=grid_size[0], slot_depth=slot_depth)
+        for i in RAIL_TYPE
+    ]
+    return pack([mount] + rails, 10 * MM, align_z=True)
+
+
+if __name__ == "__main__":
+    from homecad.viewer import show
+
+    model_set = build()
+    export_shapes(model_set, "exports/window_mount", source=__file__)
+    show(model_set)
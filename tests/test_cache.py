@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from homecad import cache, models
+from homecad.cache import _function_fingerprint
+from homecad.gridfinity import profiles
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache, "_size", None)
+    return tmp_path
+
+
+def _entry(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_profile_helpers_are_fingerprinted(monkeypatch):
+    model = models.load("gridfinity_seed_starter")
+    builders = [model.make_gf_box, model.make_gf_cover]
+    before = [_function_fingerprint(builder) for builder in builders]
+    lip = [list(row) for row in profiles.GF_STACKING_LIP_SIZE]
+    lip[-1][1] += 0.1
+    monkeypatch.setattr(profiles, "GF_STACKING_LIP_SIZE", lip)
+    after = [_function_fingerprint(builder) for builder in builders]
+    assert all(b != a for b, a in zip(before, after))
+
+
+def test_replaced_helper_changes_the_key(monkeypatch):
+    model = models.load("gridfinity_seed_starter")
+    before = _function_fingerprint(model.make_gf_box)
+
+    def stacking_lip(size_x, size_y, height_unit, cut_before_height=0):
+        return None
+
+    monkeypatch.setattr(model, "stacking_lip", stacking_lip)
+    assert _function_fingerprint(model.make_gf_box) != before
+
+
+def test_failed_write_leaves_no_temporary_file(cache_dir):
+    with pytest.raises(TypeError):
+        cache.write(cache_dir / "ab" / "key.brep", "not bytes")
+    assert list(cache_dir.glob("ab/*")) == []
+
+
+def test_evict_trims_shapes_and_reports(cache_dir):
+    old = [
+        _entry(cache_dir / "ab" / "old.brep", 100),
+        _entry(cache_dir / "checks" / "ab" / "old.json", 100),
+    ]
+    new = _entry(cache_dir / "cd" / "new.brep", 100)
+    for path in old:
+        os.utime(path, (0, 0))
+    cache.evict(limit=150)
+    assert [path.exists() for path in old] == [False, False]
+    assert new.exists()
+
+
+def test_writes_scan_the_cache_only_when_full(cache_dir, monkeypatch):
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(evict()))
+    monkeypatch.setattr(cache, "CACHE_SIZE", 250)
+    for name in "abc":
+        cache.write(cache_dir / "ab" / f"{name}.brep", b"x" * 100)
+    assert len(scans) == 2
+    assert sum(1 for _ in cache_dir.glob("ab/*.brep")) == 2
@@ -0,0 +1,10 @@
+from homecad.cli import main
+
+
+def test_build_rejects_parameters_a_model_does_not_take(tmp_path, capsys):
+    argv = ["build", "ball", "window_mount", "--out", str(tmp_path)]
+    assert main([*argv, "-p", "grid_size=(5, 3)"]) == 1
+    output = capsys.readouterr().out
+    assert "ball: bad build() parameters" in output
+    assert "window_mount" not in output
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,204 @@
+from itertools import product
+from math import floor, hypot
+
+import numpy as np
+import pytest
+
+from homecad import layout
+from homecad.gridfinity import (
+    GF_STACKING_LIP_SLICE_SIZE,
+    GF_UNIT_WIDTH,
+    GF_UNIT_WITDH_TOLERANCE,
+)
+from homecad.layout import optimize_seed_starter_layout, seed_starter_layout
+
+CASES = [
+    dict(gf_unit_x=4, gf_unit_y=3),
+    dict(gf_unit_x=2, gf_unit_y=2, filling_hole_in_new_row=False),
+    dict(gf_unit_x=5, gf_unit_y=4, starter_min_width=48, support_hole_width=38),
+    dict(gf_unit_x=3, gf_unit_y=6, with_stack_lip=False, filling_hole=False),
+    dict(gf_unit_x=6, gf_unit_y=2, starter_min_width=70, filling_hole_radius=14),
+]
+
+
+def _loop_layout(
+    gf_unit_x,
+    gf_unit_y,
+    cover_thickness=1,
+    wall_thickness=1,
+    with_stack_lip=True,
+    starter_min_width=55,
+    support_hole_width=41.5,
+    filling_hole=True,
+    filling_hole_in_new_row=True,
+    filling_hole_radius=10,
+):
+    """The hole, pillar and filling hole placement as make_seed_starter_plate
+    computed it before the layout had its own module."""
+    edge_delta = GF_UNIT_WITDH_TOLERANCE * 2
+    if with_stack_lip:
+        edge_delta += GF_STACKING_LIP_SLICE_SIZE * 2
+    else:
+        edge_delta += wall_thickness * 2
+    cover_x_max = gf_unit_x * GF_UNIT_WIDTH - edge_delta
+    cover_y_max = gf_unit_y * GF_UNIT_WIDTH - edge_delta
+    filling_hole_in_new_row = filling_hole_in_new_row and filling_hole
+    filling_hole_outer_radius = filling_hole_radius + cover_thickness
+    num_x = floor((cover_x_max - support_hole_width) / starter_min_width) + 1
+    if filling_hole_in_new_row:
+        num_y = (
+            floor(
+                (cover_y_max - support_hole_width - filling_hole_outer_radius * 2)
+                / starter_min_width
+            )
+            + 1
+        )
+    else:
+        num_y = floor((cover_y_max - support_hole_width) / starter_min_width) + 1
+
+    def _cal_gap(total, num, filling_hole_num):
+        gap_fix = 0
+        total -= (
+            filling_hole_outer_radius * 2 * filling_hole_num + support_hole_width * num
+        )
+        interval_num = num + filling_hole_num + 1
+        gap = total / interval_num
+        if gap < (starter_min_width - support_hole_width):
+            gap_fix = starter_min_width - support_hole_width
+            gap = (total - gap_fix * (num - 1)) / (filling_hole_num + 2)
+            gap_fix -= gap
+        return gap, gap_fix
+
+    gap_x, gap_fix_x = _cal_gap(cover_x_max, num_x, 0)
+    gap_y, gap_fix_y = _cal_gap(cover_y_max, num_y, 1 if filling_hole_in_new_row else 0)
+
+    def _support_pillar_locator(i, j):
+        x = (
+            gap_x
+            - cover_x_max / 2
+            + support_hole_width
+            + (gap_x + gap_fix_x) / 2
+            + i * (support_hole_width + gap_x + gap_fix_x)
+        )
+        y = (
+            gap_y
+            - cover_y_max / 2
+            + support_hole_width
+            + (gap_y + gap_fix_y) / 2
+            + j * (support_hole_width + gap_y + gap_fix_y)
+        )
+        if filling_hole_in_new_row:
+            y += filling_hole_outer_radius * 2 + gap_y
+        return (x, y)
+
+    def _hole_locator(i, j):
+        x = support_hole_width / 2 - cover_x_max / 2 + gap_x
+        y = support_hole_width / 2 - cover_y_max / 2 + gap_y
+        if filling_hole_in_new_row:
+            y += filling_hole_outer_radius * 2 + gap_y
+        x += i * (support_hole_width + gap_x + gap_fix_x)
+        y += j * (support_hole_width + gap_y + gap_fix_y)
+        return (x, y)
+
+    hole_locations = [
+        _hole_locator(i, j) for j, i in product(range(num_y), range(num_x))
+    ]
+    filling_hole_location = None
+    if filling_hole:
+        if filling_hole_in_new_row:
+            filling_hole_location = (
+                cover_x_max / 2 - gap_x - support_hole_width / 2,
+                -cover_y_max / 2 + gap_y + filling_hole_outer_radius,
+            )
+        else:
+            filling_hole_location = hole_locations.pop(num_x - 1)
+    return dict(
+        gaps=(gap_x, gap_fix_x, gap_y, gap_fix_y),
+        holes=hole_locations,
+        pillars=[
+            _support_pillar_locator(i, j)
+            for i, j in product(range(num_x - 1), range(num_y - 1))
+        ],
+        filling_hole=filling_hole_location,
+    )
+
+
+@pytest.mark.parametrize("params", CASES)
+def test_layout_matches_loop(params):
+    expected = _loop_layout(**params)
+    found = seed_starter_layout(**params)
+    assert (found.gap_x, found.gap_fix_x, found.gap_y, found.gap_fix_y) == (
+        pytest.approx(expected["gaps"])
+    )
+    assert found.hole_locations() == pytest.approx(expected["holes"])
+    assert found.pillar_locations() == pytest.approx(expected["pillars"])
+    if expected["filling_hole"] is None:
+        assert found.filling_hole_location() is None
+    else:
+        assert found.filling_hole_location() == pytest.approx(expected["filling_hole"])
+
+
+def test_vectorized_layout_matches_loop():
+    units = np.arange(2, 8)
+    widths = np.array([36, 41.5, 47])
+    found = seed_starter_layout(
+        gf_unit_x=units[:, None, None],
+        gf_unit_y=units[None, :, None],
+        support_hole_width=widths[None, None, :],
+    )
+    for (i, x), (j, y), (k, width) in product(
+        enumerate(units), enumerate(units), enumerate(widths)
+    ):
+        expected = _loop_layout(int(x), int(y), support_hole_width=float(width))
+        gaps = (found.gap_x, found.gap_fix_x, found.gap_y, found.gap_fix_y)
+        shape = (len(units), len(units), len(widths))
+        gaps = tuple(np.broadcast_to(gap, shape)[i, j, k] for gap in gaps)
+        assert gaps == pytest.approx(expected["gaps"])
+
+
+def _check_constraints(optimum, cover_thickness=1, min_wall_gap=2, keepout=6.5):
+    """Assert the default constraints of optimize_seed_starter_layout; the
+    pillar keepout is its radius, wall, clearance and cover thickness."""
+    tolerance = 1e-6
+    found = optimum.layout
+    radius = optimum.params["support_hole_conner_radius"]
+    assert found.valid
+    assert min(found.gap_x, found.gap_y) >= -tolerance
+    between_x = found.gap_x + found.gap_fix_x - 2 * cover_thickness
+    between_y = found.gap_y + found.gap_fix_y - 2 * cover_thickness
+    if found.num_x > 1:
+        assert between_x >= min_wall_gap - tolerance
+    if found.num_y > 1:
+        assert between_y >= min_wall_gap - tolerance
+    if found.num_x > 1 and found.num_y > 1:
+        a = (found.gap_x + found.gap_fix_x) / 2
+        b = (found.gap_y + found.gap_fix_y) / 2
+        assert hypot(a + radius, b + radius) - radius >= keepout - tolerance
+    assert 3 - tolerance <= radius <= min(15, (found.support_hole_width - 1) / 2)
+    if found.filling_hole_in_new_row:
+        assert (
+            found.gap_x + found.support_hole_width / 2
+            >= found.filling_hole_outer_radius - tolerance
+        )
+
+
+def _grid_searched(monkeypatch, *args, **kwargs):
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            layout,
+            "_refine",
+            lambda evaluate, num_x, num_y, start, lower, upper: np.array(start),
+        )
+        return optimize_seed_starter_layout(*args, **kwargs)
+
+
+@pytest.mark.parametrize("objective", ["count", "size"])
+@pytest.mark.parametrize("units", [(4, 3), (2, 2), (5, 4)])
+def test_optimum_satisfies_constraints(units, objective, monkeypatch):
+    optimum = optimize_seed_starter_layout(*units, objective=objective)
+    _check_constraints(optimum)
+    start = _grid_searched(monkeypatch, *units, objective=objective)
+    _check_constraints(start)
+    assert optimum.cell_area >= start.cell_area
+    if objective == "count":
+        assert optimum.layout.hole_count == start.layout.hole_count
@@ -0,0 +1,151 @@
+import copy
+
+import numpy as np
+import pytest
+from build123d import Axis, Box, Cylinder, Pos, Sphere, pack
+
+from homecad import mesh
+from homecad.export import export_shapes
+from homecad.mesh import Mesh, simplify, tessellate, weld
+
+
+def _bounds(mesh):
+    vertices = mesh.placed_vertices()
+    return np.round([vertices.min(axis=0), vertices.max(axis=0)], 3).tolist()
+
+
+def _subdivide(vertices, triangles):
+    """Split every triangle into four at its edge midpoints."""
+    a, b, c = triangles.T.astype(np.int64)
+    midpoints = np.concatenate(
+        [(vertices[p] + vertices[q]) / 2 for p, q in ((a, b), (b, c), (c, a))]
+    )
+    ab = len(vertices) + np.arange(len(triangles))
+    bc, ca = ab + len(triangles), ab + 2 * len(triangles)
+    triangles = np.concatenate(
+        [
+            np.stack(corners, axis=1)
+            for corners in ((a, ab, ca), (ab, b, bc), (ca, bc, c), (ab, bc, ca))
+        ]
+    )
+    return weld(np.concatenate([vertices, midpoints]), triangles)
+
+
+def _volume(vertices, triangles):
+    return np.linalg.det(vertices[triangles]).sum() / 6
+
+
+def _edge_counts(triangles):
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]]])
+    edges = np.concatenate([edges, triangles[:, [2, 0]]])
+    return np.unique(np.sort(edges, axis=1), axis=0, return_counts=True)
+
+
+def test_simplify_subdivided_box():
+    box = tessellate(Box(10, 20, 5))[0]
+    vertices, triangles = _subdivide(*_subdivide(box.vertices, box.triangles))
+    assert len(triangles) == 192
+    vertices, triangles = simplify(vertices, triangles)
+    assert len(triangles) == 12
+    assert _volume(vertices, triangles) == pytest.approx(1000)
+
+
+def test_simplify_keeps_curved_surface():
+    sphere = tessellate(Sphere(10))[0]
+    vertices, triangles = _subdivide(sphere.vertices, sphere.triangles)
+    simplified = simplify(vertices, triangles)
+    assert len(simplified[1]) < len(triangles)
+    assert _volume(*simplified) == pytest.approx(_volume(vertices, triangles))
+    assert set(_edge_counts(simplified[1])[1]) == {2}
+
+
+def test_simplify_keeps_open_edges():
+    square = np.array([[0, 0, 0], [4, 0, 0], [4, 4, 0], [0, 4, 0]], dtype=float)
+    halves = np.array([[0, 1, 2], [0, 2, 3]])
+    vertices, triangles = _subdivide(*_subdivide(square, halves))
+    edges, counts = _edge_counts(triangles)
+    border = vertices[np.unique(edges[counts == 1])]
+    simplified, _ = simplify(vertices, triangles)
+    assert len(border) == 16
+    assert sorted(map(tuple, simplified)) == sorted(map(tuple, border))
+
+
+def test_simplify_with_zero_tolerance_is_a_no_op():
+    box = tessellate(Box(10, 20, 5))[0]
+    vertices, triangles = _subdivide(box.vertices, box.triangles)
+    result = simplify(vertices, triangles, tolerance=0)
+    assert result[0] is vertices and result[1] is triangles
+
+
+def _triangles(meshes):
+    return sum(len(part.triangles) for part in meshes)
+
+
+def _coarsest(shape):
+    coarsest = mesh._mesh_shape(
+        shape, mesh.MAX_LINEAR_DEFLECTION, mesh.MAX_ANGULAR_DEFLECTION
+    )
+    return len(coarsest.triangles)
+
+
+def test_fit_meets_triangle_budget():
+    sphere, cylinder = Sphere(10), Pos(30, 0, 0) * Cylinder(5, 10)
+    assert _triangles(tessellate([sphere, cylinder])) > 2000
+    for budget in (2000, 500, 200):
+        meshes = tessellate([sphere, cylinder], max_triangles=budget)
+        assert _triangles(meshes) <= budget
+
+
+def test_fit_returns_coarsest_meshes_below_their_minimum():
+    sphere, cylinder = Sphere(10), Pos(30, 0, 0) * Cylinder(5, 10)
+    meshes = tessellate([sphere, cylinder], max_triangles=1)
+    assert [len(part.triangles) for part in meshes] == [
+        _coarsest(sphere),
+        _coarsest(cylinder),
+    ]
+
+
+def test_fit_meets_byte_budget(tmp_path):
+    path = tmp_path / "sphere"
+    export_shapes(Sphere(10), path, formats=(".stl",), check=False, max_bytes=50_000)
+    assert (tmp_path / "sphere.stl").stat().st_size <= 50_000
+
+
+def test_rotated_copy_is_not_instanced():
+    half = Cylinder(10, 5, arc_size=180)
+    meshes = tessellate([half, half.rotate(Axis.Z, 180)])
+    assert [mesh.transform is None for mesh in meshes] == [True, True]
+    # The flat side of the half cylinder is at y = -5, of its copy at y = 5.
+    assert [
+        np.isclose(mesh.placed_vertices()[:, 1], [[-5], [5]]).sum(axis=1).tolist()
+        for mesh in meshes
+    ] == [[4, 0], [0, 4]]
+
+
+def test_translated_copies_are_instanced():
+    box = Box(10, 20, 2)
+    meshes = tessellate([box, Pos(30, 0, 0) * box, box.moved(Pos(0, 40, 0))])
+    assert all(mesh.vertices is meshes[0].vertices for mesh in meshes)
+    assert _bounds(meshes[1]) == [[25, -10, -1], [35, 10, 1]]
+    assert _bounds(meshes[2]) == [[-5, 30, -1], [5, 50, 1]]
+
+
+def test_deep_copies_are_instanced_without_tessellating(monkeypatch):
+    calls = []
+    mesh_shape = mesh._mesh_shape
+    monkeypatch.setattr(
+        mesh, "_mesh_shape", lambda *args: calls.append(1) or mesh_shape(*args)
+    )
+    part = Cylinder(10, 5, arc_size=180)
+    copies = pack([part, copy.deepcopy(part), Pos(0, 0, 9) * copy.deepcopy(part)], 2)
+    meshes = tessellate(copies)
+    assert len(calls) == 1
+    assert all(mesh.vertices is meshes[0].vertices for mesh in meshes)
+    for placed, shape in zip(meshes, copies):
+        bounds = shape.bounding_box()
+        corners = [bounds.min.to_tuple(), bounds.max.to_tuple()]
+        assert np.allclose(_bounds(placed), corners, atol=0.01)
+
+
+def test_transform_defaults_to_none():
+    assert Mesh(np.zeros((0, 3)), np.zeros((0, 3), dtype=np.uint32)).transform is None
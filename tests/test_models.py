@@ -0,0 +1,15 @@
+import pytest
+
+from homecad import models
+from homecad.quality import Quality
+from homecad.validate import check_shapes
+
+
+@pytest.mark.parametrize("quality", [quality.value for quality in Quality])
+@pytest.mark.parametrize("name", models.model_names())
+def test_model_passes_checks(name, quality, monkeypatch):
+    monkeypatch.setenv("HOMECAD_QUALITY", quality)
+    reports = check_shapes(models.build(name), use_cache=False)
+    assert {report["name"]: report["issues"] for report in reports} == {
+        report["name"]: [] for report in reports
+    }
@@ -0,0 +1,23 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pytest
+
+from homecad import brep, models, parallel
+
+
+def test_tasks_run_in_spawned_workers():
+    make_gf_box = models.load("gridfinity_seed_starter").make_gf_box
+    ref = parallel.reference(make_gf_box)
+    assert ref == ("models.gridfinity_seed_starter", "make_gf_box")
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        data = pool.submit(parallel._build, ref, (1, 1, 3), {}).result()
+    assert brep.loads(data).volume == pytest.approx(make_gf_box(1, 1, 3).volume)
+
+
+def test_local_functions_are_rejected():
+    def build():
+        return None
+
+    with pytest.raises(ValueError, match="not a module-level function"):
+        parallel.reference(build)
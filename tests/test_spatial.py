@@ -0,0 +1,27 @@
+import gc
+
+from build123d import Axis, Box, BuildPart, Pos
+
+from homecad import spatial
+from homecad.spatial import index
+
+
+def test_within_orders_like_chained_filters():
+    centers = [(1, 2), (0, 2), (1, 0), (0, 1)]
+    indexed = spatial.ShapeIndex(Pos(x, y, 0) * Box(1, 1, 1) for x, y in centers)
+    found = indexed.within((-1, -1), (2, 3))
+    chained = indexed.filter_by_position(Axis.X, -1, 2)
+    chained = chained.filter_by_position(Axis.Y, -1, 3)
+    assert [tuple(box.center())[:2] for box in found] == [
+        tuple(box.center())[:2] for box in chained
+    ]
+
+
+def test_indexes_are_cached_per_builder():
+    with BuildPart() as part:
+        Box(10, 10, 10)
+        assert index(part.part, "faces") is index(part.part, "faces")
+    assert index(part.part, "faces") is not index(part.part, "faces")
+    del part
+    gc.collect()
+    assert not spatial._indexes
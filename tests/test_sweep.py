@@ -0,0 +1,20 @@
+from build123d import Box
+
+from homecad.manifest import load_manifest
+from homecad.sweep import sweep
+
+
+def _plate(size):
+    if size <= 0:
+        raise ValueError(f"size must be positive, got {size}")
+    return Box(size, size, 2)
+
+
+def test_failed_variant_is_recorded(tmp_path):
+    manifest = sweep(_plate, {"size": [0, 10]}, tmp_path, "plate", max_workers=1)
+    assert manifest == load_manifest(tmp_path)
+    assert "size must be positive" in manifest["plate-size=0"]["error"]
+    assert manifest["plate-size=10"]["files"] == [
+        "plate-size=10.stl",
+        "plate-size=10.3mf",
+    ]
@@ -0,0 +1,89 @@
+from math import sqrt
+
+import pytest
+from build123d import (
+    Align,
+    Axis,
+    Box,
+    Compound,
+    Cylinder,
+    Plane,
+    Polyline,
+    Pos,
+    Rot,
+    make_face,
+    revolve,
+)
+
+from homecad import cache, validate
+from homecad.validate import check_shape, check_shapes, wall_thickness
+
+TOP = (Align.CENTER, Align.CENTER, Align.MAX)
+
+
+def _ridged_rod(pitch=0.4, major_diameter=2.0, turns=10):
+    """A rod with ISO 68-1 profile ridges, a thread without the helix."""
+    height = sqrt(3) / 2 * pitch
+    crest, root = major_diameter / 2, major_diameter / 2 - 5 / 8 * height
+    points = [(0, 0), (root, 0)]
+    for i in range(turns):
+        z = i * pitch
+        points += [
+            (root, z + pitch / 8),
+            (crest, z + pitch / 2 - pitch / 16),
+            (crest, z + pitch / 2 + pitch / 16),
+            (root, z + pitch - pitch / 8),
+            (root, z + pitch),
+        ]
+    points.append((0, turns * pitch))
+    profile = make_face(Plane.XZ * Polyline(*points, close=True))
+    return revolve(profile, Axis.Z)
+
+
+def test_thin_wall_fails():
+    report = check_shape(Box(20, 20, 0.1))
+    assert report["issues"] and "wall" in report["issues"][-1]
+    assert report["wall"] == pytest.approx(0.1)
+
+
+def test_wall_thickness_of_a_plate():
+    assert wall_thickness(Box(20, 20, 2))[0] == pytest.approx(2)
+
+
+def test_thread_teeth_are_not_walls():
+    # M2-0.4 teeth are under 0.2 mm thick halfway up their flanks.
+    assert check_shape(_ridged_rod())["issues"] == []
+
+
+def test_iso_thread_passes(monkeypatch):
+    pytest.importorskip("bd_warehouse")
+    from homecad.fastener import screw_and_thread
+
+    monkeypatch.setenv("HOMECAD_QUALITY", "final")
+    screw, thread = screw_and_thread("M6-1", 4, allowance=0.1)
+    nut = Box(12, 12, 4, align=TOP) - Cylinder(3.05, 4, align=TOP) + thread
+    reports = check_shapes([screw, nut], use_cache=False)
+    assert [report["issues"] for report in reports] == [[], []]
+
+
+def test_compounds_are_split():
+    plate = Compound([Box(10, 10, 2), Pos(20, 0, 0) * Rot(0, 0, 45) * Box(10, 10, 2)])
+    reports = check_shapes(plate, use_cache=False)
+    assert [report["issues"] for report in reports] == [[], []]
+    assert [report["name"] for report in reports] == ["part 0", "part 1"]
+
+
+def test_solids_of_a_part_stay_together():
+    part = Box(10, 10, 2) + Pos(20, 0, 0) * Box(10, 10, 2)
+    reports = check_shapes(part, use_cache=False)
+    assert [report["issues"] for report in reports] == [["2 solids"]]
+
+
+def test_cache_setting_is_read_when_checking(monkeypatch, tmp_path):
+    monkeypatch.setattr(validate, "CHECKS_DIR", tmp_path)
+    monkeypatch.setattr(cache, "CACHE_ENABLED", False)
+    check_shapes(Box(10, 10, 2))
+    assert not any(tmp_path.iterdir())
+    monkeypatch.setattr(cache, "CACHE_ENABLED", True)
+    check_shapes(Box(10, 10, 2))
+    assert any(tmp_path.iterdir())